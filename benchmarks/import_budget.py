@@ -0,0 +1,97 @@
+# benchmarks/import_budget.py
+"""Check that app.py's startup imports stay within a time budget.
+
+    python -m benchmarks.import_budget                  # default budget
+    python -m benchmarks.import_budget --budget-ms 80 --repeat 5
+
+The modules app.py imports at the top level are imported in fresh
+interpreters after Streamlit, pandas and NumPy (which every run pays for
+anyway); the fastest of ``--repeat`` runs is compared with the budget.
+Modules that must load only with the page that needs them (Altair, the
+non-home page modules) fail the check if startup pulls them in. Exits
+non-zero on either failure and lists the slowest imports from
+``-X importtime``.
+"""
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+FRAMEWORK = ["streamlit", "pandas", "numpy"]
+DEFAULT_BUDGET_MS = 100.0
+# Loaded on demand by the pages that use them
+DEFERRED = ["altair", "lib.charts", "lib.export", "lib.panel", "lib.sweep", "lib.uncertainty"]
+DEFERRED_PREFIXES = ["lib.pages."]
+STARTUP_PAGES = {"lib.pages.home"}
+
+_MARKER = "-- startup imports --"
+_PROBE = """
+import importlib, json, sys, time
+for name in {framework!r}:
+    importlib.import_module(name)
+print({marker!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+print(json.dumps({{"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}}))
+"""
+
+def startup_modules(app_path: Path) -> List[str]:
+    """Modules imported by top-level statements of ``app_path`` (not inside branches)."""
+    tree = ast.parse(app_path.read_text())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+def probe(modules: List[str], importtime: bool = False) -> subprocess.CompletedProcess:
+    args = [sys.executable, *(["-X", "importtime"] if importtime else []),
+            "-c", _PROBE.format(framework=FRAMEWORK, modules=modules, marker=_MARKER)]
+    return subprocess.run(args, cwd=ROOT, capture_output=True, text=True, check=True)
+
+def slowest_imports(stderr: str, top: int = 10) -> List[str]:
+    """Top cumulative ``-X importtime`` entries among the outermost startup imports."""
+    rows = []
+    for line in stderr.split(_MARKER, 1)[-1].splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        if len(name) - len(name.lstrip()) <= 1:
+            rows.append((int(parts[1]), name.strip()))
+    return [f"{us / 1e3:8.1f} ms  {name}" for us, name in sorted(rows, reverse=True)[:top]]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fail if app startup imports exceed a time budget.")
+    parser.add_argument("--app", default=str(ROOT / "app.py"))
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    modules = [m for m in startup_modules(Path(args.app)) if m not in FRAMEWORK]
+    runs = [json.loads(probe(modules).stdout) for _ in range(max(1, args.repeat))]
+    best_ms = min(run["seconds"] for run in runs) * 1e3
+    loaded = set(runs[0]["modules"])
+    eager = sorted(m for m in loaded if m in DEFERRED or (
+        any(m.startswith(p) for p in DEFERRED_PREFIXES) and m not in STARTUP_PAGES))
+
+    print(f"startup imports: {', '.join(modules)}")
+    print(f"import time: {best_ms:.1f} ms (budget {args.budget_ms:.0f} ms, best of {len(runs)})")
+    failed = best_ms > args.budget_ms or bool(eager)
+    if eager:
+        print(f"loaded at startup but should be deferred: {', '.join(eager)}")
+    if failed:
+        print("slowest imports:")
+        print("\n".join(slowest_imports(probe(modules, importtime=True).stderr)))
+    print("FAIL" if failed else "OK")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
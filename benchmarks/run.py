@@ -0,0 +1,149 @@
+# benchmarks/run.py
+"""Benchmark the loader, scoring kernel, ranking/comparison-page prep and search filtering.
+
+    python -m benchmarks.run                          # 1k, 10k, 100k, 1M rows
+    python -m benchmarks.run --sizes 1000 10000 --repeat 3
+    python -m benchmarks.run --compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+
+Synthetic inputs are written once under ``--data-dir`` and reused. Each
+run writes ``benchmarks/results/<commit>.json``; ``--compare`` prints the
+per-case ratio of two result files and exits non-zero when any case is
+slower than ``--threshold``.
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit.logger
+
+# Silence Streamlit's "no runtime" cache warnings when run outside the app
+streamlit.logger.set_log_level("error")
+# Time the stages themselves, not the preparation graph's disk cache
+os.environ.setdefault("EPANALYSIS_PIPELINE_CACHE", "off")
+
+from lib.comparison import earnings_comparison, roi_comparison
+from lib.data import load_roi_metrics_dataset
+from lib.order_stats import build_ranking_order_stats
+from lib.prep import PIPELINE
+from lib.scoring import ScoringInputs, score_arrays
+from lib.pages.rankings import filter_rankings, rankings_table
+
+from .synthetic import write_synthetic
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_DIR = Path(__file__).parent / "results"
+ALL_AWARDS = ("Associate's", "Certificate")
+
+def timed(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Wall-clock seconds over ``repeat`` calls of ``fn`` (after one warm-up call)."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"min_s": min(times), "median_s": float(np.median(times)), "mean_s": float(np.mean(times))}
+
+def bench_size(rows: int, data_dir: str, repeat: int) -> List[Dict]:
+    """Time every case on a synthetic dataset of ``rows`` institutions."""
+    roi_path, inst_path = write_synthetic(data_dir, rows)
+    # The loader is st.cache_data-wrapped (under the metrics decorators); time
+    # the underlying function with the preparation graph's stage cache emptied
+    load_warm = inspect.unwrap(load_roi_metrics_dataset)
+    load = lambda *args: (PIPELINE.clear(), load_warm(*args))[1]
+    df = load(roi_path, inst_path, ALL_AWARDS)
+    if len(df) != rows:
+        raise RuntimeError(f"Loader returned {len(df)} rows for a {rows}-row synthetic dataset")
+
+    inputs = ScoringInputs.from_frame(df)
+    stats = build_ranking_order_stats(df)
+    base = rankings_table(df)
+    regions = sorted(df["Region"].dropna().unique())[:3]
+    cases = {
+        "load_roi_metrics_dataset": lambda: load(roi_path, inst_path, ALL_AWARDS),
+        "load_cached_stages": lambda: load_warm(roi_path, inst_path, ALL_AWARDS),
+        "scoring_inputs": lambda: ScoringInputs.from_frame(df),
+        "score_arrays": lambda: score_arrays(inputs),
+        "ranking_order_stats": lambda: build_ranking_order_stats(df),
+        "ep_rankings_sorted": lambda: (stats.sorted_frame("ep_rank_statewide"),
+                                       stats.sorted_frame("ep_rank_regional")),
+        "roi_rankings_sorted": lambda: (stats.view("roi_valid"),
+                                        stats.sorted_frame("roi_rank_statewide"),
+                                        stats.sorted_frame("roi_rank_regional")),
+        "comparison_tables": lambda: (earnings_comparison(df), roi_comparison(df)),
+        "rankings_table": lambda: rankings_table(df),
+        "search_filter": lambda: filter_rankings(base, "college 00012"),
+        "region_sector_filter": lambda: stats.order("roi_rank_statewide", True, regions, ["Public"]),
+    }
+    # Keep the largest sizes affordable: the loader at 1M rows takes seconds
+    n = max(1, repeat if rows < 1_000_000 else repeat // 3)
+    results = []
+    for name, fn in cases.items():
+        results.append({"case": name, "rows": rows, "repeat": n, **timed(fn, n)})
+        print(f"{rows:>9,}  {name:<26} {results[-1]['median_s'] * 1e3:10.2f} ms", flush=True)
+    return results
+
+def run_metadata() -> Dict[str, object]:
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+    return {
+        "commit": git("rev-parse", "--short", "HEAD") or "unknown",
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": f"{platform.system()} {platform.machine()}",
+    }
+
+def compare(base_path: str, new_path: str, threshold: float) -> int:
+    """Print new/base median ratios per (case, rows); 1 if any exceeds ``threshold``."""
+    load = lambda p: {(r["case"], r["rows"]): r for r in json.loads(Path(p).read_text())["results"]}
+    base, new = load(base_path), load(new_path)
+    regressions = 0
+    print(f"{'case':<26} {'rows':>9} {'base ms':>10} {'new ms':>10} {'ratio':>7}")
+    for key in sorted(set(base) & set(new), key=lambda k: (k[1], k[0])):
+        ratio = new[key]["median_s"] / base[key]["median_s"]
+        flag = "  SLOWER" if ratio > threshold else ""
+        regressions += ratio > threshold
+        print(f"{key[0]:<26} {key[1]:>9,} {base[key]['median_s'] * 1e3:10.2f} "
+              f"{new[key]['median_s'] * 1e3:10.2f} {ratio:7.2f}{flag}")
+    return 1 if regressions else 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark loader, scoring and ranking views on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", default=str(Path(__file__).parent / "data"))
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Ratio above which --compare reports a regression")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+
+    meta = run_metadata()
+    results = [r for rows in args.sizes for r in bench_size(rows, args.data_dir, args.repeat)]
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{meta['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+    print(f"Wrote {output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
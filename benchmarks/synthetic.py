@@ -0,0 +1,105 @@
+# benchmarks/synthetic.py
+"""Synthetic datasets in the roi-metrics.csv / gr-institutions.csv schemas."""
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from lib.hs_baseline import CA_COUNTY_FIPS
+from lib.scoring import STATEWIDE_HS_BASELINE, ScoringInputs, score_arrays
+
+ROI_METRICS_COLS = [
+    "OPEID6", "Institution", "County", "Sector", "median_earnings_10yr", "total_net_price",
+    "premium_statewide", "premium_regional", "roi_statewide_years", "roi_regional_years",
+    "rank_statewide", "rank_regional", "rank_change", "hs_median_income",
+]
+INSTITUTION_COLS = [
+    "OPEID6", "Institution", "City", "County", "Region", "Predominant Award", "Sector",
+    "Undergraduate Degree-seeking students", "ZIP", "Latitude", "Longitude",
+    "Median Earnings 10 Years After Enrollment", "Annual Net Price",
+]
+
+# Region of each county, as in gr-institutions.csv; other counties fall back to "Other"
+COUNTY_REGION = {
+    "Alameda": "Bay Area", "Contra Costa": "Bay Area", "Marin": "Bay Area", "Napa": "Bay Area",
+    "San Francisco": "Bay Area", "San Mateo": "Bay Area", "Santa Clara": "Bay Area",
+    "Solano": "Bay Area", "Sonoma": "Bay Area", "Los Angeles": "Los Angeles", "Orange": "Orange",
+    "Riverside": "Inland Empire", "San Bernardino": "Inland Empire", "San Diego": "San Diego",
+    "Imperial": "Imperial", "Fresno": "San Joaquin Valley", "Kern": "San Joaquin Valley",
+    "Kings": "San Joaquin Valley", "Merced": "San Joaquin Valley", "San Joaquin": "San Joaquin Valley",
+    "Stanislaus": "San Joaquin Valley", "Tulare": "San Joaquin Valley", "Monterey": "Central Coast",
+    "San Luis Obispo": "Central Coast", "Santa Barbara": "Central Coast", "Santa Cruz": "Central Coast",
+    "Ventura": "Central Coast", "El Dorado": "Sacramento-Tahoe", "Placer": "Sacramento-Tahoe",
+    "Sacramento": "Sacramento-Tahoe", "Sutter": "Sacramento-Tahoe", "Yolo": "Sacramento-Tahoe",
+    "Yuba": "Sacramento-Tahoe", "Butte": "Upper Sacramento Valley", "Tuolumne": "Central Sierra",
+    "Humboldt": "North-Far North", "Lassen": "North-Far North", "Mendocino": "North-Far North",
+    "Plumas": "North-Far North", "Shasta": "North-Far North", "Siskiyou": "North-Far North",
+}
+# Sector and award mix of the bundled institutions file
+SECTOR_SHARES = {"Private for-profit": 0.57, "Public": 0.37, "Private non-profit": 0.06}
+AWARD_SHARES = {"Certificate": 0.63, "Associate's": 0.37}
+
+def synthetic_frames(rows: int, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(roi_metrics, institutions) frames with ``rows`` institutions each, joined 1:1 on name.
+
+    Earnings, prices and county baselines are drawn from ranges like the
+    bundled data; the precomputed premium/ROI/rank columns are filled in by
+    the scoring kernel so the files are internally consistent.
+    """
+    rng = np.random.default_rng(seed)
+    counties = np.array(sorted(CA_COUNTY_FIPS))
+    county_baseline = dict(zip(counties, rng.uniform(12_000, 34_000, len(counties)).round()))
+
+    county = counties[rng.integers(0, len(counties), rows)]
+    sector = rng.choice(list(SECTOR_SHARES), rows, p=list(SECTOR_SHARES.values()))
+    award = rng.choice(list(AWARD_SHARES), rows, p=list(AWARD_SHARES.values()))
+    opeid6 = np.arange(1, rows + 1) + 1000
+    names = pd.Series(opeid6).map("Synthetic College {:07d}".format).to_numpy()
+    earnings = rng.lognormal(np.log(38_000), 0.3, rows).round()
+    price = rng.uniform(10, 56_000, rows).round()
+    baseline = pd.Series(county).map(county_baseline).to_numpy()
+
+    scores = score_arrays(ScoringInputs(earnings=earnings, annual_price=price, regional_baseline=baseline))
+    roi_metrics = pd.DataFrame({
+        "OPEID6": opeid6,
+        "Institution": names,
+        "County": county,
+        "Sector": sector,
+        "median_earnings_10yr": earnings,
+        "total_net_price": price,
+        "premium_statewide": earnings - STATEWIDE_HS_BASELINE,
+        "premium_regional": earnings - baseline,
+        **{c: scores[c] for c in ("roi_statewide_years", "roi_regional_years",
+                                  "rank_statewide", "rank_regional", "rank_change")},
+        "hs_median_income": baseline,
+    })[ROI_METRICS_COLS]
+
+    institutions = pd.DataFrame({
+        "OPEID6": opeid6,
+        "Institution": names,
+        "City": county,
+        "County": county,
+        "Region": pd.Series(county).map(COUNTY_REGION).fillna("Other").to_numpy(),
+        "Predominant Award": award,
+        "Sector": sector,
+        "Undergraduate Degree-seeking students": rng.integers(50, 40_000, rows),
+        "ZIP": rng.integers(90_001, 96_162, rows),
+        "Latitude": rng.uniform(32.5, 42.0, rows).round(6),
+        "Longitude": rng.uniform(-124.2, -114.1, rows).round(6),
+        "Median Earnings 10 Years After Enrollment": earnings,
+        "Annual Net Price": price,
+    })[INSTITUTION_COLS]
+    return roi_metrics, institutions
+
+def write_synthetic(directory: str, rows: int, seed: int = 0) -> Tuple[str, str]:
+    """Write the two CSVs under ``directory`` (reused if already present); returns their paths."""
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    roi_path = root / f"roi-metrics-{rows}-seed{seed}.csv"
+    inst_path = root / f"gr-institutions-{rows}-seed{seed}.csv"
+    if not (roi_path.exists() and inst_path.exists()):
+        roi_metrics, institutions = synthetic_frames(rows, seed)
+        roi_metrics.to_csv(roi_path, index=False)
+        institutions.to_csv(inst_path, index=False)
+    return str(roi_path), str(inst_path)
@@ -3,6 +3,8 @@ from typing import Dict, Any
 import os
 from pathlib import Path
 
+from lib.data_schema import NUMERIC_COLS, REQUIRED_COLS
+
 class Config:
     """Central configuration for the application."""
     
@@ -22,27 +24,9 @@ class Config:
     }
     
     # Column definitions
-    NUMERIC_COLUMNS = [
-        "total_net_price",
-        "median_earnings_10yr",
-        "premium_statewide",
-        "premium_regional",
-        "roi_statewide_years",
-        "roi_regional_years",
-        "rank_statewide",
-        "rank_regional",
-        "rank_change",
-        "hs_median_income",
-        "golden_roi_years"
-    ]
+    NUMERIC_COLUMNS = [*NUMERIC_COLS, "golden_roi_years"]
     
-    REQUIRED_COLUMNS = [
-        "UNITID",
-        "Institution",
-        "Region",
-        "County",
-        "Sector"
-    ]
+    REQUIRED_COLUMNS = list(REQUIRED_COLS)
     
     # Display settings
     DISPLAY_COLUMNS = {
@@ -0,0 +1,323 @@
+# lib/api.py
+"""Read-only JSON API over the scored dataset.
+
+Runs standalone, next to the Streamlit app or lib/cluster.py (which does
+not start it):
+
+    python -m lib.api --port 8601
+    python -m lib.api --port 8601 --snapshots snapshots
+
+With ``--snapshots`` (default: ``EPANALYSIS_SNAPSHOT``) the API follows the
+newest generation published under that root (lib/refresh.py); each request
+resolves the current dataset, so a new generation is served, with new
+ETags, as soon as it has been mapped and warmed. Without it the primary
+dataset is loaded once at start.
+
+Endpoints (all GET, JSON, gzip when the client accepts it):
+
+    /api/v1/meta                      dataset version, row count, filter values
+    /api/v1/institutions              all institution records
+    /api/v1/institutions/<OPEID6>     records for one OPEID6
+    /api/v1/rankings/<metric>         rows ordered by a ranking metric
+    /api/v1/top/<metric>              top-k rows for any indexed metric
+    /api/v1/nearby?lat=&lon=          institutions within ``radius_km`` of a point
+    /api/v1/export/<view>.<format>    streamed CSV/Parquet/Arrow download
+    /metrics                          process metrics (Prometheus text format)
+
+``region`` and ``sector`` query parameters (repeatable) filter rankings and
+top-k; ``limit``/``offset`` page rankings, ``k`` and ``order`` (asc/desc)
+shape top-k. ``nearby`` takes ``radius_km`` (default 40) and ``limit`` and
+ranks by regional ROI, fastest payback first. ETags are derived from the
+dataset version and request URI, so unchanged data answers
+``If-None-Match`` with 304 before any work is done.
+"""
+import argparse
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import tornado.ioloop
+import tornado.web
+
+from .data import dataset_version, load_roi_metrics_dataset
+from .export import API_PREFIX, EXPORT_COLS, EXPORT_FORMATS, EXPORT_VIEWS, export_view, iter_export
+from .geo import KM_PER_MILE, get_spatial_index, institutions_near
+from .metrics import CONTENT_TYPE, REGISTRY
+from .order_stats import ORDER_METRICS, OrderStatistics, get_order_stats
+from .snapshot import MANIFEST_FILE, SNAPSHOT_ENV, open_snapshot
+
+# Columns returned for each institution record
+RECORD_COLS = EXPORT_COLS
+
+# Rankings served by /rankings/<name> and their direction (True = ascending)
+RANKINGS = {name: view for name, view in EXPORT_VIEWS.items() if view[0] is not None}
+
+MAX_LIMIT = 1000
+MAX_RADIUS_KM = 500.0
+RESPONSE_CACHE_SIZE = 512
+
+class DatasetState:
+    """One dataset version, its order statistics and a small cache of rendered responses."""
+
+    def __init__(self, df: pd.DataFrame, stats: Optional[OrderStatistics] = None):
+        self.df = df
+        self.version = dataset_version(df) or "unversioned"
+        self.stats = stats if stats is not None else get_order_stats(df)
+        cols = [c for c in RECORD_COLS if c in self.stats.frame.columns]
+        self.extra_cols = [c for c in self.stats.frame.columns if c.startswith(("ep_rank_", "roi_rank_"))]
+        self.record_cols = cols
+        self._responses: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def etag(self, uri: str) -> str:
+        return '"' + hashlib.sha1(f"{self.version}:{uri}".encode()).hexdigest()[:20] + '"'
+
+    def cached(self, uri: str) -> Optional[bytes]:
+        body = self._responses.get(uri)
+        if body is not None:
+            self._responses.move_to_end(uri)
+        return body
+
+    def store(self, uri: str, body: bytes) -> None:
+        self._responses[uri] = body
+        if len(self._responses) > RESPONSE_CACHE_SIZE:
+            self._responses.popitem(last=False)
+
+class DatasetSource:
+    """Resolves the current dataset per request; a new version gets a new state and empty response cache."""
+
+    def __init__(self, load: Callable[[], pd.DataFrame]):
+        self._load = load
+        self._state: Optional[DatasetState] = None
+
+    def current(self) -> DatasetState:
+        df = self._load()
+        if self._state is None or (dataset_version(df) or "unversioned") != self._state.version:
+            self._state = DatasetState(df)
+        return self._state
+
+def dataset_loader(snapshots: Optional[str] = None) -> Callable[[], pd.DataFrame]:
+    """Callable returning the dataset to serve.
+
+    ``snapshots`` names a snapshot directory or a snapshot root, whose
+    newest published generation is followed; without one the primary
+    dataset is loaded once.
+    """
+    if not snapshots:
+        df = load_roi_metrics_dataset()
+        return lambda: df
+    if (Path(snapshots) / MANIFEST_FILE).exists():
+        snapshot = open_snapshot(snapshots)
+        return lambda: snapshot.dataset
+    from .refresh import Follower  # lib.refresh imports the page-table builders
+
+    follower = Follower(snapshots)
+    follower.start()
+    return lambda: follower.snapshot.dataset
+
+def records_json(frame: pd.DataFrame) -> str:
+    """JSON array of row objects (NaN → null, numpy scalars → JSON numbers)."""
+    return frame.to_json(orient="records", double_precision=6)
+
+def envelope(state: DatasetState, data_json: str, **meta) -> bytes:
+    head = json.dumps({"version": state.version, **meta})
+    return (head[:-1] + ', "data": ' + data_json + "}").encode()
+
+class BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, source: DatasetSource):
+        self.source = source
+
+    def prepare(self):
+        # One dataset version for the whole request
+        self.state = self.source.current()
+
+    def set_default_headers(self):
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+        self.set_header("Cache-Control", "public, max-age=60")
+
+    def compute_etag(self) -> Optional[str]:
+        # ETag depends only on dataset version and URI (set in get())
+        return None
+
+    def write_error(self, status_code: int, **kwargs):
+        reason = self._reason
+        exc = kwargs.get("exc_info", (None, None, None))[1]
+        if isinstance(exc, tornado.web.HTTPError) and exc.log_message:
+            reason = exc.log_message
+        self.finish(json.dumps({"error": reason, "status": status_code}))
+
+    def get(self, *args):
+        uri = self.request.uri
+        etag = self.state.etag(uri)
+        self.set_header("ETag", etag)
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+        body = self.state.cached(uri)
+        if body is None:
+            body = self.render_body(*args)
+            self.state.store(uri, body)
+        self.write(body)
+
+    def render_body(self, *args) -> bytes:
+        raise NotImplementedError
+
+    def filters(self) -> Dict[str, Optional[List[str]]]:
+        regions = self.get_query_arguments("region") or None
+        sectors = self.get_query_arguments("sector") or None
+        return {"regions": regions, "sectors": sectors}
+
+    def int_argument(self, name: str, default: int, low: int = 0, high: int = MAX_LIMIT) -> int:
+        raw = self.get_query_argument(name, None)
+        if raw is None:
+            return default
+        try:
+            value = int(raw)
+        except ValueError:
+            raise tornado.web.HTTPError(400, f"'{name}' must be an integer")
+        return max(low, min(value, high))
+
+    def float_argument(self, name: str, default: Optional[float] = None,
+                       low: float = -np.inf, high: float = np.inf) -> float:
+        raw = self.get_query_argument(name, None)
+        if raw is None:
+            if default is None:
+                raise tornado.web.HTTPError(400, f"'{name}' is required")
+            return default
+        try:
+            value = float(raw)
+        except ValueError:
+            raise tornado.web.HTTPError(400, f"'{name}' must be a number")
+        if not low <= value <= high:
+            raise tornado.web.HTTPError(400, f"'{name}' must be between {low:g} and {high:g}")
+        return value
+
+class MetaHandler(BaseHandler):
+    def render_body(self) -> bytes:
+        frame = self.state.stats.frame
+        meta = {
+            "rows": int(len(frame)),
+            "regions": sorted(frame["Region"].dropna().unique().tolist()),
+            "sectors": sorted(frame["Sector"].dropna().unique().tolist()),
+            "rankings": sorted(RANKINGS),
+            "metrics": [m for m in ORDER_METRICS if m in frame.columns],
+        }
+        return envelope(self.state, json.dumps(meta))
+
+class InstitutionsHandler(BaseHandler):
+    def render_body(self, opeid6: Optional[str] = None) -> bytes:
+        frame = self.state.stats.frame
+        if opeid6 is not None:
+            frame = frame[frame["OPEID6"].to_numpy() == int(opeid6)]
+            if frame.empty:
+                raise tornado.web.HTTPError(404, f"No institution with OPEID6 {opeid6}")
+        return envelope(self.state, records_json(frame[self.state.record_cols]), count=int(len(frame)))
+
+class RankingsHandler(BaseHandler):
+    def render_body(self, name: str) -> bytes:
+        if name not in RANKINGS:
+            raise tornado.web.HTTPError(404, f"Unknown ranking '{name}'; expected one of {sorted(RANKINGS)}")
+        metric, ascending = RANKINGS[name]
+        order = self.state.stats.order(metric, ascending, **self.filters())
+        limit = self.int_argument("limit", 100, low=1)
+        offset = self.int_argument("offset", 0, high=np.iinfo(np.int32).max)
+        page = self.state.stats.frame.iloc[order[offset:offset + limit]]
+        cols = ["rank", *self.state.record_cols]
+        page = page.assign(rank=page[metric]).loc[:, cols]
+        return envelope(self.state, records_json(page), ranking=name, total=int(len(order)),
+                        offset=offset, limit=limit)
+
+class TopHandler(BaseHandler):
+    def render_body(self, metric: str) -> bytes:
+        stats = self.state.stats
+        if metric not in stats.metrics:
+            raise tornado.web.HTTPError(404, f"Metric '{metric}' is not indexed")
+        k = self.int_argument("k", 10, low=1)
+        direction = self.get_query_argument("order", "desc")
+        if direction not in ("asc", "desc"):
+            raise tornado.web.HTTPError(400, "'order' must be 'asc' or 'desc'")
+        pick = stats.nsmallest if direction == "asc" else stats.nlargest
+        top = pick(k, metric, **self.filters())
+        cols = list(dict.fromkeys([*self.state.record_cols, metric]))
+        return envelope(self.state, records_json(top[cols]), metric=metric, order=direction, k=k)
+
+class NearbyHandler(BaseHandler):
+    def render_body(self) -> bytes:
+        lat = self.float_argument("lat", low=-90, high=90)
+        lon = self.float_argument("lon", low=-180, high=180)
+        radius_km = self.float_argument("radius_km", 40.0, low=0, high=MAX_RADIUS_KM)
+        limit = self.int_argument("limit", 100, low=1)
+        df = self.state.df
+        near = institutions_near(df, get_spatial_index(df), lat, lon, radius_km / KM_PER_MILE, limit=limit)
+        near = near.assign(distance_km=near["distance_miles"] * KM_PER_MILE)
+        cols = [c for c in self.state.record_cols if c in near.columns] + ["distance_km"]
+        return envelope(self.state, records_json(near[cols]), lat=lat, lon=lon, radius_km=radius_km,
+                        count=int(len(near)))
+
+class ExportHandler(BaseHandler):
+    """Streams a view chunk by chunk, encoding each chunk on the executor so the loop keeps serving."""
+
+    async def get(self, view: str, fmt: str):
+        etag = self.state.etag(self.request.uri)
+        self.set_header("ETag", etag)
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+        if view not in EXPORT_VIEWS:
+            raise tornado.web.HTTPError(404, f"Unknown view '{view}'; expected one of {sorted(EXPORT_VIEWS)}")
+        loop = tornado.ioloop.IOLoop.current()
+        df, filters = self.state.df, self.filters()
+        frame = await loop.run_in_executor(None, lambda: export_view(df, view, **filters))
+        mime, ext = EXPORT_FORMATS[fmt]
+        self.set_header("Content-Type", mime)
+        self.set_header("Content-Disposition", f'attachment; filename="{view}-{self.state.version}{ext}"')
+        chunks = iter_export(frame, fmt)
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                break
+            self.write(chunk)
+            await self.flush()
+
+class MetricsHandler(tornado.web.RequestHandler):
+    """Process metrics in Prometheus text format (outside the versioned API)."""
+
+    def get(self):
+        self.set_header("Content-Type", CONTENT_TYPE)
+        self.write(REGISTRY.expose())
+
+def make_app(df: Optional[pd.DataFrame] = None, snapshots: Optional[str] = None) -> tornado.web.Application:
+    """Tornado application over ``df``, else the followed ``snapshots`` (see ``dataset_loader``)."""
+    source = DatasetSource((lambda: df) if df is not None else dataset_loader(snapshots))
+    routes = [
+        (rf"{API_PREFIX}/meta", MetaHandler),
+        (rf"{API_PREFIX}/institutions", InstitutionsHandler),
+        (rf"{API_PREFIX}/institutions/(\d+)", InstitutionsHandler),
+        (rf"{API_PREFIX}/rankings/(\w+)", RankingsHandler),
+        (rf"{API_PREFIX}/top/(\w+)", TopHandler),
+        (rf"{API_PREFIX}/nearby", NearbyHandler),
+        (rf"{API_PREFIX}/export/(\w+)\.({'|'.join(EXPORT_FORMATS)})", ExportHandler),
+    ]
+    return tornado.web.Application(
+        [(pattern, handler, {"source": source}) for pattern, handler in routes] + [(r"/metrics", MetricsHandler)],
+        compress_response=True,
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the scored dataset as a read-only JSON API.")
+    parser.add_argument("--port", type=int, default=8601)
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--snapshots", default=os.environ.get(SNAPSHOT_ENV),
+                        help="Snapshot root (or directory) to follow; default: the primary dataset")
+    args = parser.parse_args()
+    app = make_app(snapshots=args.snapshots)
+    app.listen(args.port, address=args.address)
+    print(f"Serving {API_PREFIX} on http://{args.address}:{args.port}")
+    tornado.ioloop.IOLoop.current().start()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# lib/baselines.py
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Union
+
+from .hs_baseline import CA_COUNTY_FIPS, load_county_baselines
+
+CA_STATE_FIPS = 6
+DEFAULT_AGE_BAND = "25-34"
+# The bundled California county file carries no survey vintage
+UNSPECIFIED_YEAR = 0
+
+# Composite key layout: state (2 digits) | county (3) | age band code (2) | year (4)
+_COUNTY_SPAN = 1_000
+_BAND_SPAN = 100
+_YEAR_SPAN = 10_000
+
+ArrayLike = Union[int, np.ndarray, pd.Series, Iterable[int]]
+
+def encode_keys(state_fips: ArrayLike, county_fips: ArrayLike, band_code: ArrayLike, year: ArrayLike) -> np.ndarray:
+    """Pack (state, county, band, year) into one int64 key per row (vectorized)."""
+    state = np.asarray(state_fips, dtype=np.int64)
+    county = np.asarray(county_fips, dtype=np.int64)
+    band = np.asarray(band_code, dtype=np.int64)
+    year = np.asarray(year, dtype=np.int64)
+    return ((state * _COUNTY_SPAN + county) * _BAND_SPAN + band) * _YEAR_SPAN + year
+
+@dataclass
+class BaselineRegistry:
+    """County HS baselines keyed by (state FIPS, county FIPS, age band, year).
+
+    Rows are stored as parallel compact arrays; a hash index over the packed
+    int64 key gives O(1) point lookups and vectorized bulk joins through
+    ``get_indexer``. Add states with ``add_county_table``.
+    """
+    keys: np.ndarray
+    median: np.ndarray
+    n_unweighted: np.ndarray
+    weight_sum: np.ndarray
+    age_bands: Dict[str, int]
+
+    def __post_init__(self):
+        self._index = pd.Index(self.keys)
+        if not self._index.is_unique:
+            raise ValueError("Duplicate (state, county, age band, year) keys in baseline registry")
+
+    @classmethod
+    def empty(cls) -> "BaselineRegistry":
+        return cls(
+            keys=np.empty(0, dtype=np.int64),
+            median=np.empty(0, dtype=np.float64),
+            n_unweighted=np.empty(0, dtype=np.float32),
+            weight_sum=np.empty(0, dtype=np.float64),
+            age_bands={},
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def band_code(self, age_band: str) -> int:
+        """Integer code for an age band (-1 if the band is not registered)."""
+        return self.age_bands.get(age_band, -1)
+
+    def add_county_table(
+        self,
+        county_df: pd.DataFrame,
+        state_fips: Optional[int] = None,
+        age_band: str = DEFAULT_AGE_BAND,
+        year: int = UNSPECIFIED_YEAR,
+    ) -> "BaselineRegistry":
+        """Return a registry with one state's county table appended.
+
+        ``county_df`` has the ``hs_median_county_25_34.csv`` layout
+        (COUNTYFIP, hs_median_income, N_unweighted, weight_sum); a STATEFIP
+        column, if present, overrides ``state_fips``.
+        """
+        bands = dict(self.age_bands)
+        code = bands.setdefault(age_band, len(bands))
+        if code >= _BAND_SPAN:
+            raise ValueError(f"Too many age bands registered (max {_BAND_SPAN})")
+        if "STATEFIP" in county_df.columns:
+            states = county_df["STATEFIP"].to_numpy()
+        elif state_fips is not None:
+            states = np.full(len(county_df), state_fips)
+        else:
+            raise ValueError("state_fips is required when the county table has no STATEFIP column")
+
+        keys = encode_keys(states, county_df["COUNTYFIP"].to_numpy(), code, year)
+        return BaselineRegistry(
+            keys=np.concatenate([self.keys, keys]),
+            median=np.concatenate([self.median, county_df["hs_median_income"].to_numpy(dtype=np.float64)]),
+            n_unweighted=np.concatenate([self.n_unweighted, county_df["N_unweighted"].to_numpy(dtype=np.float32)]),
+            weight_sum=np.concatenate([self.weight_sum, county_df["weight_sum"].to_numpy(dtype=np.float64)]),
+            age_bands=bands,
+        )
+
+    def positions(
+        self,
+        state_fips: ArrayLike,
+        county_fips: ArrayLike,
+        age_band: str = DEFAULT_AGE_BAND,
+        year: ArrayLike = UNSPECIFIED_YEAR,
+    ) -> np.ndarray:
+        """Row positions for many keys at once (-1 where no baseline exists)."""
+        state = pd.to_numeric(pd.Series(np.atleast_1d(state_fips)), errors="coerce")
+        county = pd.to_numeric(pd.Series(np.atleast_1d(county_fips)), errors="coerce")
+        known = (state.notna() & county.notna()).to_numpy()
+        code = self.band_code(age_band)
+        if code < 0:
+            return np.full(len(known), -1, dtype=np.intp)
+        keys = encode_keys(state.fillna(0).to_numpy(), county.fillna(0).to_numpy(), code, year)
+        return np.where(known, self._index.get_indexer(keys), -1)
+
+    def lookup(self, state_fips: int, county_fips: int, age_band: str = DEFAULT_AGE_BAND,
+               year: int = UNSPECIFIED_YEAR) -> Optional[float]:
+        """Single county median, or None if not registered."""
+        pos = self.positions(state_fips, county_fips, age_band, year)[0]
+        return None if pos < 0 else float(self.median[pos])
+
+    def attach(
+        self,
+        df: pd.DataFrame,
+        state_col: str = "STATEFIP",
+        county_col: str = "COUNTYFIP",
+        age_band: str = DEFAULT_AGE_BAND,
+        year: Union[int, str] = UNSPECIFIED_YEAR,
+    ) -> pd.DataFrame:
+        """Copy of ``df`` with county baseline columns joined in one vectorized pass.
+
+        ``year`` is either a fixed year or the name of a per-row year column.
+        Adds ``hs_baseline_median``, ``hs_baseline_n`` and ``hs_baseline_weight``
+        (NaN where the registry has no entry).
+        """
+        years = df[year].to_numpy() if isinstance(year, str) else year
+        pos = self.positions(df[state_col].to_numpy(), df[county_col].to_numpy(), age_band, years)
+        found = pos >= 0
+
+        def take(values: np.ndarray) -> np.ndarray:
+            out = np.full(len(pos), np.nan)
+            out[found] = values[pos[found]]
+            return out
+
+        return df.assign(
+            hs_baseline_median=take(self.median),
+            hs_baseline_n=take(self.n_unweighted),
+            hs_baseline_weight=take(self.weight_sum),
+        )
+
+    def _band_year_mask(self, age_band: str, year: int) -> np.ndarray:
+        band = (self.keys // _YEAR_SPAN) % _BAND_SPAN
+        return (band == self.band_code(age_band)) & (self.keys % _YEAR_SPAN == year)
+
+    def county_table(self, age_band: str = DEFAULT_AGE_BAND, year: int = UNSPECIFIED_YEAR) -> pd.DataFrame:
+        """One band/year as [STATEFIP, COUNTYFIP, hs_median_income, N_unweighted, weight_sum], in registry order."""
+        mask = self._band_year_mask(age_band, year)
+        county = self.keys[mask] // (_BAND_SPAN * _YEAR_SPAN)
+        return pd.DataFrame({
+            "STATEFIP": county // _COUNTY_SPAN,
+            "COUNTYFIP": county % _COUNTY_SPAN,
+            "hs_median_income": self.median[mask],
+            "N_unweighted": self.n_unweighted[mask],
+            "weight_sum": self.weight_sum[mask],
+        })
+
+    def statewide(self, age_band: str = DEFAULT_AGE_BAND, year: int = UNSPECIFIED_YEAR) -> pd.Series:
+        """weight_sum-weighted statewide baseline per state for one band/year."""
+        mask = self._band_year_mask(age_band, year)
+        states = self.keys[mask] // (_COUNTY_SPAN * _BAND_SPAN * _YEAR_SPAN)
+        uniq, inverse = np.unique(states, return_inverse=True)
+        weights = self.weight_sum[mask]
+        num = np.bincount(inverse, weights=self.median[mask] * weights, minlength=len(uniq))
+        den = np.bincount(inverse, weights=weights, minlength=len(uniq))
+        return pd.Series(num / den, index=pd.Index(uniq, name="STATEFIP"), name="hs_statewide_median")
+
+def county_fips_columns(df: pd.DataFrame, county_col: str = "County") -> pd.DataFrame:
+    """STATEFIP/COUNTYFIP per row.
+
+    Rows that already carry both codes (sources outside California) keep
+    them; the rest are resolved from California county names.
+    """
+    county = df[county_col].map(CA_COUNTY_FIPS).astype("Int64")
+    state = pd.Series(CA_STATE_FIPS, index=df.index, dtype="Int64").where(county.notna())
+    if {"STATEFIP", "COUNTYFIP"} <= set(df.columns):
+        own_state = pd.to_numeric(df["STATEFIP"], errors="coerce").astype("Int64")
+        own_county = pd.to_numeric(df["COUNTYFIP"], errors="coerce").astype("Int64")
+        own = (own_state.notna() & own_county.notna()).to_numpy()
+        state = state.mask(own, own_state)
+        county = county.mask(own, own_county)
+    return pd.DataFrame({"STATEFIP": state, "COUNTYFIP": county}, index=df.index)
+
+def load_baseline_registry(county_data_path: str = "data/hs_median_county_25_34.csv") -> BaselineRegistry:
+    """Registry seeded with the bundled California county file."""
+    return BaselineRegistry.empty().add_county_table(
+        load_county_baselines(county_data_path), state_fips=CA_STATE_FIPS
+    )
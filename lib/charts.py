@@ -20,4 +20,15 @@ def quadrant_chart(df: pd.DataFrame) -> alt.Chart:
     points = base.mark_circle(size=70).encode(color=alt.Color("Sector:N", legend=alt.Legend(title="Sector")))
     vline = alt.Chart(pd.DataFrame({"x": [price_median]})).mark_rule(color="gray", strokeDash=[4,4]).encode(x="x:Q")
     hline = alt.Chart(pd.DataFrame({"y": [earn_median]})).mark_rule(color="gray", strokeDash=[4,4]).encode(y="y:Q")
-    return (points + vline + hline).properties(height=520)
\ No newline at end of file
+    return (points + vline + hline).properties(height=520)
+
+def trend_chart(history: pd.DataFrame, metrics: dict) -> alt.Chart:
+    """Line chart of ``metrics`` ({column: label}) across cohort years for one institution."""
+    long = history.melt(id_vars=["year"], value_vars=list(metrics), var_name="metric", value_name="value")
+    long["metric"] = long["metric"].map(metrics)
+    return alt.Chart(long).mark_line(point=True).encode(
+        x=alt.X("year:O", title="Cohort Year"),
+        y=alt.Y("value:Q", title="USD", scale=alt.Scale(zero=False)),
+        color=alt.Color("metric:N", legend=alt.Legend(title=None)),
+        tooltip=["year:O", "metric:N", alt.Tooltip("value:Q", format=",.0f")],
+    ).properties(height=320)
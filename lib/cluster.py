@@ -0,0 +1,245 @@
+# lib/cluster.py
+"""Run several Streamlit workers behind one port, sharing a mapped dataset.
+
+    python -m lib.cluster --workers 4 --port 8501
+    python -m lib.cluster --workers 2 --port $PORT --address 0.0.0.0 -- --server.enableCORS false
+
+The dataset snapshot (lib/snapshot.py) is built once, then each worker is
+started with ``EPANALYSIS_SNAPSHOT`` pointing at the snapshot root, so
+workers map the same pages instead of each loading and indexing its own
+copy. The root's publisher (``python -m lib.refresh``, lib/refresh.py)
+runs as its own process, so snapshot builds never stall the balancer:
+when the source files change it builds and publishes the next snapshot,
+and workers switch to it once they have warmed it.
+
+A balancer on ``--port`` forwards connections to the workers on local
+ports ``--worker-port`` and up. Sessions, uploaded media and download
+buttons live in one worker's memory, so a connection is routed by the
+``epanalysis_worker`` cookie in its first request: the first response to
+a new client sets it, and the session websocket and ``/media`` downloads
+carry it back to the same worker. Clients without the cookie go to the
+worker with the fewest open connections; a client whose worker is down
+fails over to the next one. Workers and the publisher are restarted when
+they exit; SIGTERM/SIGINT stops them all. Arguments after ``--`` are
+passed to every ``streamlit run``.
+"""
+import argparse
+import asyncio
+import os
+import secrets
+import signal
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from .metrics import METRICS_PORT_ENV
+from .refresh import DEFAULT_INTERVAL_SECONDS, read_current
+from .snapshot import SNAPSHOT_ENV
+
+ROOT = Path(__file__).resolve().parent.parent
+RESTART_DELAY_SECONDS = 2.0
+BUFFER_SIZE = 64 * 1024
+# Names the worker that holds a client's sessions and media
+STICKY_COOKIE = "epanalysis_worker"
+HEAD_TIMEOUT_SECONDS = 30.0
+_HEAD_END = b"\r\n\r\n"
+
+class Child:
+    """One supervised subprocess."""
+
+    def __init__(self, name: str, args: List[str], env: Optional[dict] = None):
+        self.name = name
+        self.args = args
+        self.env = env
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        self.process = subprocess.Popen(self.args, cwd=ROOT, env=self.env)
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if not self.alive():
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+class Worker(Child):
+    """One ``streamlit run app.py`` process on a local port."""
+
+    def __init__(self, index: int, port: int, env: dict, extra_args: List[str]):
+        super().__init__(f"worker {index}", [
+            sys.executable, "-m", "streamlit", "run", str(ROOT / "app.py"),
+            "--server.port", str(port), "--server.address", "127.0.0.1",
+            "--server.headless", "true", *extra_args,
+        ], env)
+        self.index = index
+        self.port = port
+        self.connections = 0
+
+def refresh_command(root: str, *args: str) -> List[str]:
+    """``python -m lib.refresh`` for snapshot root ``root``."""
+    return [sys.executable, "-m", "lib.refresh", root, *args]
+
+def worker_env(index: int, snapshot: str, cookie_secret: str) -> dict:
+    """Environment for worker ``index``: the shared snapshot root and cookie secret, its own metrics port."""
+    env = dict(os.environ, **{SNAPSHOT_ENV: snapshot, "STREAMLIT_SERVER_COOKIE_SECRET": cookie_secret})
+    if env.get(METRICS_PORT_ENV):
+        env[METRICS_PORT_ENV] = str(int(env[METRICS_PORT_ENV]) + index)
+    return env
+
+def pick_order(first: int, count: int) -> List[int]:
+    """Workers to try: ``first``, then the others in turn."""
+    return [(first + i) % count for i in range(count)]
+
+def sticky_worker(head: bytes, count: int) -> Optional[int]:
+    """Worker index from the sticky cookie in a request head (None when absent or out of range)."""
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() != b"cookie":
+            continue
+        for pair in value.split(b";"):
+            key, _, index = pair.strip().partition(b"=")
+            if key == STICKY_COOKIE.encode() and index.isdigit() and int(index) < count:
+                return int(index)
+    return None
+
+def with_sticky_cookie(head: bytes, index: int) -> bytes:
+    """Response head with a cookie pinning the client to worker ``index``."""
+    cookie = f"Set-Cookie: {STICKY_COOKIE}={index}; Path=/; HttpOnly; SameSite=Lax\r\n".encode()
+    return head[:-2] + cookie + b"\r\n"
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while data := await reader.read(BUFFER_SIZE):
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+async def _pipe_pinned(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, index: Optional[int]) -> None:
+    """``_pipe`` that first adds the sticky cookie for worker ``index`` to the response head."""
+    if index is not None:
+        try:
+            head = await reader.readuntil(_HEAD_END)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        writer.write(with_sticky_cookie(head, index))
+    await _pipe(reader, writer)
+
+class Balancer:
+    """Forwards each connection to the worker named by its sticky cookie, else the least busy one."""
+
+    def __init__(self, workers: List[Worker]):
+        self.workers = workers
+        self._turn = 0
+
+    def least_busy(self) -> int:
+        """Running worker with the fewest open connections; ties rotate."""
+        self._turn = (self._turn + 1) % len(self.workers)
+        running = [w for w in self.workers if w.alive()] or self.workers
+        return min(running, key=lambda w: (w.connections, (w.index - self._turn) % len(self.workers))).index
+
+    async def handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        # Only the first request head is read; the rest of the connection is piped as-is
+        try:
+            head = await asyncio.wait_for(client_reader.readuntil(_HEAD_END), HEAD_TIMEOUT_SECONDS)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            client_writer.close()
+            return
+        pinned = sticky_worker(head, len(self.workers))
+        first = pinned if pinned is not None else self.least_busy()
+        for i in pick_order(first, len(self.workers)):
+            worker = self.workers[i]
+            if not worker.alive():
+                continue
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", worker.port)
+            except OSError:
+                continue
+            worker.connections += 1
+            try:
+                upstream_writer.write(head)
+                await asyncio.gather(_pipe(client_reader, upstream_writer),
+                                     _pipe_pinned(upstream_reader, client_writer, None if i == pinned else i))
+            finally:
+                worker.connections -= 1
+            return
+        client_writer.close()
+
+async def supervise(children: Sequence[Child], stop: asyncio.Event) -> None:
+    """Restart children that exit until ``stop`` is set."""
+    while not stop.is_set():
+        for child in children:
+            if child.process is not None and not child.alive():
+                print(f"{child.name} exited with {child.process.returncode}; restarting",
+                      file=sys.stderr, flush=True)
+                child.start()
+        try:
+            await asyncio.wait_for(stop.wait(), RESTART_DELAY_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+async def serve(workers: List[Worker], address: str, port: int, others: Sequence[Child] = ()) -> None:
+    """Balance ``address:port`` over ``workers``; ``others`` (e.g. the publisher) are supervised alongside."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    children = [*workers, *others]
+    for child in children:
+        child.start()
+    server = await asyncio.start_server(Balancer(workers).handle, address, port)
+    print(f"balancing {address}:{port} over {len(workers)} workers "
+          f"(ports {workers[0].port}-{workers[-1].port})", flush=True)
+    try:
+        async with server:
+            await supervise(children, stop)
+    finally:
+        for child in children:
+            child.stop()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    extra: List[str] = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, extra = argv[:split], argv[split + 1:]
+    parser = argparse.ArgumentParser(description="Run Streamlit workers behind one port with a shared dataset snapshot.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--port", type=int, default=8501)
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--worker-port", type=int, default=None, help="First worker port (default: --port + 1)")
+    parser.add_argument("--snapshots", default="snapshots", help="Directory for dataset snapshots")
+    parser.add_argument("--refresh-seconds", type=float, default=DEFAULT_INTERVAL_SECONDS,
+                        help="Seconds between source checks (0 disables background refresh)")
+    args = parser.parse_args(argv)
+
+    # The first snapshot is built before any worker starts; later ones by
+    # the publisher process, so builds never run in the balancer's process
+    snapshot = str(Path(args.snapshots).resolve())
+    subprocess.run(refresh_command(snapshot, "--once"), cwd=ROOT, check=True)
+    published = read_current(snapshot)
+    print(f"dataset generation {published.generation}: {published.path}", flush=True)
+    first_port = args.worker_port or args.port + 1
+    # Shared so a client's signed cookies stay valid if it fails over to another worker
+    cookie_secret = os.environ.get("STREAMLIT_SERVER_COOKIE_SECRET") or secrets.token_hex(32)
+    workers = [Worker(i, first_port + i, worker_env(i, snapshot, cookie_secret), extra)
+               for i in range(max(1, args.workers))]
+    others = []
+    if args.refresh_seconds > 0:
+        others.append(Child("dataset refresh", refresh_command(snapshot, "--interval", str(args.refresh_seconds))))
+    asyncio.run(serve(workers, args.address, args.port, others))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+# lib/commute.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+from dataclasses import dataclass
+from typing import Optional
+
+from .baselines import BaselineRegistry, county_fips_columns, load_baseline_registry
+from .data import CACHED_SCENARIOS, dataset_version
+from .geo import SpatialIndex, great_circle_miles
+from .metrics import cache_lookup, cache_miss
+
+COUNTY_KEYS = ["STATEFIP", "COUNTYFIP"]
+
+@dataclass(frozen=True)
+class CommuteZoneParams:
+    """How nearby county baselines are mixed into a commute-zone baseline."""
+    radius_miles: float = 30.0
+    # Exponential distance decay: weight ∝ exp(-d / bandwidth)
+    bandwidth_miles: float = 15.0
+    # Also weight each county by its HS-graduate population (weight_sum)
+    population_weighted: bool = True
+
+@dataclass(frozen=True)
+class SparseWeights:
+    """Row-normalized institutions × counties weight matrix in CSR layout."""
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    n_cols: int
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """W @ x for a county vector ``x``; rows with no neighbours give NaN."""
+        counts = np.diff(self.indptr)
+        rows = np.repeat(np.arange(self.n_rows), counts)
+        out = np.bincount(rows, weights=self.data * x[self.indices], minlength=self.n_rows)
+        out[counts == 0] = np.nan
+        return out
+
+def county_centroids(institutions_path: str = "data/gr-institutions.csv") -> pd.DataFrame:
+    """Approximate county centroids as the mean location of each county's institutions.
+
+    The repo ships no county geometry; counties without any institution in
+    ``gr-institutions.csv`` get no centroid and only contribute to their
+    own institutions' baselines. Pass a real centroid table (keyed by
+    STATEFIP, COUNTYFIP) to ``build_commute_weights`` to replace this.
+    """
+    inst = pd.read_csv(institutions_path)
+    inst = inst.assign(**county_fips_columns(inst)).dropna(subset=[*COUNTY_KEYS, "Latitude", "Longitude"])
+    centroids = inst.groupby(COUNTY_KEYS, as_index=False)[["Latitude", "Longitude"]].mean()
+    return centroids.astype({key: int for key in COUNTY_KEYS})
+
+def build_commute_weights(
+    inst_lat: np.ndarray,
+    inst_lon: np.ndarray,
+    own_col: np.ndarray,
+    county_df: pd.DataFrame,
+    centroids: pd.DataFrame,
+    params: CommuteZoneParams = CommuteZoneParams(),
+) -> SparseWeights:
+    """Sparse mixing weights from each institution to the county baselines near it.
+
+    Candidate pairs come from one radius query per county centroid on a
+    KD-tree of institutions (counties are far fewer). The institution's own
+    county (``own_col``, its row in ``county_df`` or -1) is always included;
+    if nothing qualifies, the nearest county is used. The CSR arrays are
+    then assembled from the pair arrays in one pass. Columns follow the
+    rows of ``county_df``; rows sum to 1.
+    """
+    n, c = len(inst_lat), len(county_df)
+    located = centroids.set_index(COUNTY_KEYS).reindex(pd.MultiIndex.from_frame(county_df[COUNTY_KEYS]))
+    county_lat = located["Latitude"].to_numpy(dtype=float)
+    county_lon = located["Longitude"].to_numpy(dtype=float)
+    population = county_df["weight_sum"].to_numpy(dtype=float) if params.population_weighted else np.ones(c)
+
+    institutions = SpatialIndex(inst_lat, inst_lon)
+    rows, cols, miles = [], [], []
+    for col in np.flatnonzero(~(np.isnan(county_lat) | np.isnan(county_lon))):
+        near, d = institutions.query_radius(county_lat[col], county_lon[col], params.radius_miles)
+        rows.append(near)
+        cols.append(np.full(len(near), col, dtype=np.intp))
+        miles.append(d)
+
+    own = np.flatnonzero(own_col >= 0)
+    # Own county without a usable centroid counts as distance 0
+    rows.append(own)
+    cols.append(own_col[own])
+    miles.append(np.nan_to_num(great_circle_miles(inst_lat[own], inst_lon[own],
+                                                  county_lat[own_col[own]], county_lon[own_col[own]])))
+
+    paired = np.zeros(n, dtype=bool)
+    for r in rows:
+        paired[r] = True
+    counties = SpatialIndex(county_lat, county_lon)
+    for i in np.flatnonzero(~paired & ~np.isnan(inst_lat) & ~np.isnan(inst_lon)):
+        near, d = counties.query_nearest(inst_lat[i], inst_lon[i], 1)
+        rows.append(np.full(len(near), i, dtype=np.intp))
+        cols.append(near)
+        miles.append(d)
+
+    # Unique (row, col) pairs in row-major order are the CSR layout
+    row, col, dist = (np.concatenate(parts) for parts in (rows, cols, miles))
+    _, first = np.unique(row.astype(np.int64) * c + col, return_index=True)
+    row, col, dist = row[first], col[first], dist[first]
+    w = population[col] * np.exp(-dist / params.bandwidth_miles)
+    total = np.bincount(row, weights=w, minlength=n)
+    keep = total[row] > 0
+    row, col, w = row[keep], col[keep], w[keep]
+    return SparseWeights(
+        indptr=np.concatenate([[0], np.cumsum(np.bincount(row, minlength=n))]).astype(np.intp),
+        indices=col.astype(np.intp),
+        data=w / total[row],
+        n_cols=c,
+    )
+
+@dataclass(frozen=True)
+class CommuteZoneModel:
+    """Cached weights plus the county baseline vector they mix."""
+    weights: SparseWeights
+    county_median: np.ndarray
+
+    def baselines(self, county_median: Optional[np.ndarray] = None) -> np.ndarray:
+        """Commute-zone baseline per institution: one sparse mat-vec.
+
+        Pass an alternative ``county_median`` vector (same county order) to
+        rescore a scenario without rebuilding the weights.
+        """
+        return self.weights.matvec(self.county_median if county_median is None else county_median)
+
+def baseline_registry_for(df: pd.DataFrame) -> BaselineRegistry:
+    """The registry ``df`` was scored against (the bundled one for frames not built by the loader)."""
+    params = df.attrs.get("prep_params")
+    if params is None:
+        return load_baseline_registry()
+    from .prep import PIPELINE  # lib.prep imports the scoring modules
+
+    return PIPELINE.run("ingest_baselines", **params)
+
+def build_commute_model(
+    df: pd.DataFrame,
+    params: CommuteZoneParams = CommuteZoneParams(),
+    registry: Optional[BaselineRegistry] = None,
+    institutions_path: str = "data/gr-institutions.csv",
+) -> CommuteZoneModel:
+    """Commute-zone weights for the institutions in ``df``, over the registry's (STATEFIP, COUNTYFIP) counties."""
+    registry = registry if registry is not None else baseline_registry_for(df)
+    county_df = registry.county_table()
+    fips = df[COUNTY_KEYS] if set(COUNTY_KEYS) <= set(df.columns) else county_fips_columns(df)
+    # Map registry rows to county_df columns, then each institution to its own county's column
+    col_of = np.full(len(registry), -1, dtype=np.intp)
+    col_of[registry.positions(county_df["STATEFIP"], county_df["COUNTYFIP"])] = np.arange(len(county_df))
+    pos = registry.positions(fips["STATEFIP"].to_numpy(), fips["COUNTYFIP"].to_numpy())
+    weights = build_commute_weights(
+        pd.to_numeric(df["Latitude"], errors="coerce").to_numpy(dtype=float),
+        pd.to_numeric(df["Longitude"], errors="coerce").to_numpy(dtype=float),
+        np.where(pos >= 0, col_of[pos], -1),
+        county_df,
+        county_centroids(institutions_path),
+        params,
+    )
+    return CommuteZoneModel(weights=weights, county_median=county_df["hs_median_income"].to_numpy(dtype=float))
+
+@cache_lookup("commute_model")
+@st.cache_resource(show_spinner=False, max_entries=CACHED_SCENARIOS)
+@cache_miss("commute_model")
+def _cached_commute_model(version: str, params: CommuteZoneParams, _df: pd.DataFrame) -> CommuteZoneModel:
+    return build_commute_model(_df, params)
+
+def get_commute_model(df: pd.DataFrame, params: CommuteZoneParams = CommuteZoneParams()) -> CommuteZoneModel:
+    """Commute-zone model for ``df``, built once per dataset version and parameter set."""
+    version = dataset_version(df)
+    if version is None:
+        return build_commute_model(df, params)
+    return _cached_commute_model(version, params, df)
@@ -0,0 +1,133 @@
+# lib/comparison.py
+"""Derived tables for the Earnings Premium and ROI comparison pages.
+
+Each table is built once per dataset version and shared by every session
+(``st.cache_resource``), already sorted for the page's top-k views, so a
+rerun only slices rows. The frames are shared: treat them as read-only.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+from dataclasses import dataclass
+
+from .data import CACHED_VERSIONS, dataset_version
+from .metrics import cache_lookup, cache_miss
+from .order_stats import get_order_stats
+from .scoring import STATEWIDE_HS_BASELINE
+
+EARNINGS_COLUMNS = {
+    "Institution": "Institution",
+    "Region": "Region",
+    "Type": "Type",
+    "median_earnings_10yr": "Median Earnings (Grad)",
+    "total_net_price": "Net Tuition",
+    "HS_Statewide": "HS Earnings Statewide",
+    "hs_median_income": "HS Earnings County",
+    "premium_statewide": "C-Metric",
+    "premium_regional": "H-Metric",
+    "Delta": "Delta",
+}
+DELTA_COLUMNS = ["Institution", "Region", "Type", "Delta"]
+ROI_LABEL_COLUMNS = ["Institution", "Region", "Type", "Net Tuition"]
+
+@dataclass(frozen=True)
+class EarningsComparison:
+    """C-Metric (statewide) vs H-Metric (county) premiums for every institution."""
+    metrics: pd.DataFrame
+    # Delta tables sorted for top-k: largest first / smallest first
+    top_positive: pd.DataFrame
+    top_negative: pd.DataFrame
+
+@dataclass(frozen=True)
+class ROIComparison:
+    """C-Metric vs H-Metric ROI for institutions with a valid ROI under both baselines."""
+    table: pd.DataFrame
+    # Fastest payback first under each baseline, ROI shown as years and months
+    best_statewide: pd.DataFrame
+    best_regional: pd.DataFrame
+
+def institution_type(sector: pd.Series) -> np.ndarray:
+    """'Private' for private sectors, 'Public' otherwise (including missing)."""
+    return np.where(sector.astype(str).str.contains("Private", regex=False), "Private", "Public")
+
+def format_years(values: pd.Series) -> pd.Series:
+    """'2.50 years (≈ 30.0 months)' labels; 'N/A' for missing values."""
+    return pd.Series(
+        [f"{x:.2f} years (≈ {x * 12:.1f} months)" if pd.notna(x) else "N/A" for x in values],
+        index=values.index, dtype=object,
+    )
+
+def _sorted_by(frame: pd.DataFrame, col: str, ascending: bool) -> pd.DataFrame:
+    """Rows in ``nsmallest``/``nlargest`` order: first occurrence wins ties, missing values last."""
+    values = frame[col].to_numpy(dtype=float)
+    missing = np.isnan(values)
+    idx = np.flatnonzero(~missing)
+    keys = values[idx] if ascending else -values[idx]
+    return frame.iloc[np.concatenate([idx[np.argsort(keys, kind="stable")], np.flatnonzero(missing)])]
+
+def earnings_comparison(df: pd.DataFrame) -> EarningsComparison:
+    # Delta = C-Metric - H-Metric (statewide minus county premium)
+    base = df.assign(
+        Type=institution_type(df["Sector"]),
+        Delta=df["premium_statewide"] - df["premium_regional"],
+        HS_Statewide=df["hs_statewide_median"] if "hs_statewide_median" in df.columns else STATEWIDE_HS_BASELINE,
+    )
+    metrics = base[list(EARNINGS_COLUMNS)].rename(columns=EARNINGS_COLUMNS)
+    delta = base[DELTA_COLUMNS]
+    return EarningsComparison(
+        metrics=metrics,
+        top_positive=_sorted_by(delta, "Delta", ascending=False),
+        top_negative=_sorted_by(delta, "Delta", ascending=True),
+    )
+
+def roi_comparison(df: pd.DataFrame) -> ROIComparison:
+    valid = get_order_stats(df).view("roi_valid")
+    c_metric = valid["roi_statewide_years"]
+    h_metric = valid["roi_regional_years"]
+    base = pd.DataFrame({
+        "Institution": valid["Institution"],
+        "Region": valid["Region"],
+        "Type": institution_type(valid["Sector"]),
+        "Net Tuition": valid["total_net_price"],
+        "C-Metric ROI": c_metric,
+        "H-Metric ROI": h_metric,
+        "Delta": c_metric - h_metric,
+    })
+    labels = {col: format_years(base[col]) for col in ("C-Metric ROI", "H-Metric ROI", "Delta")}
+    table = base[ROI_LABEL_COLUMNS].assign(**labels)
+
+    def best(col: str) -> pd.DataFrame:
+        order = _sorted_by(base[[col]], col, ascending=True).index
+        return base.loc[order, ROI_LABEL_COLUMNS].assign(**{col: labels[col].loc[order]})
+
+    return ROIComparison(
+        table=table,
+        best_statewide=best("C-Metric ROI"),
+        best_regional=best("H-Metric ROI"),
+    )
+
+@cache_lookup("earnings_comparison")
+@st.cache_resource(show_spinner=False, max_entries=CACHED_VERSIONS)
+@cache_miss("earnings_comparison")
+def _cached_earnings_comparison(version: str, _df: pd.DataFrame) -> EarningsComparison:
+    return earnings_comparison(_df)
+
+def get_earnings_comparison(df: pd.DataFrame) -> EarningsComparison:
+    """Earnings premium comparison tables, built once per dataset version and shared across sessions."""
+    version = dataset_version(df)
+    if version is None:
+        return earnings_comparison(df)
+    return _cached_earnings_comparison(version, df)
+
+@cache_lookup("roi_comparison")
+@st.cache_resource(show_spinner=False, max_entries=CACHED_VERSIONS)
+@cache_miss("roi_comparison")
+def _cached_roi_comparison(version: str, _df: pd.DataFrame) -> ROIComparison:
+    return roi_comparison(_df)
+
+def get_roi_comparison(df: pd.DataFrame) -> ROIComparison:
+    """ROI comparison tables, built once per dataset version and shared across sessions."""
+    version = dataset_version(df)
+    if version is None:
+        return roi_comparison(df)
+    return _cached_roi_comparison(version, df)
@@ -0,0 +1,55 @@
+# lib/cost_model.py
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+from .data_schema import AwardType, Sector
+
+# Years of annual net price that make up the total cost of a credential.
+# Public rows are priced per year (PublicInstitution.total_net_price_2yr is
+# two years of it); private rows model the cost of the whole credential
+# (PrivateInstitution.total_net_price_credential), which for the predominant
+# award uses the same nominal lengths. Override per (award, sector) as needed.
+AWARD_YEARS: Dict[AwardType, float] = {
+    AwardType.CERTIFICATE: 1.0,
+    AwardType.ASSOCIATES: 2.0,
+    AwardType.BACHELORS: 4.0,
+    AwardType.MASTERS: 2.0,
+    AwardType.DOCTORAL: 5.0,
+}
+
+@dataclass(frozen=True)
+class CostModel:
+    """Program length lookup table over (award type, sector).
+
+    Rows are ``AwardType`` members and columns ``Sector`` members, so total
+    cost for a whole frame is one categorical-code gather, not a per-row
+    branch. Unknown awards or sectors get NaN.
+    """
+    award_years: Dict[AwardType, float] = field(default_factory=lambda: dict(AWARD_YEARS))
+    overrides: Dict[Tuple[AwardType, Sector], float] = field(default_factory=dict)
+
+    def table(self) -> np.ndarray:
+        awards, sectors = list(AwardType), list(Sector)
+        years = np.full((len(awards), len(sectors)), np.nan)
+        for i, award in enumerate(awards):
+            years[i, :] = self.award_years.get(award, np.nan)
+        for (award, sector), value in self.overrides.items():
+            years[awards.index(award), sectors.index(sector)] = value
+        return years
+
+    def length_years(self, award: pd.Series, sector: pd.Series) -> np.ndarray:
+        """Program length per row from award labels ("Associate's", ...) and sector labels."""
+        award_codes = pd.Categorical(award, categories=[a.value for a in AwardType]).codes
+        sector_codes = pd.Categorical(sector, categories=[s.value for s in Sector]).codes
+        known = (award_codes >= 0) & (sector_codes >= 0)
+        out = np.full(len(award_codes), np.nan)
+        out[known] = self.table()[award_codes[known], sector_codes[known]]
+        return out
+
+    def total_cost(self, annual_price: pd.Series, award: pd.Series, sector: pd.Series) -> np.ndarray:
+        """Annual net price × credential length for every row in one pass."""
+        return pd.to_numeric(annual_price, errors="coerce").to_numpy(dtype=float) * self.length_years(award, sector)
+
+DEFAULT_COST_MODEL = CostModel()
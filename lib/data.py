@@ -1,13 +1,40 @@
 # lib/data.py
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
 import pandas as pd
 import streamlit as st
 
-NUMERIC_COLS = [
-    "total_net_price","median_earnings_10yr","premium_statewide","premium_regional",
-    "roi_statewide_years","roi_regional_years","rank_statewide","rank_regional",
-    "rank_change","hs_median_income",
-]
-EXPECTED_COLS = {"UNITID": None,"Institution": None,"Region": None,"County": None,"Sector": None, **{c: None for c in NUMERIC_COLS}}
+from .data_schema import NUMERIC_COLS, REQUIRED_COLS
+from .metrics import DATASET_INFO, DATASET_LOAD_SECONDS, cache_lookup, cache_miss
+from .profiling import profiled
+
+EXPECTED_COLS = {**{c: None for c in REQUIRED_COLS}, **{c: None for c in NUMERIC_COLS}}
+
+# Dataset versions each per-version cache keeps; older ones are evicted as
+# background refreshes (lib/refresh.py) publish new versions
+CACHED_VERSIONS = 4
+# Caches keyed by version and scenario parameters (What-If sliders) keep
+# this many entries, across versions
+CACHED_SCENARIOS = 8 * CACHED_VERSIONS
+
+# Cohort year of the source files; when set, each loaded or published
+# dataset is also written to the panel store (lib/panel.py)
+COHORT_YEAR_ENV = "EPANALYSIS_COHORT_YEAR"
+
+def compute_dataset_version(*paths: str) -> str:
+    """Short content hash of the source files; changes whenever any input changes."""
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:12]
+
+def dataset_version(df: pd.DataFrame) -> Optional[str]:
+    """Version tag stamped on a loaded dataset (None for frames built elsewhere)."""
+    return df.attrs.get("dataset_version")
 
 @st.cache_data
 def load_public_roi(path: str) -> pd.DataFrame:
@@ -51,67 +78,56 @@ def load_combined(path: str) -> pd.DataFrame:
         df[c] = pd.to_numeric(df[c], errors="coerce")
     return df
 
+@cache_lookup("dataset")
 @st.cache_data
+@cache_miss("dataset")
+@profiled()
 def load_roi_metrics_dataset(roi_metrics_path: str = "data/roi-metrics.csv", 
-                             institutions_path: str = "data/gr-institutions.csv") -> pd.DataFrame:
-    """New primary loader: roi-metrics dataset merged with institutions data."""
+                             institutions_path: str = "data/gr-institutions.csv",
+                             award_types: Tuple[str, ...] = ("Associate's",),
+                             impute_prices: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+    """New primary loader: roi-metrics dataset merged with institutions data.
+
+    ``award_types`` selects institutions by predominant award; total cost
+    follows each row's credential length (see lib/cost_model.py).
+    ``impute_prices`` optionally fills zero/missing annual prices with group
+    medians over those columns (e.g. ``("Sector", "Predominant Award")``;
+    ``()`` for the overall median) and flags them in ``price_imputed``.
+    """
+    # lib.prep imports lib.order_stats, which imports this module
+    from .prep import PIPELINE
+
+    started = time.perf_counter()
     try:
-        # Load ROI metrics
-        roi_df = pd.read_csv(roi_metrics_path)
-        
-        # Load institutions data for additional fields like Region
-        inst_df = pd.read_csv(institutions_path)
-        
-        # Filter for Associate's institutions only
-        inst_df = inst_df[inst_df['Predominant Award'] == "Associate's"]
-        
-        # Merge on Institution name (both datasets should have this)
-        # Using inner join to only keep institutions that are Associate's
-        df = roi_df.merge(
-            inst_df[['Institution', 'Region', 'Predominant Award']], 
-            on='Institution', 
-            how='inner'
-        )
-        
+        # Ingest -> clean -> join -> impute -> baselines -> score; stages whose
+        # inputs and parameters are unchanged come from the pipeline cache
+        params = {
+            "roi_metrics_path": roi_metrics_path,
+            "institutions_path": institutions_path,
+            "award_types": tuple(award_types),
+            "impute_prices": None if impute_prices is None else tuple(impute_prices),
+        }
+        df, version = PIPELINE.run_keyed("score", **params)
+
         # Handle any missing regions
         if df['Region'].isna().any():
             missing_count = df['Region'].isna().sum()
             st.warning(f"Missing Region data for {missing_count} institutions")
-        
-        # Ensure numeric columns are properly typed
-        numeric_cols = [
-            'median_earnings_10yr', 'total_net_price', 'premium_statewide', 'premium_regional',
-            'roi_statewide_years', 'roi_regional_years', 'rank_statewide', 'rank_regional', 
-            'rank_change', 'hs_median_income'
-        ]
-        
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-        
-        # Correct total_net_price: Associate's degrees are 2-year programs
-        # So total cost should be 2x annual net price
-        df['total_net_price'] = df['total_net_price'] * 2
-        
-        # Recalculate ROI metrics with corrected total_net_price
-        # Statewide ROI
-        statewide_baseline = 24939.44
-        df['premium_statewide'] = df['median_earnings_10yr'] - statewide_baseline
-        df['roi_statewide_years'] = df['total_net_price'] / df['premium_statewide']
-        
-        # Regional ROI
-        df['premium_regional'] = df['median_earnings_10yr'] - df['hs_median_income']
-        df['roi_regional_years'] = df['total_net_price'] / df['premium_regional']
-        
-        # Handle invalid ROI (negative premium or division by zero)
-        df.loc[df['premium_statewide'] <= 0, 'roi_statewide_years'] = 999
-        df.loc[df['premium_regional'] <= 0, 'roi_regional_years'] = 999
-        
-        # Recalculate rankings based on corrected ROI
-        df['rank_statewide'] = df['roi_statewide_years'].rank(method='min')
-        df['rank_regional'] = df['roi_regional_years'].rank(method='min')
-        df['rank_change'] = df['rank_statewide'] - df['rank_regional']
-        
+
+        # Tag the frame so downstream caches (indexes, derived tables) can key
+        # on it; the score stage key covers the files and every parameter.
+        # Stage outputs are shared read-only, so the tags go on a shallow copy
+        df = df.copy(deep=False)
+        df.attrs["dataset_version"] = version
+        df.attrs["prep_params"] = params
+
+        if os.environ.get(COHORT_YEAR_ENV):
+            from .panel import publish_cohort  # pyarrow.dataset stays off the startup path
+
+            publish_cohort(df)
+
+        DATASET_LOAD_SECONDS.set(time.perf_counter() - started)
+        DATASET_INFO.replace(1, version=df.attrs["dataset_version"], rows=len(df))
         return df
         
     except FileNotFoundError as e:
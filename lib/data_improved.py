@@ -5,6 +5,7 @@ from typing import Optional, Dict, Any, List
 from pathlib import Path
 import logging
 from .models import DataConfig
+from .quality import quality_report
 
 logger = logging.getLogger(__name__)
 
@@ -89,15 +90,11 @@ class DataLoader:
     
     def _validate_data_quality(self, df: pd.DataFrame) -> None:
         """Check data quality and log warnings."""
-        # Check for institutions with zero net price
-        zero_price = df[df['total_net_price'] == 0]
-        if not zero_price.empty:
-            logger.warning(f"{len(zero_price)} institutions have $0 net price")
-        
-        # Check for missing earnings data
-        missing_earnings = df['median_earnings_10yr'].isna().sum()
-        if missing_earnings > 0:
-            logger.warning(f"{missing_earnings} institutions missing earnings data")
+        checks = quality_report(df).checks
+        if checks.get("zero_price"):
+            logger.warning(f"{checks['zero_price']} institutions have $0 net price")
+        if checks.get("missing_earnings"):
+            logger.warning(f"{checks['missing_earnings']} institutions missing earnings data")
     
     @st.cache_data
     def merge_datasets(_self, combined_df: pd.DataFrame, golden_df: pd.DataFrame) -> pd.DataFrame:
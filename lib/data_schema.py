@@ -3,6 +3,16 @@ from enum import Enum
 from typing import Optional, List
 from dataclasses import dataclass
 
+import pandas as pd
+
+# Numeric columns of the ROI metrics files, coerced on load
+NUMERIC_COLS = [
+    "total_net_price", "median_earnings_10yr", "premium_statewide", "premium_regional",
+    "roi_statewide_years", "roi_regional_years", "rank_statewide", "rank_regional",
+    "rank_change", "hs_median_income",
+]
+REQUIRED_COLS = ["UNITID", "Institution", "Region", "County", "Sector"]
+
 class Sector(Enum):
     """Institution sector types."""
     PUBLIC = "Public"
@@ -0,0 +1,132 @@
+# lib/export.py
+import io
+import os
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .order_stats import get_order_stats
+
+# format -> (MIME type, file extension)
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", ".arrows"),
+}
+DEFAULT_CHUNK_ROWS = 50_000
+
+API_PREFIX = "/api/v1"
+# Base URL of a running lib.api server; when set, pages link to its streamed export
+EXPORT_API_ENV = "EPANALYSIS_API_URL"
+
+# Exportable ranking views: name -> (rank column, ascending); None = dataset order
+EXPORT_VIEWS: Dict[str, Tuple[Optional[str], bool]] = {
+    "institutions": (None, True),
+    "roi_statewide": ("roi_rank_statewide", True),
+    "roi_regional": ("roi_rank_regional", True),
+    "earnings_premium_statewide": ("ep_rank_statewide", True),
+    "earnings_premium_regional": ("ep_rank_regional", True),
+}
+
+EXPORT_COLS = [
+    "OPEID6", "Institution", "Region", "County", "Sector", "Predominant Award",
+    "median_earnings_10yr", "annual_net_price", "total_net_price", "program_years", "hs_median_income",
+    "premium_statewide", "premium_regional",
+    "roi_statewide_years", "roi_regional_years", "roi_statewide_valid", "roi_regional_valid",
+    "rank_statewide", "rank_regional", "rank_change",
+]
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after each chunk."""
+
+    def __init__(self):
+        self._parts = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+def _chunks(frame: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+def iter_export(frame: pd.DataFrame, fmt: str = "csv", chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """Serialize ``frame`` as CSV, Parquet or Arrow IPC, yielding bytes chunk by chunk.
+
+    Only one chunk of rows is encoded at a time: CSV writes the header then
+    row blocks, Parquet writes one row group per chunk, Arrow writes one
+    record batch per chunk.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'; expected one of {sorted(EXPORT_FORMATS)}")
+    if fmt == "csv":
+        yield frame.iloc[0:0].to_csv(index=False).encode()
+        for chunk in _chunks(frame, chunk_rows):
+            yield chunk.to_csv(index=False, header=False).encode()
+        return
+
+    schema = pa.Schema.from_pandas(frame, preserve_index=False)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema) if fmt == "parquet" else pa.ipc.new_stream(sink, schema)
+    with writer:
+        for chunk in _chunks(frame, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            data = sink.drain()
+            if data:
+                yield data
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+def export_bytes(frame: pd.DataFrame, fmt: str = "csv") -> bytes:
+    """Whole export in memory (for small views and the download button)."""
+    return b"".join(iter_export(frame, fmt))
+
+def export_view(
+    df: pd.DataFrame,
+    view: str = "institutions",
+    regions: Optional[Sequence[str]] = None,
+    sectors: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Rows of a ranking view in rank order, filtered by Region/Sector via the order statistics."""
+    if view not in EXPORT_VIEWS:
+        raise ValueError(f"Unknown export view '{view}'; expected one of {sorted(EXPORT_VIEWS)}")
+    stats = get_order_stats(df)
+    metric, ascending = EXPORT_VIEWS[view]
+    frame = stats.frame
+    if metric is None:
+        keep = pd.Series(True, index=frame.index)
+        if regions is not None:
+            keep &= frame["Region"].isin(regions)
+        if sectors is not None:
+            keep &= frame["Sector"].isin(sectors)
+        rows = frame[keep]
+    else:
+        rows = frame.iloc[stats.order(metric, ascending, regions, sectors)]
+        rows = rows.assign(rank=rows[metric])
+    cols = (["rank"] if metric is not None else []) + [c for c in EXPORT_COLS if c in rows.columns]
+    return rows[cols]
+
+def export_url(
+    view: str,
+    fmt: str,
+    regions: Optional[Sequence[str]] = None,
+    sectors: Optional[Sequence[str]] = None,
+) -> Optional[str]:
+    """URL of the streamed ``/api/v1/export`` download, or None without ``EPANALYSIS_API_URL``."""
+    base = os.environ.get(EXPORT_API_ENV)
+    if not base:
+        return None
+    query = urlencode([("region", r) for r in regions or ()] + [("sector", s) for s in sectors or ()])
+    return f"{base.rstrip('/')}{API_PREFIX}/export/{view}.{fmt}" + (f"?{query}" if query else "")
@@ -0,0 +1,203 @@
+# lib/geo.py
+import heapq
+import numpy as np
+import pandas as pd
+import streamlit as st
+from typing import List, Optional, Tuple
+
+from .data import CACHED_VERSIONS, dataset_version
+from .metrics import cache_lookup, cache_miss
+
+EARTH_RADIUS_MILES = 3958.8
+KM_PER_MILE = 1.609344
+
+def unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """(n, 3) points on the unit sphere for latitude/longitude in degrees."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+def chord_to_miles(chord: np.ndarray) -> np.ndarray:
+    """Great-circle (haversine) distance in miles from unit-sphere chord length."""
+    return 2 * np.arcsin(np.clip(chord / 2, 0, 1)) * EARTH_RADIUS_MILES
+
+def miles_to_chord(miles: float) -> float:
+    """Unit-sphere chord length spanning ``miles`` of great-circle distance."""
+    theta = min(miles / EARTH_RADIUS_MILES, np.pi)
+    return 2 * np.sin(theta / 2)
+
+def great_circle_miles(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Haversine distance in miles between coordinate arrays (degrees, broadcastable)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+class SpatialIndex:
+    """KD-tree over institution coordinates for radius and nearest-neighbour queries.
+
+    Points are embedded as 3-D unit vectors, where straight-line (chord)
+    distance is monotone in great-circle distance, so axis-aligned boxes give
+    exact pruning and reported distances are true haversine miles. Rows
+    without coordinates are left out; results are positions into the frame
+    the index was built from.
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, leaf_size: int = 16):
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        self.rows = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        self.points = unit_vectors(lat[self.rows], lon[self.rows])
+        self.leaf_size = leaf_size
+        self._perm = np.arange(len(self.rows))
+        self._start: List[int] = []
+        self._end: List[int] = []
+        self._left: List[int] = []
+        self._right: List[int] = []
+        self._lo: List[np.ndarray] = []
+        self._hi: List[np.ndarray] = []
+        if len(self.rows):
+            self._build(0, len(self.rows))
+        self._lo_arr = np.array(self._lo).reshape(-1, 3)
+        self._hi_arr = np.array(self._hi).reshape(-1, 3)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _build(self, start: int, end: int) -> int:
+        idx = self._perm[start:end]
+        pts = self.points[idx]
+        node = len(self._start)
+        self._start.append(start)
+        self._end.append(end)
+        self._left.append(-1)
+        self._right.append(-1)
+        self._lo.append(pts.min(axis=0))
+        self._hi.append(pts.max(axis=0))
+        if end - start > self.leaf_size:
+            dim = int(np.argmax(self._hi[node] - self._lo[node]))
+            mid = (start + end) // 2
+            self._perm[start:end] = idx[np.argpartition(pts[:, dim], mid - start)]
+            self._left[node] = self._build(start, mid)
+            self._right[node] = self._build(mid, end)
+        return node
+
+    def _box_distance(self, node: int, q: np.ndarray) -> float:
+        gap = np.maximum(np.maximum(self._lo_arr[node] - q, q - self._hi_arr[node]), 0)
+        return float(np.sqrt(gap @ gap))
+
+    def query_radius(self, lat: float, lon: float, radius_miles: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Frame positions within ``radius_miles`` and their distances, nearest first."""
+        if not len(self):
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        q = unit_vectors(np.array([lat]), np.array([lon]))[0]
+        limit = miles_to_chord(radius_miles)
+        hits, dists = [np.empty(0, dtype=np.intp)], [np.empty(0)]
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._box_distance(node, q) > limit:
+                continue
+            if self._left[node] < 0:
+                idx = self._perm[self._start[node]:self._end[node]]
+                d = np.linalg.norm(self.points[idx] - q, axis=1)
+                keep = d <= limit
+                hits.append(idx[keep])
+                dists.append(d[keep])
+            else:
+                stack.extend((self._left[node], self._right[node]))
+        idx = np.concatenate(hits)
+        d = np.concatenate(dists)
+        order = np.argsort(d, kind="stable")
+        return self.rows[idx[order]], chord_to_miles(d[order])
+
+    def query_nearest(self, lat: float, lon: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The ``k`` nearest frame positions and their distances, nearest first."""
+        if not len(self) or k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        q = unit_vectors(np.array([lat]), np.array([lon]))[0]
+        best: List[Tuple[float, int]] = []  # max-heap of (-distance, point)
+        frontier = [(0.0, 0)]
+        while frontier:
+            bound, node = heapq.heappop(frontier)
+            if len(best) == k and bound > -best[0][0]:
+                break
+            if self._left[node] < 0:
+                idx = self._perm[self._start[node]:self._end[node]]
+                for i, d in zip(idx, np.linalg.norm(self.points[idx] - q, axis=1)):
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, i))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, i))
+            else:
+                for child in (self._left[node], self._right[node]):
+                    heapq.heappush(frontier, (self._box_distance(child, q), child))
+        best.sort(key=lambda item: -item[0])
+        idx = np.array([i for _, i in best], dtype=np.intp)
+        d = np.array([-nd for nd, _ in best])
+        return self.rows[idx], chord_to_miles(d)
+
+def _best_first(near: pd.DataFrame, rank_by: str, limit: Optional[int]) -> pd.DataFrame:
+    near = near.sort_values([rank_by, "distance_miles"], na_position="last", kind="stable")
+    return near.head(limit) if limit is not None else near
+
+def institutions_near(
+    df: pd.DataFrame,
+    index: SpatialIndex,
+    lat: float,
+    lon: float,
+    radius_miles: float,
+    rank_by: str = "roi_regional_years",
+    limit: Optional[int] = None,
+) -> pd.DataFrame:
+    """Institutions within ``radius_miles`` of a point, best ROI first.
+
+    ``df`` must be the frame the index was built from; ``distance_miles`` is added.
+    """
+    rows, miles = index.query_radius(lat, lon, radius_miles)
+    return _best_first(df.iloc[rows].assign(distance_miles=miles), rank_by, limit)
+
+def nearby_peers(
+    df: pd.DataFrame,
+    index: SpatialIndex,
+    institution: str,
+    radius_miles: float = 25.0,
+    rank_by: str = "roi_regional_years",
+    limit: Optional[int] = None,
+) -> pd.DataFrame:
+    """Institutions within ``radius_miles`` of ``institution``, best ROI first.
+
+    ``df`` must be the frame the index was built from. The selected
+    institution itself is excluded; ``distance_miles`` is added.
+    """
+    matches = np.flatnonzero(df["Institution"].to_numpy() == institution)
+    if not len(matches):
+        return df.iloc[0:0].assign(distance_miles=pd.Series(dtype=float))
+    origin = df.iloc[matches[0]]
+    if pd.isna(origin.get("Latitude")) or pd.isna(origin.get("Longitude")):
+        return df.iloc[0:0].assign(distance_miles=pd.Series(dtype=float))
+
+    rows, miles = index.query_radius(origin["Latitude"], origin["Longitude"], radius_miles)
+    keep = rows != matches[0]
+    return _best_first(df.iloc[rows[keep]].assign(distance_miles=miles[keep]), rank_by, limit)
+
+def build_spatial_index(df: pd.DataFrame) -> SpatialIndex:
+    """KD-tree over the frame's Latitude/Longitude columns."""
+    if "Latitude" not in df.columns or "Longitude" not in df.columns:
+        return SpatialIndex(np.empty(0), np.empty(0))
+    return SpatialIndex(
+        pd.to_numeric(df["Latitude"], errors="coerce").to_numpy(),
+        pd.to_numeric(df["Longitude"], errors="coerce").to_numpy(),
+    )
+
+@cache_lookup("spatial_index")
+@st.cache_resource(show_spinner=False, max_entries=CACHED_VERSIONS)
+@cache_miss("spatial_index")
+def _cached_spatial_index(version: str, _df: pd.DataFrame) -> SpatialIndex:
+    return build_spatial_index(_df)
+
+def get_spatial_index(df: pd.DataFrame) -> SpatialIndex:
+    """Spatial index for ``df``, built once per dataset version."""
+    version = dataset_version(df)
+    if version is None:
+        return build_spatial_index(df)
+    return _cached_spatial_index(version, df)
@@ -1,5 +1,31 @@
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass
 from pathlib import Path
+from statistics import NormalDist
+from typing import Optional, Tuple
+
+# California county FIPS codes (state 06), as used in COUNTYFIP of the ACS county file
+CA_COUNTY_FIPS = {
+    "Alameda": 1, "Alpine": 3, "Amador": 5, "Butte": 7, "Calaveras": 9, "Colusa": 11,
+    "Contra Costa": 13, "Del Norte": 15, "El Dorado": 17, "Fresno": 19, "Glenn": 21,
+    "Humboldt": 23, "Imperial": 25, "Inyo": 27, "Kern": 29, "Kings": 31, "Lake": 33,
+    "Lassen": 35, "Los Angeles": 37, "Madera": 39, "Marin": 41, "Mariposa": 43,
+    "Mendocino": 45, "Merced": 47, "Modoc": 49, "Mono": 51, "Monterey": 53, "Napa": 55,
+    "Nevada": 57, "Orange": 59, "Placer": 61, "Plumas": 63, "Riverside": 65,
+    "Sacramento": 67, "San Benito": 69, "San Bernardino": 71, "San Diego": 73,
+    "San Francisco": 75, "San Joaquin": 77, "San Luis Obispo": 79, "San Mateo": 81,
+    "Santa Barbara": 83, "Santa Clara": 85, "Santa Cruz": 87, "Shasta": 89, "Sierra": 91,
+    "Siskiyou": 93, "Solano": 95, "Sonoma": 97, "Stanislaus": 99, "Sutter": 101,
+    "Tehama": 103, "Trinity": 105, "Tulare": 107, "Tuolumne": 109, "Ventura": 111,
+    "Yolo": 113, "Yuba": 115,
+}
+
+def load_county_baselines(county_data_path: str = "data/hs_median_county_25_34.csv") -> pd.DataFrame:
+    """County HS medians with sample sizes: [COUNTYFIP, hs_median_income, N_unweighted, weight_sum]."""
+    df = pd.read_csv(county_data_path)
+    df["COUNTYFIP"] = df["COUNTYFIP"].astype(int)
+    return df
 
 def calculate_statewide_hs_median(county_data_path: str = "data/hs_median_county_25_34.csv") -> float:
     """
@@ -19,6 +45,120 @@ def calculate_statewide_hs_median(county_data_path: str = "data/hs_median_county
     
     return numerator / denominator
 
+# SE of a sample median is sqrt(pi/2)·σ/√n for a normal population
+MEDIAN_SE_FACTOR = np.sqrt(np.pi / 2)
+# σ / median of HS-graduate incomes within a county
+INCOME_DISPERSION = 0.75
+# Variance inflation for the ACS complex sample design
+DESIGN_EFFECT = 1.5
+
+def county_median_se(
+    medians: np.ndarray,
+    n_unweighted: np.ndarray,
+    income_dispersion: float = INCOME_DISPERSION,
+    design_effect: float = DESIGN_EFFECT,
+) -> np.ndarray:
+    """Approximate sampling SE of each county median from its unweighted sample size."""
+    return MEDIAN_SE_FACTOR * income_dispersion * medians * np.sqrt(design_effect / n_unweighted)
+
+@dataclass(frozen=True)
+class BaselineEstimate:
+    """Weighted statewide baseline with its resampling uncertainty."""
+    estimate: float
+    std_error: float
+    ci_low: float
+    ci_high: float
+    method: str
+    replicates: int
+
+def resample_weighted_means(
+    rng: np.random.Generator,
+    medians: np.ndarray,
+    weights: np.ndarray,
+    size: int,
+    median_se: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """``size`` bootstrap replicates of Σ(m·w)/Σ(w) over resampled counties.
+
+    ``medians`` is (c,) or a per-replicate (size, c) draw. Each replicate
+    resamples c counties with replacement as one row of a (size, c) index
+    matrix, so all replicates are a single gather and row sum. ``median_se``
+    adds each county's own sampling error on top of the between-county
+    resampling.
+    """
+    c = weights.shape[0]
+    picks = rng.integers(0, c, size=(size, c))
+    medians = np.broadcast_to(medians, (size, c))
+    if median_se is not None:
+        medians = medians + median_se * rng.standard_normal((size, c))
+    picked_w = weights[picks]
+    return (picked_w * np.take_along_axis(medians, picks, axis=1)).sum(axis=1) / picked_w.sum(axis=1)
+
+def bootstrap_statewide_hs_median(
+    county_df: Optional[pd.DataFrame] = None,
+    n_replicates: int = 10000,
+    seed: int = 0,
+    confidence: float = 0.95,
+    method: str = "bootstrap",
+    include_sampling_error: bool = True,
+    batch_cells: int = 4_000_000,
+) -> Tuple[BaselineEstimate, np.ndarray]:
+    """Standard error and confidence interval for the weighted statewide baseline.
+
+    ``method='bootstrap'`` resamples counties (weighted by ``weight_sum``) and,
+    with ``include_sampling_error``, also perturbs each county median by its
+    ``N_unweighted``-based SE; the CI is percentile-based. ``method='jackknife'``
+    uses the delete-one-county estimates and a normal CI. Replicates are
+    generated in batches of at most ``batch_cells`` (replicates × counties)
+    so memory stays flat for national county files.
+
+    Returns the estimate and the replicate array.
+    """
+    if county_df is None:
+        county_df = load_county_baselines()
+    medians = county_df["hs_median_income"].to_numpy(dtype=float)
+    weights = county_df["weight_sum"].to_numpy(dtype=float)
+    estimate = float(medians @ weights / weights.sum())
+    alpha = (1 - confidence) / 2
+
+    if method == "jackknife":
+        c = len(medians)
+        replicates = (medians @ weights - medians * weights) / (weights.sum() - weights)
+        std_error = float(np.sqrt((c - 1) / c * ((replicates - replicates.mean()) ** 2).sum()))
+        z = NormalDist().inv_cdf(1 - alpha)
+        ci = (estimate - z * std_error, estimate + z * std_error)
+    elif method == "bootstrap":
+        median_se = None
+        if include_sampling_error:
+            median_se = county_median_se(medians, county_df["N_unweighted"].to_numpy(dtype=float))
+        rng = np.random.default_rng(seed)
+        batch = max(1, batch_cells // max(len(medians), 1))
+        replicates = np.concatenate([
+            resample_weighted_means(rng, medians, weights, min(batch, n_replicates - start), median_se)
+            for start in range(0, n_replicates, batch)
+        ])
+        std_error = float(replicates.std(ddof=1))
+        ci = tuple(np.quantile(replicates, [alpha, 1 - alpha]))
+    else:
+        raise ValueError(f"Unknown method: {method!r} (expected 'bootstrap' or 'jackknife')")
+
+    return BaselineEstimate(
+        estimate=estimate,
+        std_error=std_error,
+        ci_low=float(ci[0]),
+        ci_high=float(ci[1]),
+        method=method,
+        replicates=len(replicates),
+    ), replicates
+
+def bootstrap_by_state(county_df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    """One ``bootstrap_statewide_hs_median`` row per ``STATEFIP`` in a multi-state county table."""
+    rows = []
+    for state, group in county_df.groupby("STATEFIP", sort=True):
+        result, _ = bootstrap_statewide_hs_median(group, **kwargs)
+        rows.append({"STATEFIP": state, **result.__dict__})
+    return pd.DataFrame(rows)
+
 # Calculate and store as a constant
 STATEWIDE_HS_BASELINE = calculate_statewide_hs_median()
 
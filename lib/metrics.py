@@ -0,0 +1,345 @@
+# lib/metrics.py
+"""Prometheus-style process metrics: cache hits, dataset loads, page latency, sessions, RSS.
+
+The Streamlit process serves ``/metrics`` in the text exposition format on
+``EPANALYSIS_METRICS_PORT`` when that variable is set; the JSON API serves
+the same registry at ``/metrics``. For local testing, scrape either with
+
+    python -m lib.metrics http://127.0.0.1:9464/metrics --interval 15
+
+which prints per-interval cache hit ratios and page latency quantiles and
+flags thresholds worth alerting on.
+"""
+import argparse
+import math
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.request import urlopen
+
+import streamlit as st
+
+METRICS_PORT_ENV = "EPANALYSIS_METRICS_PORT"
+METRICS_ADDRESS_ENV = "EPANALYSIS_METRICS_ADDRESS"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; Streamlit reruns range from a few ms (cached pages) to seconds (simulations)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# A session counts as active if it reran within this window
+SESSION_WINDOW_SECONDS = 300.0
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escape = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in key) + "}"
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+class Metric:
+    """One metric family; values are keyed by label set."""
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, float] = {}
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+    def expose(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, value in self.samples():
+            lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines)
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, function: Optional[Callable[[], float]] = None):
+        super().__init__(name, help)
+        self._function = function
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+
+    def replace(self, value: float, **labels) -> None:
+        """Set one label set and drop all others (info-style gauges)."""
+        with self._lock:
+            self._values = {_label_key(labels): float(value)}
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        if self._function is not None:
+            return [(self.name, (), float(self._function()))]
+        return super().samples()
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            # per-bucket counts, then sum and count
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        out = []
+        with self._lock:
+            for key, series in self._series.items():
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    le = "+Inf" if math.isinf(bound) else repr(bound)
+                    out.append((f"{self.name}_bucket", key + (("le", le),), cumulative))
+                out.append((f"{self.name}_sum", key, series[-2]))
+                out.append((f"{self.name}_count", key, series[-1]))
+        return out
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.setdefault(metric.name, metric)
+        return self._metrics[metric.name]
+
+    def expose(self) -> str:
+        return "\n".join(m.expose() for m in self._metrics.values()) + "\n"
+
+def process_rss_bytes() -> float:
+    """Resident set size of this process (current on Linux, peak elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+_sessions: Dict[str, float] = {}
+_sessions_lock = threading.Lock()
+
+def record_session() -> None:
+    """Mark the current Streamlit session as active (call once per rerun)."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    with _sessions_lock:
+        _sessions[ctx.session_id] = time.monotonic()
+
+def active_sessions() -> int:
+    cutoff = time.monotonic() - SESSION_WINDOW_SECONDS
+    with _sessions_lock:
+        for session_id in [s for s, seen in _sessions.items() if seen < cutoff]:
+            del _sessions[session_id]
+        return len(_sessions)
+
+REGISTRY = Registry()
+CACHE_HITS = REGISTRY.register(Counter("epanalysis_cache_hits_total", "Cached-function calls served from cache."))
+CACHE_MISSES = REGISTRY.register(Counter("epanalysis_cache_misses_total", "Cached-function calls that recomputed."))
+CACHE_MISS_SECONDS = REGISTRY.register(Histogram("epanalysis_cache_miss_seconds", "Time to recompute a cache entry."))
+DATASET_LOAD_SECONDS = REGISTRY.register(Gauge("epanalysis_dataset_load_seconds", "Duration of the last dataset load."))
+DATASET_INFO = REGISTRY.register(Gauge("epanalysis_dataset_info", "Loaded dataset version and row count (value is 1)."))
+PAGE_RENDER_SECONDS = REGISTRY.register(Histogram("epanalysis_page_render_seconds", "Page dispatch time per rerun."))
+ACTIVE_SESSIONS = REGISTRY.register(Gauge(
+    "epanalysis_active_sessions", f"Sessions that reran in the last {SESSION_WINDOW_SECONDS:.0f}s.", active_sessions,
+))
+PROCESS_RSS = REGISTRY.register(Gauge("epanalysis_process_rss_bytes", "Resident memory of this process.", process_rss_bytes))
+
+_miss_flags = threading.local()
+
+def cache_lookup(name: str) -> Callable:
+    """Place above ``@st.cache_*``: counts a hit unless the wrapped function ran."""
+    def decorate(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            flags = _miss_flags.__dict__
+            outer = flags.get(name)
+            flags[name] = False
+            try:
+                result = fn(*args, **kwargs)
+                if not flags[name]:
+                    CACHE_HITS.inc(cache=name)
+                return result
+            finally:
+                flags[name] = outer
+        return wrapper
+    return decorate
+
+def cache_miss(name: str) -> Callable:
+    """Place below ``@st.cache_*``: counts and times recomputations."""
+    def decorate(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            _miss_flags.__dict__[name] = True
+            CACHE_MISSES.inc(cache=name)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                CACHE_MISS_SECONDS.observe(time.perf_counter() - start, cache=name)
+        return wrapper
+    return decorate
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.expose().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_server(port: int, address: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """Serve ``/metrics`` from a daemon thread, once per process (None if the port is taken)."""
+    try:
+        server = ThreadingHTTPServer((address, port), _MetricsHandler)
+    except OSError as e:
+        st.warning(f"Metrics server not started on {address}:{port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+def serve_metrics_from_env() -> Optional[ThreadingHTTPServer]:
+    """Start the metrics server if ``EPANALYSIS_METRICS_PORT`` is set."""
+    port = os.environ.get(METRICS_PORT_ENV)
+    if not port:
+        return None
+    return start_metrics_server(int(port), os.environ.get(METRICS_ADDRESS_ENV, "127.0.0.1"))
+
+# --- Local scrape stand-in -------------------------------------------------
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][\w:]*)(?:\{(.*)\})?\s+(\S+)$')
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+def parse_exposition(text: str) -> Dict[Tuple[str, LabelKey], float]:
+    """``{(sample name, labels): value}`` from text exposition format."""
+    out = {}
+    for line in text.splitlines():
+        match = _SAMPLE.match(line.strip())
+        if not match or line.startswith("#"):
+            continue
+        name, labels, value = match.groups()
+        key = tuple(sorted(_LABEL.findall(labels or "")))
+        out[(name, key)] = float(value)
+    return out
+
+def histogram_quantile(q: float, buckets: Dict[float, float]) -> float:
+    """Quantile from cumulative bucket counts ``{upper bound: count}`` (linear within a bucket)."""
+    bounds = sorted(buckets)
+    total = buckets[bounds[-1]] if bounds else 0.0
+    if total <= 0:
+        return math.nan
+    rank, prev_bound, prev_count = q * total, 0.0, 0.0
+    for bound in bounds:
+        count = buckets[bound]
+        if count >= rank:
+            if math.isinf(bound):
+                return prev_bound
+            return prev_bound + (bound - prev_bound) * (rank - prev_count) / max(count - prev_count, 1e-12)
+        prev_bound, prev_count = bound, count
+    return prev_bound
+
+def summarize(prev: Dict, curr: Dict, max_p95: float, min_hit_ratio: float, min_lookups: int = 20) -> List[str]:
+    """Human-readable interval report (deltas between two scrapes), with ALERT lines."""
+    delta = lambda key: curr.get(key, 0.0) - prev.get(key, 0.0)
+    lines = []
+    caches = sorted({labels for name, labels in curr
+                     if name in ("epanalysis_cache_hits_total", "epanalysis_cache_misses_total")})
+    for labels in caches:
+        hits = delta(("epanalysis_cache_hits_total", labels))
+        misses = delta(("epanalysis_cache_misses_total", labels))
+        lookups = hits + misses
+        if lookups == 0:
+            continue
+        ratio = hits / lookups
+        flag = "  ALERT cache thrash" if lookups >= min_lookups and ratio < min_hit_ratio else ""
+        lines.append(f"cache {dict(labels)['cache']:<18} hit ratio {ratio:6.1%} over {lookups:.0f} lookups{flag}")
+
+    buckets: Dict[LabelKey, Dict[float, float]] = defaultdict(dict)
+    for (name, labels), _ in curr.items():
+        if name == "epanalysis_page_render_seconds_bucket":
+            rest = tuple(kv for kv in labels if kv[0] != "le")
+            le = float(dict(labels)["le"].replace("+Inf", "inf"))
+            buckets[rest][le] = delta((name, labels))
+    for labels, series in sorted(buckets.items()):
+        p50, p95 = histogram_quantile(0.5, series), histogram_quantile(0.95, series)
+        if math.isnan(p95):
+            continue
+        flag = "  ALERT latency" if p95 > max_p95 else ""
+        lines.append(f"page  {dict(labels).get('page', ''):<24} p50 {p50 * 1e3:7.0f} ms  p95 {p95 * 1e3:7.0f} ms{flag}")
+
+    rss = curr.get(("epanalysis_process_rss_bytes", ()), math.nan)
+    sessions = curr.get(("epanalysis_active_sessions", ()), math.nan)
+    lines.append(f"rss {rss / 2**20:.0f} MB · active sessions {sessions:.0f}")
+    return lines
+
+def scrape(url: str, interval: float, count: int, max_p95: float, min_hit_ratio: float) -> None:
+    prev: Dict = {}
+    n = 0
+    while count <= 0 or n < count:
+        with urlopen(url, timeout=10) as resp:
+            curr = parse_exposition(resp.read().decode())
+        print(time.strftime("%H:%M:%S"), url)
+        for line in summarize(prev, curr, max_p95, min_hit_ratio):
+            print("  " + line)
+        prev, n = curr, n + 1
+        if count <= 0 or n < count:
+            time.sleep(interval)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Scrape a /metrics endpoint and report interval deltas.")
+    parser.add_argument("url", nargs="?", default="http://127.0.0.1:9464/metrics")
+    parser.add_argument("--interval", type=float, default=15.0)
+    parser.add_argument("--count", type=int, default=0, help="Number of scrapes (0 = forever)")
+    parser.add_argument("--max-p95", type=float, default=2.0, help="Page p95 latency alert threshold (s)")
+    parser.add_argument("--min-hit-ratio", type=float, default=0.8, help="Cache hit ratio alert threshold")
+    args = parser.parse_args(argv)
+    scrape(args.url, args.interval, args.count, args.max_p95, args.min_hit_ratio)
+
+if __name__ == "__main__":
+    main()
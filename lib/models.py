@@ -3,6 +3,8 @@ from typing import Optional, List
 from dataclasses import dataclass
 import pandas as pd
 
+from .data_schema import NUMERIC_COLS, REQUIRED_COLS
+
 @dataclass
 class DataConfig:
     """Configuration for data paths and column mappings."""
@@ -17,17 +19,9 @@ class DataConfig:
     
     def __post_init__(self):
         if self.numeric_columns is None:
-            self.numeric_columns = [
-                "total_net_price", "median_earnings_10yr", 
-                "premium_statewide", "premium_regional",
-                "roi_statewide_years", "roi_regional_years", 
-                "rank_statewide", "rank_regional",
-                "rank_change", "hs_median_income"
-            ]
+            self.numeric_columns = list(NUMERIC_COLS)
         if self.required_columns is None:
-            self.required_columns = [
-                "UNITID", "Institution", "Region", "County", "Sector"
-            ]
+            self.required_columns = list(REQUIRED_COLS)
 
 @dataclass 
 class Institution:
@@ -0,0 +1,286 @@
+# lib/order_stats.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .data import CACHED_VERSIONS, dataset_version
+from .metrics import cache_lookup, cache_miss
+from .profiling import profiled
+
+PARTITION_COLS = ("Region", "Sector")
+
+# Metrics indexed for top-k queries. Derived rank columns are added by
+# build_ranking_order_stats before the index is built.
+ORDER_METRICS = [
+    "premium_statewide", "premium_regional",
+    "roi_statewide_years", "roi_regional_years",
+    "rank_change",
+    "ep_rank_statewide", "ep_rank_regional", "ep_rank_change",
+    "roi_rank_statewide", "roi_rank_regional", "roi_rank_change",
+]
+
+# Secondary sort keys (always ascending) for metrics whose ties must keep a
+# page's order: the rank-change tables list tied institutions by statewide rank
+TIE_BREAKERS = {
+    "ep_rank_change": "ep_rank_statewide",
+    "roi_rank_change": "roi_rank_statewide",
+}
+
+def _positional_rank(values: pd.Series, valid: np.ndarray, ascending: bool) -> np.ndarray:
+    """1-based position of each valid row after ``sort_values``; NaN for invalid rows.
+
+    Uses the ranking pages' own sort (``sort_values`` over the valid rows,
+    NaNs last), so tied values get the positions the pages always showed.
+    ``values`` must have a fresh RangeIndex.
+    """
+    order = values[valid].sort_values(ascending=ascending, na_position="last").index.to_numpy()
+    ranks = np.full(len(values), np.nan)
+    ranks[order] = np.arange(1, len(order) + 1)
+    return ranks
+
+def _roi_valid(df: pd.DataFrame, metric: str) -> np.ndarray:
+    """ROI validity mask carried by the scoring kernel (non-NaN ROI for other frames)."""
+    col = f"roi_{metric}_valid"
+    if col in df.columns:
+        return df[col].to_numpy(dtype=bool)
+    return df[f"roi_{metric}_years"].notna().to_numpy()
+
+class OrderStatistics:
+    """Precomputed sort orders per metric and per Region/Sector partition.
+
+    Every metric gets an ascending and a descending stable order of row
+    positions (NaNs dropped), and each order is pre-split by the partition
+    columns. Top-k for any k is then a slice of a stored array; multi-value
+    Region/Sector selections filter the stored order with a boolean mask
+    instead of sorting. Tie-breaking matches ``nsmallest``/``nlargest``
+    (first occurrence wins), except for metrics in ``tie_breakers``, whose
+    ties are ordered by the ascending secondary column.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        metrics: Iterable[str] = ORDER_METRICS,
+        partition_cols: Tuple[str, ...] = PARTITION_COLS,
+        tie_breakers: Optional[Dict[str, str]] = None,
+    ):
+        self.frame = df.reset_index(drop=True)
+        self.partition_cols = tuple(c for c in partition_cols if c in self.frame.columns)
+        self.metrics = [m for m in metrics if m in self.frame.columns]
+
+        # Integer codes per partition column (-1 for missing values)
+        self._codes: Dict[str, np.ndarray] = {}
+        self._levels: Dict[str, Dict[str, int]] = {}
+        for col in self.partition_cols:
+            codes, uniques = pd.factorize(self.frame[col], sort=True)
+            self._codes[col] = codes
+            self._levels[col] = {value: i for i, value in enumerate(uniques)}
+
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._partitions: Dict[Tuple, np.ndarray] = {}
+        self._view_rows: Dict[str, np.ndarray] = {}
+        self._views: Dict[str, pd.DataFrame] = {}
+        tie_breakers = TIE_BREAKERS if tie_breakers is None else tie_breakers
+        for metric in self.metrics:
+            values = pd.to_numeric(self.frame[metric], errors="coerce").to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+            secondary = tie_breakers.get(metric)
+            for descending in (False, True):
+                keys = -values if descending else values
+                if secondary in self.frame.columns:
+                    order = np.lexsort((self.frame[secondary].to_numpy(dtype=float), keys))
+                else:
+                    order = np.argsort(keys, kind="stable")
+                order = order[valid[order]]
+                self._orders[(metric, descending)] = order
+                self._split_partitions(metric, descending, order)
+
+    def _split_partitions(self, metric: str, descending: bool, order: np.ndarray) -> None:
+        """Store the order restricted to each single-column value and each cell."""
+        for col in self.partition_cols:
+            codes = self._codes[col][order]
+            for value, code in self._levels[col].items():
+                self._partitions[(metric, descending, col, value)] = order[codes == code]
+        if len(self.partition_cols) == 2:
+            a, b = self.partition_cols
+            codes_a, codes_b = self._codes[a][order], self._codes[b][order]
+            for va, ca in self._levels[a].items():
+                in_a = codes_a == ca
+                for vb, cb in self._levels[b].items():
+                    self._partitions[(metric, descending, (va, vb))] = order[in_a & (codes_b == cb)]
+
+    def _normalize(self, col: str, selected: Optional[Iterable[str]]) -> Optional[List[str]]:
+        """None means no filter on this column; a full selection is also no filter."""
+        if selected is None or col not in self._levels:
+            return None
+        selected = list(dict.fromkeys(selected))
+        if set(selected) >= set(self._levels[col]):
+            return None
+        return selected
+
+    def order(
+        self,
+        metric: str,
+        ascending: bool = True,
+        regions: Optional[Iterable[str]] = None,
+        sectors: Optional[Iterable[str]] = None,
+    ) -> np.ndarray:
+        """Row positions sorted by ``metric`` within the Region/Sector slice."""
+        descending = not ascending
+        selections = {
+            col: self._normalize(col, sel)
+            for col, sel in zip(PARTITION_COLS, (regions, sectors))
+        }
+        active = {col: sel for col, sel in selections.items() if sel is not None}
+        if not active:
+            return self._orders[(metric, descending)]
+
+        # Single-value selections are served straight from the partition table
+        singles = {col: sel[0] for col, sel in active.items() if len(sel) == 1}
+        if len(singles) == len(active):
+            if len(singles) == 1:
+                (col, value), = singles.items()
+                return self._partitions.get((metric, descending, col, value), np.empty(0, dtype=np.intp))
+            key = tuple(singles[col] for col in self.partition_cols)
+            return self._partitions.get((metric, descending, key), np.empty(0, dtype=np.intp))
+
+        # Arbitrary multi-selections: filter the presorted order, no re-sort
+        order = self._orders[(metric, descending)]
+        keep = np.ones(len(order), dtype=bool)
+        for col, sel in active.items():
+            wanted = [self._levels[col][v] for v in sel if v in self._levels[col]]
+            keep &= np.isin(self._codes[col][order], wanted)
+        return order[keep]
+
+    def nsmallest(self, k: int, metric: str, regions=None, sectors=None) -> pd.DataFrame:
+        """Rows with the k smallest values of ``metric`` (NaNs excluded)."""
+        return self.frame.iloc[self.order(metric, True, regions, sectors)[:k]]
+
+    def nlargest(self, k: int, metric: str, regions=None, sectors=None) -> pd.DataFrame:
+        """Rows with the k largest values of ``metric`` (NaNs excluded)."""
+        return self.frame.iloc[self.order(metric, False, regions, sectors)[:k]]
+
+    def add_view(self, name: str, mask: np.ndarray) -> None:
+        """Register a named row subset (e.g. valid ROI rows), materialized on first use."""
+        self._view_rows[name] = np.flatnonzero(np.asarray(mask, dtype=bool))
+        self._views.pop(name, None)
+
+    def view(self, name: str) -> pd.DataFrame:
+        """A subset registered with ``add_view``."""
+        if name not in self._views:
+            self._views[name] = self.frame.iloc[self._view_rows[name]]
+        return self._views[name]
+
+    def to_arrays(self) -> Tuple[Dict[str, np.ndarray], dict]:
+        """Index state as named integer arrays plus JSON-serializable metadata.
+
+        ``from_arrays`` rebuilds the index over the same frame without
+        sorting; arrays may be read-only (e.g. memory-mapped).
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        meta = {
+            "metrics": self.metrics,
+            "partition_cols": list(self.partition_cols),
+            "levels": {col: list(levels) for col, levels in self._levels.items()},
+            "orders": [], "partitions": [], "views": [],
+        }
+        for col, codes in self._codes.items():
+            arrays[f"codes/{col}"] = codes
+        for i, ((metric, descending), order) in enumerate(self._orders.items()):
+            arrays[f"order/{i}"] = order
+            meta["orders"].append([metric, descending, f"order/{i}"])
+        for i, (key, rows) in enumerate(self._partitions.items()):
+            arrays[f"partition/{i}"] = rows
+            meta["partitions"].append([[list(k) if isinstance(k, tuple) else k for k in key], f"partition/{i}"])
+        for name, rows in self._view_rows.items():
+            arrays[f"view/{name}"] = rows
+            meta["views"].append(name)
+        return arrays, meta
+
+    @classmethod
+    def from_arrays(cls, df: pd.DataFrame, arrays: Dict[str, np.ndarray], meta: dict) -> "OrderStatistics":
+        """Index over ``df`` from the output of ``to_arrays``."""
+        stats = cls.__new__(cls)
+        stats.frame = df.reset_index(drop=True)
+        stats.partition_cols = tuple(meta["partition_cols"])
+        stats.metrics = list(meta["metrics"])
+        stats._codes = {col: arrays[f"codes/{col}"] for col in stats.partition_cols}
+        stats._levels = {col: {v: i for i, v in enumerate(levels)} for col, levels in meta["levels"].items()}
+        stats._orders = {(metric, descending): arrays[name] for metric, descending, name in meta["orders"]}
+        stats._partitions = {
+            tuple(tuple(k) if isinstance(k, list) else k for k in key): arrays[name]
+            for key, name in meta["partitions"]
+        }
+        stats._view_rows = {name: arrays[f"view/{name}"] for name in meta["views"]}
+        stats._views = {}
+        return stats
+
+    def sorted_frame(self, metric: str, ascending: bool = True, regions=None, sectors=None) -> pd.DataFrame:
+        """Full slice sorted by ``metric`` (NaN rows omitted)."""
+        return self.frame.iloc[self.order(metric, ascending, regions, sectors)]
+
+def add_ranking_ranks(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of ``df`` (fresh index) with the ``ep_rank_*``/``roi_rank_*`` columns."""
+    out = df.reset_index(drop=True).copy()
+
+    for metric, col in (("statewide", "premium_statewide"), ("regional", "premium_regional")):
+        values = pd.to_numeric(out[col], errors="coerce")
+        out[f"ep_rank_{metric}"] = _positional_rank(values, np.ones(len(values), dtype=bool), ascending=False)
+    out["ep_rank_change"] = out["ep_rank_statewide"] - out["ep_rank_regional"]
+
+    roi_valid = _roi_valid(out, "statewide") & _roi_valid(out, "regional")
+    out["roi_rank_statewide"] = _positional_rank(out["roi_statewide_years"], roi_valid, ascending=True)
+    out["roi_rank_regional"] = _positional_rank(out["roi_regional_years"], roi_valid, ascending=True)
+    out["roi_rank_change"] = out["roi_rank_statewide"] - out["roi_rank_regional"]
+    return out
+
+def index_rankings(ranked: pd.DataFrame) -> OrderStatistics:
+    """Order statistics over a frame from ``add_ranking_ranks``, with the ROI-valid views."""
+    valid_sw = _roi_valid(ranked, "statewide")
+    valid_reg = _roi_valid(ranked, "regional")
+    stats = OrderStatistics(ranked)
+    stats.add_view("roi_valid_statewide", valid_sw)
+    stats.add_view("roi_valid_regional", valid_reg)
+    stats.add_view("roi_valid", valid_sw & valid_reg)
+    return stats
+
+@profiled()
+def build_ranking_order_stats(df: pd.DataFrame) -> OrderStatistics:
+    """Add the positional ranks shown on the ranking pages and index them.
+
+    ``ep_rank_*`` rank all institutions by premium (highest first, missing
+    premiums last), matching the Earnings Premium Rankings page.
+    ``roi_rank_*`` rank only institutions with a valid ROI under both
+    baselines (lowest years first), matching the ROI Rankings page.
+    Valid-only views ``roi_valid_statewide``, ``roi_valid_regional`` and
+    ``roi_valid`` (both) are precomputed from the ROI validity masks.
+    """
+    return index_rankings(add_ranking_ranks(df))
+
+@cache_lookup("order_stats")
+@st.cache_resource(show_spinner=False, max_entries=CACHED_VERSIONS)
+@cache_miss("order_stats")
+def _cached_order_stats(version: str, _df: pd.DataFrame) -> OrderStatistics:
+    if _df.attrs.get("snapshot"):
+        # Snapshot frames come with a prebuilt, memory-mapped index
+        from .snapshot import open_snapshot  # lib.snapshot imports this module
+        return open_snapshot(_df.attrs["snapshot"]).stats
+    params = _df.attrs.get("prep_params")
+    if params is None:
+        return build_ranking_order_stats(_df)
+    # Loader frames continue through the preparation graph's rank/index stages,
+    # which are disk-cached across restarts
+    from .prep import PIPELINE  # lib.prep imports this module
+    stats = PIPELINE.run("index", **params)
+    # Stage outputs are shared read-only; tag a shallow copy and reuse the index arrays
+    frame = stats.frame.copy(deep=False)
+    frame.attrs["dataset_version"] = version
+    return OrderStatistics.from_arrays(frame, *stats.to_arrays())
+
+def get_order_stats(df: pd.DataFrame) -> OrderStatistics:
+    """Order statistics for ``df``, built once per dataset version and shared across sessions."""
+    version = dataset_version(df)
+    if version is None:
+        return build_ranking_order_stats(df)
+    return _cached_order_stats(version, df)
@@ -0,0 +1,8 @@
+# lib/pages/__init__.py
+"""Page renderers, one module per page group.
+
+app.py imports only ``home`` at startup; every other module is imported
+by the branch that renders it, so a cold start pays for neither the
+unused pages nor their dependencies (Altair loads with lib/charts.py on
+the first chart page). ``python -m benchmarks.import_budget`` checks this.
+"""
@@ -0,0 +1,52 @@
+# lib/pages/admin.py
+import streamlit as st
+
+from ..profiling import profiled
+from ..quality import get_quality_report
+
+@profiled()
+def render_data_quality(df):
+    """Admin page: data-quality checks and per-column missingness for the loaded dataset."""
+    st.title("Data Quality")
+    st.markdown("Row-level checks and missing-data shares for the loaded dataset, computed once per dataset version.")
+    
+    if df.empty:
+        st.error("No data available. Please check the dataset files.")
+        return
+    
+    report = get_quality_report(df)
+    issues = report.issues()
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Rows", f"{report.rows:,}")
+    col2.metric("Dataset Version", report.version or "unversioned")
+    col3.metric("Checks Flagged", sum(1 for v in report.checks.values() if v > 0))
+    
+    if issues:
+        st.warning(f"{len(issues)} issue(s) found: " + ", ".join(issues))
+    else:
+        st.success("All checks passed.")
+    
+    st.subheader("Checks")
+    st.dataframe(
+        report.checks_frame(),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Share": st.column_config.ProgressColumn(format="%.3f", min_value=0.0, max_value=1.0),
+        },
+    )
+    
+    st.subheader("Missing Data by Column")
+    missing = (report.missing_share.rename("Missing Share").rename_axis("Column").reset_index()
+               .sort_values("Missing Share", ascending=False))
+    missing["Flagged"] = missing["Missing Share"] > report.missing_threshold
+    st.dataframe(
+        missing,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Missing Share": st.column_config.ProgressColumn(format="%.3f", min_value=0.0, max_value=1.0),
+        },
+    )
+    st.caption(f"Columns more than {report.missing_threshold:.0%} missing are flagged.")
@@ -0,0 +1,232 @@
+# lib/pages/advanced.py
+import time
+from dataclasses import replace
+
+import pandas as pd
+import streamlit as st
+
+from ..commute import CommuteZoneParams, get_commute_model
+from ..data import dataset_version
+from ..hs_baseline import bootstrap_statewide_hs_median
+from ..profiling import profiled
+from ..scoring import (
+    PROGRAM_LENGTH_MULTIPLIER, STATEWIDE_HS_BASELINE,
+    DiscountParams, ScoringParams, get_discounted_scores, get_scoring_inputs,
+    score_arrays, score_discounted,
+)
+from ..uncertainty import SimulationParams, simulate_rank_intervals
+
+@profiled()
+def render_what_if(df):
+    """Render the what-if page: rescore premiums, ROI and rankings under user-set parameters."""
+    st.title("What-If Scenarios")
+    st.markdown(
+        "Change the statewide baseline, program length, earnings horizon or discount rate and see how "
+        "premiums, ROI, NPV and both rankings respond. Scores are recomputed on cached arrays, not reloaded."
+    )
+    
+    # Check if data is available
+    if df.empty:
+        st.error("No data available. Please check the dataset files.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        override_baseline = st.checkbox(
+            "Override statewide baseline",
+            help="By default each institution uses its state's weighted county median for HS graduates aged 25-34"
+        )
+        baseline = st.number_input(
+            "Statewide HS baseline ($)",
+            min_value=0.0, value=STATEWIDE_HS_BASELINE, step=500.0,
+            disabled=not override_baseline,
+            help="Applied to every institution when overridden"
+        )
+    with col2:
+        override_length = st.checkbox(
+            "Override program length",
+            help="By default total cost uses each credential's length (Associate's = 2 years)"
+        )
+        multiplier = st.slider(
+            "Program length (years of net price)",
+            min_value=0.5, max_value=6.0, value=PROGRAM_LENGTH_MULTIPLIER, step=0.5,
+            disabled=not override_length,
+            help="Total cost = annual net price x this multiplier"
+        )
+    with col3:
+        horizon = st.slider(
+            "Earnings horizon (years, 0 = no cap)",
+            min_value=0, max_value=40, value=0,
+            help="Payback slower than this counts as not recouped"
+        )
+    
+    baseline_mode = st.radio(
+        "Regional baseline",
+        ["County", "Commute zone"],
+        horizontal=True,
+        help="Commute zone blends nearby county baselines, weighted by HS-graduate population and distance"
+    )
+    commute_params = None
+    if baseline_mode == "Commute zone":
+        col1, col2 = st.columns(2)
+        with col1:
+            radius = st.slider("Commute radius (miles)", min_value=10, max_value=100, value=30, step=5)
+        with col2:
+            bandwidth = st.slider("Distance decay (miles)", min_value=5, max_value=50, value=15, step=5)
+        commute_params = CommuteZoneParams(radius_miles=float(radius), bandwidth_miles=float(bandwidth))
+    
+    # Time value of money for discounted payback and NPV
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        discount_rate = st.slider("Discount rate (%)", min_value=0.0, max_value=10.0, value=3.0, step=0.5)
+    with col2:
+        growth = st.slider("Premium growth (%/yr)", min_value=0.0, max_value=5.0, value=0.0, step=0.5)
+    with col3:
+        npv_horizon = st.slider("NPV horizon (years)", min_value=5, max_value=40, value=20, step=5)
+    discount = DiscountParams(
+        discount_rate=discount_rate / 100,
+        earnings_growth=growth / 100,
+        npv_horizon_years=float(npv_horizon),
+    )
+    
+    params = ScoringParams(
+        statewide_baseline=baseline if override_baseline else None,
+        length_multiplier=multiplier if override_length else None,
+        horizon_years=horizon or None,
+    )
+    start = time.perf_counter()
+    inputs = get_scoring_inputs(df)
+    if commute_params is not None:
+        inputs = replace(inputs, regional_baseline=get_commute_model(df, commute_params).baselines())
+    scores = score_arrays(inputs, params)
+    if commute_params is None:
+        discounted = get_discounted_scores(df, params, discount)
+    else:
+        discounted = score_discounted(inputs, params, discount)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    st.caption(f"Recomputed {len(df):,} institutions in {elapsed_ms:.1f} ms")
+    
+    scenario = pd.DataFrame({
+        "Institution": df["Institution"].to_numpy(),
+        "Region": df["Region"].to_numpy(),
+        "Sector": df["Sector"].to_numpy(),
+        "Premium (Statewide)": scores["premium_statewide"],
+        "Premium (Regional)": scores["premium_regional"],
+        "ROI Statewide (yrs)": scores["roi_statewide_years"],
+        "ROI Regional (yrs)": scores["roi_regional_years"],
+        "Disc. Payback Statewide (yrs)": discounted["discounted_payback_statewide_years"],
+        "Disc. Payback Regional (yrs)": discounted["discounted_payback_regional_years"],
+        "NPV (Statewide)": discounted["npv_statewide"],
+        "NPV (Regional)": discounted["npv_regional"],
+        "Rank (Statewide)": scores["rank_statewide"],
+        "Rank (Regional)": scores["rank_regional"],
+        "Shift (Statewide)": df["rank_statewide"].to_numpy() - scores["rank_statewide"],
+        "Shift (Regional)": df["rank_regional"].to_numpy() - scores["rank_regional"],
+    })
+    
+    # Scenario summary against the published defaults
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        valid_sw = int(scores["roi_statewide_valid"].sum())
+        default_sw = int(df["roi_statewide_valid"].sum())
+        st.metric("Valid Statewide ROI", f"{valid_sw:,}", delta=valid_sw - default_sw)
+    with col2:
+        valid_reg = int(scores["roi_regional_valid"].sum())
+        default_reg = int(df["roi_regional_valid"].sum())
+        st.metric("Valid Regional ROI", f"{valid_reg:,}", delta=valid_reg - default_reg)
+    with col3:
+        moved = int((scenario["Shift (Statewide)"].fillna(0) != 0).sum())
+        st.metric("Statewide Ranks Moved", f"{moved:,}")
+    
+    st.dataframe(
+        scenario.sort_values("Rank (Statewide)", na_position="last"),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Premium (Statewide)": st.column_config.NumberColumn(format="$%,.0f"),
+            "Premium (Regional)": st.column_config.NumberColumn(format="$%,.0f"),
+            "ROI Statewide (yrs)": st.column_config.NumberColumn(format="%.2f"),
+            "ROI Regional (yrs)": st.column_config.NumberColumn(format="%.2f"),
+            "Disc. Payback Statewide (yrs)": st.column_config.NumberColumn(format="%.2f"),
+            "Disc. Payback Regional (yrs)": st.column_config.NumberColumn(format="%.2f"),
+            "NPV (Statewide)": st.column_config.NumberColumn(format="$%,.0f"),
+            "NPV (Regional)": st.column_config.NumberColumn(format="$%,.0f"),
+            "Rank (Statewide)": st.column_config.NumberColumn(format="%d"),
+            "Rank (Regional)": st.column_config.NumberColumn(format="%d"),
+            "Shift (Statewide)": st.column_config.NumberColumn(format="%+d"),
+            "Shift (Regional)": st.column_config.NumberColumn(format="%+d"),
+        },
+        height=600
+    )
+    st.caption("Shift = published rank − scenario rank (positive = ranks better in this scenario). "
+               "Blank ROI = non-positive premium or payback beyond the horizon. "
+               "Discounted payback and NPV value each year's premium at the discount rate.")
+
+@profiled()
+def render_rank_uncertainty(df):
+    """Render Monte Carlo confidence intervals for statewide and regional ROI ranks."""
+    st.title("Rank Uncertainty")
+    st.markdown(
+        "Published ranks are point estimates from medians. This page redraws county HS baselines "
+        "(using each county's ACS sample size) and graduate earnings from their sampling distributions, "
+        "re-scores every institution, and reports the range of ranks each one lands in."
+    )
+    
+    # Check if data is available
+    if df.empty:
+        st.error("No data available. Please check the dataset files.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        n_draws = st.selectbox("Simulated draws", [1000, 2000, 5000, 10000], index=1)
+    with col2:
+        seed = int(st.number_input("Random seed", min_value=0, value=0, step=1))
+    with col3:
+        confidence = st.selectbox("Interval", [0.80, 0.90, 0.95], index=1, format_func=lambda x: f"{x:.0%}")
+    
+    params = SimulationParams(n_draws=n_draws, seed=seed, confidence=confidence)
+    with st.spinner("Running simulation..."):
+        intervals = simulate_rank_intervals(dataset_version(df), params, df)
+    
+    # Uncertainty in the statewide baseline itself (county bootstrap)
+    baseline, _ = bootstrap_statewide_hs_median(seed=seed, confidence=confidence)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Statewide HS Baseline", f"${baseline.estimate:,.0f}")
+    col2.metric("Bootstrap Std. Error", f"${baseline.std_error:,.0f}")
+    col3.metric(f"{confidence:.0%} CI", f"${baseline.ci_low:,.0f} – ${baseline.ci_high:,.0f}")
+    
+    label = f"{confidence:.0%} CI"
+    table = pd.DataFrame({
+        "Institution": intervals["Institution"],
+        "Region": intervals["Region"],
+        "Statewide Rank": intervals["rank_statewide"],
+        f"Statewide {label}": intervals["statewide_rank_low"].map("{:.0f}".format)
+            + "–" + intervals["statewide_rank_high"].map("{:.0f}".format),
+        "Statewide CI Width": intervals["statewide_rank_high"] - intervals["statewide_rank_low"],
+        "Regional Rank": intervals["rank_regional"],
+        f"Regional {label}": intervals["regional_rank_low"].map("{:.0f}".format)
+            + "–" + intervals["regional_rank_high"].map("{:.0f}".format),
+        "Regional CI Width": intervals["regional_rank_high"] - intervals["regional_rank_low"],
+    }).replace("nan–nan", "N/A")
+    
+    col1, col2 = st.columns(2)
+    col1.metric("Median Statewide CI Width", f"{table['Statewide CI Width'].median():.0f} ranks")
+    col2.metric("Median Regional CI Width", f"{table['Regional CI Width'].median():.0f} ranks")
+    
+    st.dataframe(
+        table.sort_values("Statewide Rank", na_position="last"),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Statewide Rank": st.column_config.NumberColumn(format="%d"),
+            "Regional Rank": st.column_config.NumberColumn(format="%d"),
+            "Statewide CI Width": st.column_config.NumberColumn(format="%d"),
+            "Regional CI Width": st.column_config.NumberColumn(format="%d"),
+        },
+        height=600
+    )
+    st.caption(
+        f"{n_draws:,} draws, seed {seed}. County median SE = 1.25 × dispersion × median × √(deff / N); "
+        f"earnings relative SE {params.earnings_rel_se:.0%}. Results are cached per seed and parameters."
+    )
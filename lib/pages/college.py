@@ -0,0 +1,298 @@
+# lib/pages/college.py
+import pandas as pd
+import streamlit as st
+
+from ..geo import get_spatial_index, nearby_peers
+from ..order_stats import get_order_stats
+from ..panel import PANEL_KEY, institution_history
+from ..profiling import profiled
+from ..scoring import statewide_baseline_label
+
+@profiled()
+def render_college_view(df):
+    """Render the College View page for searching and viewing individual institution details."""
+    st.title("College View")
+    st.markdown("Search for a college to view detailed metrics and analysis")
+    
+    # Check if data is available
+    if df.empty:
+        st.error("No data available. Please check the dataset files.")
+        return
+    
+    # Create search box
+    st.markdown("---")
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        # Get list of institutions for selectbox
+        institutions = sorted(df['Institution'].unique())
+        
+        # Search selectbox with placeholder
+        selected_institution = st.selectbox(
+            "Search for a college:",
+            options=[""] + institutions,
+            format_func=lambda x: "Type to search..." if x == "" else x,
+            help="Start typing to search for a college"
+        )
+    
+    # Display institution details if one is selected
+    if selected_institution and selected_institution != "":
+        # Get data for selected institution
+        selected = df[df['Institution'] == selected_institution]
+        inst_data = selected.iloc[0]
+        statewide_label = statewide_baseline_label(selected.iloc[:1])
+        program_years = inst_data.get('program_years', 2.0)
+        
+        st.markdown("---")
+        
+        # Institution header
+        st.header(f"📍 {selected_institution}")
+        
+        # Basic information in columns
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("County", inst_data.get('County', 'N/A'))
+            if 'Region' in inst_data:
+                st.metric("Region", inst_data.get('Region', 'N/A'))
+        
+        with col2:
+            st.metric("Sector", inst_data.get('Sector', 'N/A'))
+            if 'Predominant Award' in inst_data:
+                st.metric("Award Type", inst_data.get('Predominant Award', 'N/A'))
+        
+        with col3:
+            st.metric("10-Year Median Earnings", f"${inst_data['median_earnings_10yr']:,.0f}")
+            st.metric(f"Total Net Price ({program_years:g} years)", f"${inst_data['total_net_price']:,.0f}")
+        
+        # Earnings Premium Section
+        st.markdown("---")
+        st.subheader("📊 Earnings Premium")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric(
+                "Statewide Premium",
+                f"${inst_data['premium_statewide']:,.0f}",
+                help=f"Earnings above statewide HS baseline ({statewide_label})"
+            )
+        
+        with col2:
+            st.metric(
+                "Regional Premium", 
+                f"${inst_data['premium_regional']:,.0f}",
+                help=f"Earnings above county HS baseline (${inst_data['hs_median_income']:,.0f})"
+            )
+        
+        with col3:
+            delta = inst_data['premium_statewide'] - inst_data['premium_regional']
+            st.metric(
+                "Premium Delta",
+                f"${abs(delta):,.0f}",
+                delta=f"{'Higher' if delta > 0 else 'Lower'} statewide",
+                delta_color="normal" if delta > 0 else "inverse"
+            )
+        
+        # ROI Section
+        st.markdown("---")
+        st.subheader("💰 Return on Investment (ROI)")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        valid_sw = bool(inst_data['roi_statewide_valid'])
+        valid_reg = bool(inst_data['roi_regional_valid'])
+        
+        with col1:
+            roi_sw = inst_data['roi_statewide_years']
+            if valid_sw:
+                st.metric(
+                    "Statewide ROI",
+                    f"{roi_sw:.1f} years",
+                    help="Years to recoup costs using statewide baseline"
+                )
+            else:
+                st.metric(
+                    "Statewide ROI",
+                    "N/A",
+                    help="Negative earnings premium"
+                )
+        
+        with col2:
+            roi_reg = inst_data['roi_regional_years']
+            if valid_reg:
+                st.metric(
+                    "Regional ROI",
+                    f"{roi_reg:.1f} years",
+                    help="Years to recoup costs using regional baseline"
+                )
+            else:
+                st.metric(
+                    "Regional ROI",
+                    "N/A",
+                    help="Negative earnings premium"
+                )
+        
+        with col3:
+            if valid_sw and valid_reg:
+                roi_delta = roi_sw - roi_reg
+                st.metric(
+                    "ROI Difference",
+                    f"{abs(roi_delta):.1f} years",
+                    delta=f"{'Longer' if roi_delta > 0 else 'Shorter'} statewide",
+                    delta_color="inverse" if roi_delta > 0 else "normal"
+                )
+            else:
+                st.metric("ROI Difference", "N/A")
+        
+        # Rankings Section
+        st.markdown("---")
+        st.subheader("🏆 Rankings")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        # Only institutions with a valid ROI are ranked
+        stats = get_order_stats(df)
+        
+        with col1:
+            ranked_sw = len(stats.view('roi_valid_statewide'))
+            st.metric(
+                "Statewide Rank",
+                f"#{int(inst_data['rank_statewide'])} of {ranked_sw}" if valid_sw else "Not ranked",
+                help="Ranking based on statewide ROI (lower is better)"
+            )
+        
+        with col2:
+            ranked_reg = len(stats.view('roi_valid_regional'))
+            st.metric(
+                "Regional Rank",
+                f"#{int(inst_data['rank_regional'])} of {ranked_reg}" if valid_reg else "Not ranked",
+                help="Ranking based on regional ROI (lower is better)"
+            )
+        
+        with col3:
+            rank_change = int(inst_data['rank_change']) if valid_sw and valid_reg else None
+            if rank_change is None:
+                st.metric("Rank Change", "N/A")
+            elif rank_change != 0:
+                st.metric(
+                    "Rank Change",
+                    f"{abs(rank_change)} positions",
+                    delta=f"{'Better' if rank_change > 0 else 'Worse'} regionally",
+                    delta_color="normal" if rank_change > 0 else "inverse"
+                )
+            else:
+                st.metric("Rank Change", "Same rank")
+        
+        # Detailed Metrics Table
+        st.markdown("---")
+        st.subheader("📋 Detailed Metrics")
+        
+        # Create a detailed metrics dataframe
+        metrics_data = {
+            "Metric": [
+                "Graduate Median Earnings (10yr)",
+                "Annual Net Price",
+                f"Total Net Price ({program_years:g} years)",
+                "County HS Baseline",
+                "Statewide HS Baseline",
+                "Statewide Earnings Premium",
+                "Regional Earnings Premium",
+                "Statewide ROI (years)",
+                "Regional ROI (years)",
+                "Statewide Rank",
+                "Regional Rank",
+                "Rank Change"
+            ],
+            "Value": [
+                f"${inst_data['median_earnings_10yr']:,.0f}",
+                f"${inst_data.get('annual_net_price', inst_data['total_net_price'] / 2):,.0f}",
+                f"${inst_data['total_net_price']:,.0f}",
+                f"${inst_data['hs_median_income']:,.0f}",
+                statewide_label,
+                f"${inst_data['premium_statewide']:,.0f}",
+                f"${inst_data['premium_regional']:,.0f}",
+                f"{inst_data['roi_statewide_years']:.2f}" if valid_sw else "N/A",
+                f"{inst_data['roi_regional_years']:.2f}" if valid_reg else "N/A",
+                f"#{int(inst_data['rank_statewide'])}" if valid_sw else "N/A",
+                f"#{int(inst_data['rank_regional'])}" if valid_reg else "N/A",
+                f"{int(inst_data['rank_change']):+d}" if valid_sw and valid_reg else "N/A"
+            ]
+        }
+        
+        metrics_df = pd.DataFrame(metrics_data)
+        st.dataframe(metrics_df, use_container_width=True, hide_index=True)
+        
+        # Cohort Trends Section (reads only this institution's rows from the panel store)
+        st.markdown("---")
+        st.subheader("📈 Cohort Trends")
+        
+        history = institution_history(int(inst_data[PANEL_KEY])) if pd.notna(inst_data.get(PANEL_KEY)) else pd.DataFrame()
+        if len(history) < 2:
+            st.info("Trends appear once more than one cohort year is published to the panel store (data/panel). "
+                    "Set EPANALYSIS_COHORT_YEAR to the source files' cohort year to publish each dataset there.")
+        else:
+            from ..charts import trend_chart  # Altair loads with the first chart page
+            st.altair_chart(
+                trend_chart(history, {
+                    "median_earnings_10yr": "Median Earnings",
+                    "annual_net_price": "Annual Net Price",
+                    "premium_regional": "Regional Premium",
+                }),
+                use_container_width=True
+            )
+            trends = pd.DataFrame({
+                "Year": history["year"],
+                "Earnings Δ": history["median_earnings_10yr_yoy"],
+                "Net Price Δ": history["annual_net_price_yoy"],
+                "Statewide Premium Δ": history["premium_statewide_yoy"],
+                "Regional Premium Δ": history["premium_regional_yoy"],
+                "Statewide Rank Move": history["rank_statewide_yoy"],
+                "Regional Rank Move": history["rank_regional_yoy"],
+            })
+            st.dataframe(
+                trends,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Year": st.column_config.NumberColumn(format="%d"),
+                    "Earnings Δ": st.column_config.NumberColumn(format="$%,.0f"),
+                    "Net Price Δ": st.column_config.NumberColumn(format="$%,.0f"),
+                    "Statewide Premium Δ": st.column_config.NumberColumn(format="$%,.0f"),
+                    "Regional Premium Δ": st.column_config.NumberColumn(format="$%,.0f"),
+                    "Statewide Rank Move": st.column_config.NumberColumn(format="%+d"),
+                    "Regional Rank Move": st.column_config.NumberColumn(format="%+d"),
+                }
+            )
+            st.caption("Change from the previous published cohort. Positive rank move = ranked better.")
+        
+        # Nearby Colleges Section
+        st.markdown("---")
+        st.subheader("🗺️ Nearby Colleges")
+        
+        radius = st.slider("Radius (miles)", min_value=5, max_value=100, value=25, step=5)
+        peers = nearby_peers(df, get_spatial_index(df), selected_institution, radius_miles=radius)
+        
+        if peers.empty:
+            st.info(f"No other institutions within {radius} miles.")
+        else:
+            nearby = pd.DataFrame({
+                "Institution": peers["Institution"],
+                "Sector": peers["Sector"],
+                "Distance (mi)": peers["distance_miles"],
+                "Regional ROI (yrs)": peers["roi_regional_years"],
+                "Regional Rank": peers["rank_regional"],
+                "Statewide Rank": peers["rank_statewide"],
+            })
+            st.dataframe(
+                nearby,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Distance (mi)": st.column_config.NumberColumn(format="%.1f"),
+                    "Regional ROI (yrs)": st.column_config.NumberColumn(format="%.2f"),
+                    "Regional Rank": st.column_config.NumberColumn(format="%d"),
+                    "Statewide Rank": st.column_config.NumberColumn(format="%d"),
+                }
+            )
+            st.caption("Ranked by regional ROI (fastest payback first). Blank ROI = negative earnings premium.")
@@ -0,0 +1,38 @@
+# lib/pages/common.py
+import streamlit as st
+
+from ..export import EXPORT_FORMATS, export_bytes, export_url, export_view
+from ..profiling import profiled
+
+@profiled()
+def render_export_controls(df, views, key, regions=None, sectors=None, frame=None):
+    """Download button for a ranking view (or an already-filtered ``frame``) as CSV/Parquet/Arrow.
+
+    With ``EPANALYSIS_API_URL`` set, views link to the streamed
+    ``/api/v1/export`` endpoint; otherwise the file is built in this worker
+    only when the user asks for it. A small ``frame`` is downloaded directly.
+    """
+    st.markdown("---")
+    st.subheader("⬇️ Export")
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        view = views[0] if len(views) == 1 or frame is not None else st.selectbox(
+            "View", views, key=f"{key}_view",
+            format_func=lambda v: v.replace("_", " ").title()
+        )
+    with col2:
+        fmt = st.selectbox("Format", list(EXPORT_FORMATS), key=f"{key}_format", format_func=str.upper)
+
+    mime, ext = EXPORT_FORMATS[fmt]
+    url = export_url(view, fmt, regions, sectors) if frame is None else None
+    with col3:
+        if url:
+            st.link_button("Download", url)
+            return
+        if frame is None:
+            # Encode on request only, and don't keep the bytes around between reruns
+            if not st.button("Prepare download", key=f"{key}_prepare"):
+                return
+            frame = export_view(df, view, regions, sectors)
+        st.download_button("Download", export_bytes(frame, fmt), file_name=f"{view}{ext}", mime=mime,
+                           key=f"{key}_download", on_click="ignore")
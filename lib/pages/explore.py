@@ -0,0 +1,60 @@
+# lib/pages/explore.py
+import pandas as pd
+import streamlit as st
+
+from ..profiling import profiled, span
+from .common import render_export_controls
+
+@profiled()
+def render_explore(df: pd.DataFrame):
+    from ..charts import quadrant_chart  # Altair loads with the first chart page
+    st.title("Explore: Price vs. 10-Year Earnings")
+    st.caption("Each point is an institution. Quadrants split by medians of the filtered set.")
+
+    # Filters (Region & Sector)
+    st.sidebar.header("Filters")
+    regions = sorted([r for r in df["Region"].dropna().unique()])
+    sectors = sorted([s for s in df["Sector"].dropna().unique()])
+    sel_regions = st.sidebar.multiselect("Region", options=regions, default=regions)
+    sel_sectors = st.sidebar.multiselect("Sector", options=sectors, default=sectors)
+
+    with span("filter"):
+        f = df[(df["Region"].isin(sel_regions)) & (df["Sector"].isin(sel_sectors))].copy()
+    if f.empty:
+        st.warning("No data after filters. Adjust selections.")
+        return
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Institutions", f"{len(f):,}")
+    c2.metric("Median Total Net Price", f"${f['total_net_price'].median():,.0f}")
+    c3.metric("Median 10-Year Earnings", f"${f['median_earnings_10yr'].median():,.0f}")
+
+    with span("chart"):
+        st.altair_chart(quadrant_chart(f), use_container_width=True)
+
+    st.subheader("Filtered institutions")
+    show_cols = [
+        "Institution", "Region", "County", "Sector",
+        "total_net_price", "median_earnings_10yr",
+        "premium_statewide", "premium_regional",
+        "roi_statewide_years", "roi_regional_years",
+    ]
+    existing = [c for c in show_cols if c in f.columns]
+    with span("table"):
+        st.dataframe(
+            f[existing].rename(columns={
+                "total_net_price": "Total Net Price",
+                "median_earnings_10yr": "Median Earnings (10y)",
+                "premium_statewide": "Premium (Statewide)",
+                "premium_regional": "Premium (Local)",
+                "roi_statewide_years": "ROI (Statewide, yrs)",
+                "roi_regional_years": "ROI (Local, yrs)",
+            }),
+            use_container_width=True, hide_index=True,
+        )
+
+    render_export_controls(
+        df, ["institutions"], key="explore_export",
+        regions=None if set(sel_regions) >= set(regions) else sel_regions,
+        sectors=None if set(sel_sectors) >= set(sectors) else sel_sectors,
+    )
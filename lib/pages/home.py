@@ -0,0 +1,76 @@
+# lib/pages/home.py
+from pathlib import Path
+
+import streamlit as st
+
+from ..profiling import profiled
+
+def load_markdown_content(filename: str) -> str:
+    """Load markdown content from the content directory."""
+    content_dir = Path(__file__).parents[2] / "content"
+    file_path = content_dir / filename
+    
+    if file_path.exists():
+        return file_path.read_text()
+    else:
+        return f"Content file not found: {filename}"
+
+@profiled()
+def render_markdown_page(filename: str):
+    """Render a markdown file as a Streamlit page."""
+    content = load_markdown_content(filename)
+    st.markdown(content)
+
+@profiled()
+def render_home():
+    st.title("Higher Ed ROI Research Lab")
+    st.markdown("*Data-driven insights on college earnings premiums and ROI outcomes*")
+    
+    st.markdown("---")
+    
+    # Mission
+    st.subheader("Mission")
+    st.markdown(
+        "The **Higher Ed ROI Research Lab** provides independent, data-driven analysis of higher education "
+        "return on investment (ROI) and earnings premium outcomes. Our primary audience is researchers, "
+        "policymakers, and education analysts. We take no advocacy position on individual institutions, "
+        "programs, metrics or policies. Instead, our goal is to provide clear, well-documented methods that "
+        "help inform policy discussions, institutional accountability, and public understanding of "
+        "postsecondary education value."
+    )
+    
+    # Current Focus
+    st.subheader("Current Focus")
+    st.markdown(
+        "Our current work examines the policy implications of new federal accountability rules, "
+        "particularly the **Earnings Premium Regulation** introduced under Title VIII, Subtitle E "
+        "of the Higher Education Act amendments (effective July 1, 2026) "
+        "This rule may make certain programs ineligible for federal funding if graduates' median "
+        "earnings fall below the median for comparable high school graduates in their state or nationwide.\n\n"
+        "We are using **California's two-year and certificate-granting colleges** as a pilot dataset to explore "
+        "how these rules may operate and how alternative metrics may "
+        "yield different policy outcomes."
+    )
+    
+    
+    # Disclaimer
+    st.subheader("Disclaimer")
+    st.markdown(
+        "The data and analyses on this site are intended **solely for research and policy analysis purposes**. "
+        "They should **not** be used to make enrollment decisions about individual colleges or programs. "
+        "Metrics are based on public datasets (IPEDS, U.S. Census, Golden Returns) and may not capture all factors "
+        "affecting individual educational or economic outcomes."
+    )
+    
+    st.info("Use the sidebar navigation to explore our research tools and datasets.")
+
+@profiled()
+def render_methodology():
+    st.title("Methodology")
+    st.markdown(
+        "- **Earnings (10y):** Median earnings ~10 years after enrollment (College Scorecard).\n"
+        "- **HS baselines:** Statewide and county medians for HS grads (ages 25–34; ACS/IPUMS).\n"
+        "- **Premiums:** Graduate earnings − HS baseline.\n"
+        "- **ROI (years):** Total net price ÷ annual earnings premium (simple payback).\n"
+        "- **Assumptions & Limitations:** Completion time, imputation rules, missing-data handling; not causal."
+    )
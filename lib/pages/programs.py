@@ -0,0 +1,109 @@
+# lib/pages/programs.py
+import pandas as pd
+import streamlit as st
+
+from ..profiling import profiled, span
+from ..programs import CREDENTIAL_LEVELS, DEFAULT_PROGRAM_PATH, aggregate_programs, get_program_scores
+
+@profiled()
+def render_program_roi(df: pd.DataFrame):
+    """Render program-level (CIP code × credential) ROI and its roll-up to institutions."""
+    st.title("Program ROI")
+    st.markdown(
+        "Scores every field-of-study program against its institution's net price and county/state "
+        "HS baselines. Programs are ranked against the same program (CIP code and credential) at other institutions."
+    )
+
+    if df.empty:
+        st.error("No data available. Please check the dataset files.")
+        return
+
+    with span("score"):
+        scored = get_program_scores(df)
+    if scored.empty:
+        st.info(f"No field-of-study data. Save the College Scorecard field-of-study CSV as "
+                f"`{DEFAULT_PROGRAM_PATH}` to score programs.")
+        return
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        levels = sorted(scored["CREDLEV"].unique())
+        sel_levels = st.multiselect("Credential level", levels, default=levels,
+                                    format_func=lambda v: CREDENTIAL_LEVELS.get(v, str(v)))
+    with col2:
+        query = st.text_input("Search institution or program", "")
+
+    with span("filter"):
+        keep = scored["CREDLEV"].isin(sel_levels)
+        if query:
+            text = scored["Institution"].fillna("")
+            if "CIPDESC" in scored.columns:
+                text = text + " " + scored["CIPDESC"].fillna("")
+            keep &= text.str.contains(query, case=False, regex=False)
+        programs = scored[keep]
+    if programs.empty:
+        st.warning("No programs match. Adjust the filters.")
+        return
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Programs", f"{len(programs):,}")
+    c2.metric("Institutions", f"{programs['OPEID6'].nunique():,}")
+    c3.metric("Pay Back (Statewide)", f"{programs['roi_statewide_valid'].mean():.0%}")
+
+    st.subheader("Programs")
+    show_cols = ["Institution", "CIPDESC", "CREDLEV", "median_earnings", "total_cost",
+                 "premium_statewide", "roi_statewide_years", "roi_regional_years", "peer_rank_regional"]
+    st.dataframe(
+        programs[[c for c in show_cols if c in programs.columns]]
+        .assign(CREDLEV=programs["CREDLEV"].map(CREDENTIAL_LEVELS))
+        .sort_values("roi_regional_years", na_position="last")
+        .rename(columns={
+            "CIPDESC": "Program",
+            "CREDLEV": "Credential",
+            "median_earnings": "Median Earnings",
+            "total_cost": "Total Net Price",
+            "premium_statewide": "Premium (Statewide)",
+            "roi_statewide_years": "ROI (Statewide, yrs)",
+            "roi_regional_years": "ROI (Local, yrs)",
+            "peer_rank_regional": "Peer Rank (Local)",
+        }),
+        use_container_width=True, hide_index=True, height=420,
+        column_config={
+            "Median Earnings": st.column_config.NumberColumn(format="$%,.0f"),
+            "Total Net Price": st.column_config.NumberColumn(format="$%,.0f"),
+            "Premium (Statewide)": st.column_config.NumberColumn(format="$%,.0f"),
+            "ROI (Statewide, yrs)": st.column_config.NumberColumn(format="%.2f"),
+            "ROI (Local, yrs)": st.column_config.NumberColumn(format="%.2f"),
+            "Peer Rank (Local)": st.column_config.NumberColumn(format="%d"),
+        },
+    )
+    st.caption("Blank ROI = non-positive premium or unknown earnings/price.")
+
+    st.subheader("Roll-up")
+    level = st.radio("Aggregate by", ["institution", "credential"], horizontal=True, format_func=str.title)
+    with span("aggregate"):
+        rolled = aggregate_programs(programs, level)
+    names = programs.drop_duplicates("OPEID6").set_index("OPEID6")["Institution"]
+    rolled.insert(0, "Institution", names.reindex(rolled["OPEID6"]).to_numpy())
+    if "CREDLEV" in rolled.columns:
+        rolled["CREDLEV"] = rolled["CREDLEV"].map(CREDENTIAL_LEVELS)
+    st.dataframe(
+        rolled.drop(columns="OPEID6").rename(columns={
+            "CREDLEV": "Credential",
+            "n_programs": "Programs",
+            "median_earnings": "Median Earnings (weighted)",
+            "premium_statewide": "Premium (Statewide)",
+            "premium_regional": "Premium (Local)",
+            "valid_roi_share": "Share That Pays Back",
+            "median_roi_statewide_years": "Median ROI (Statewide, yrs)",
+        }),
+        use_container_width=True, hide_index=True,
+        column_config={
+            "Median Earnings (weighted)": st.column_config.NumberColumn(format="$%,.0f"),
+            "Premium (Statewide)": st.column_config.NumberColumn(format="$%,.0f"),
+            "Premium (Local)": st.column_config.NumberColumn(format="$%,.0f"),
+            "Share That Pays Back": st.column_config.NumberColumn(format="%.2f"),
+            "Median ROI (Statewide, yrs)": st.column_config.NumberColumn(format="%.2f"),
+        },
+    )
+    st.caption("Earnings and premiums are averaged over programs weighted by completions (IPEDSCOUNT2).")
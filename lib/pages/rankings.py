@@ -0,0 +1,446 @@
+# lib/pages/rankings.py
+import pandas as pd
+import streamlit as st
+
+from ..order_stats import get_order_stats
+from ..profiling import profiled, span
+from ..scoring import statewide_baseline_label
+from .common import render_export_controls
+
+def rankings_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Rankings page rows: Institution, Region, both ROI ranks, Δ and its arrow label."""
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+
+    # Ensure numeric ranks
+    for c in ["rank_statewide", "rank_regional"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+
+    # Δ = statewide − local (positive = improved under local baseline)
+    delta = (pd.to_numeric(df.get("rank_change"), errors="coerce")
+             if "rank_change" in df.columns else df["rank_statewide"] - df["rank_regional"])
+
+    base = (
+        df.assign(**{"Δ (SW→Local)": delta})
+          .dropna(subset=["rank_statewide", "rank_regional"])
+          .loc[:, ["Institution", "Region", "rank_statewide", "rank_regional", "Δ (SW→Local)"]]
+          .rename(columns={
+              "rank_statewide": "ROI Rank (Statewide)",
+              "rank_regional":  "ROI Rank (Local)",
+          })
+    )
+
+    # Simple arrow for Δ
+    def delta_arrow(x):
+        if pd.isna(x): return ""
+        try:
+            xi = int(x)
+        except Exception:
+            return ""
+        if xi > 0:  return f"↑ +{xi}"
+        if xi < 0:  return f"↓ {xi}"
+        return "—"
+    base["Δ"] = base["Δ (SW→Local)"].apply(delta_arrow)
+    return base
+
+def filter_rankings(base: pd.DataFrame, query: str) -> pd.DataFrame:
+    """Rows whose Institution or Region contains ``query`` (case-insensitive)."""
+    q = query.strip().lower()
+    if not q:
+        return base
+    mask = (
+        base["Institution"].astype(str).str.lower().str.contains(q, regex=False)
+        | base["Region"].astype(str).str.lower().str.contains(q, regex=False)
+    )
+    return base[mask]
+
+@profiled()
+def render_rankings(df):
+    st.title("Rankings")
+    st.caption("Institution • Region • ROI Rank (Statewide) • ROI Rank (Local) • Δ (SW→Local)")
+
+    required = ["Institution", "Region", "rank_statewide", "rank_regional"]
+    missing = [c for c in required if c not in df.columns.str.strip()]
+    if missing:
+        st.error(f"Missing expected columns: {missing}")
+        st.caption("Here are the columns I do see (check for stray spaces or different names):")
+        st.code(list(df.columns))
+        return
+
+    with span("prep"):
+        base = rankings_table(df)
+
+    # Controls
+    c1, c2, c3 = st.columns([2, 1.2, 1])
+    with c1:
+        q = st.text_input("Search (Institution or Region)", value="", placeholder="Type to filter…").strip().lower()
+    with c2:
+        sort_by = st.selectbox("Sort by", ["ROI Rank (Local)", "ROI Rank (Statewide)", "Δ (SW→Local)"], index=0)
+    with c3:
+        asc = st.toggle("Ascending", value=True)
+
+    with span("filter"):
+        base = filter_rankings(base, q)
+
+    # Sort
+    if sort_by == "Δ (SW→Local)" and not asc:
+        base = base.assign(_abs=base["Δ (SW→Local)"].abs()).sort_values("_abs", ascending=False).drop(columns="_abs")
+    else:
+        base = base.sort_values(sort_by, ascending=asc, na_position="last")
+
+    # Show
+    with span("table"):
+        st.dataframe(
+            base[["Institution", "Region", "ROI Rank (Statewide)", "ROI Rank (Local)", "Δ", "Δ (SW→Local)"]],
+            use_container_width=True, hide_index=True,
+        )
+
+    render_export_controls(
+        df, ["rankings"], key="rankings_export",
+        frame=base[["Institution", "Region", "ROI Rank (Statewide)", "ROI Rank (Local)", "Δ (SW→Local)"]],
+    )
+
+@profiled()
+def render_earnings_premium_rankings(df):
+    """Render side-by-side Earnings Premium rankings for C-Metric and H-Metric."""
+    st.title("Earnings Premium Rankings")
+    st.markdown("Side-by-side comparison of rankings based on C-Metric (Statewide) and H-Metric (Regional) earnings premiums")
+    
+    # Check if data is available
+    if df.empty:
+        st.error("No data available. Please check the dataset files.")
+        return
+    
+    # Rankings come presorted from the cached order statistics
+    with span("order_stats"):
+        stats = get_order_stats(df)
+        df_cmetric = stats.sorted_frame('ep_rank_statewide')
+        df_hmetric = stats.sorted_frame('ep_rank_regional')
+    
+    # Add rank columns
+    df_cmetric = df_cmetric.assign(Rank=df_cmetric['ep_rank_statewide'].astype(int))
+    df_hmetric = df_hmetric.assign(Rank=df_hmetric['ep_rank_regional'].astype(int))
+    
+    # Create two columns for side-by-side display
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📊 C-Metric Rankings")
+        st.markdown(f"*Based on Statewide Baseline ({statewide_baseline_label(df)})*")
+        
+        # Prepare display dataframe
+        display_cmetric = df_cmetric[['Rank', 'Institution', 'Sector', 'premium_statewide']].copy()
+        display_cmetric.columns = ['Rank', 'Institution', 'Sector', 'Earnings Premium']
+        # Round earnings premium to whole numbers (keep as float to handle NaN)
+        display_cmetric['Earnings Premium'] = display_cmetric['Earnings Premium'].round(0)
+        
+        # Display table with formatting
+        st.dataframe(
+            display_cmetric,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Rank": st.column_config.NumberColumn(
+                    "Rank",
+                    format="%d"
+                ),
+                "Earnings Premium": st.column_config.NumberColumn(
+                    "Earnings Premium",
+                    format="$%,.0f"
+                )
+            },
+            height=600
+        )
+    
+    with col2:
+        st.subheader("📊 H-Metric Rankings")
+        st.markdown("*Based on Regional (County) Baselines*")
+        
+        # Prepare display dataframe
+        display_hmetric = df_hmetric[['Rank', 'Institution', 'Sector', 'premium_regional']].copy()
+        display_hmetric.columns = ['Rank', 'Institution', 'Sector', 'Earnings Premium']
+        # Round earnings premium to whole numbers (keep as float to handle NaN)
+        display_hmetric['Earnings Premium'] = display_hmetric['Earnings Premium'].round(0)
+        
+        # Display table with formatting
+        st.dataframe(
+            display_hmetric,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Rank": st.column_config.NumberColumn(
+                    "Rank",
+                    format="%d"
+                ),
+                "Earnings Premium": st.column_config.NumberColumn(
+                    "Earnings Premium",
+                    format="$%,.0f"
+                )
+            },
+            height=600
+        )
+    
+    # Scatterplot section
+    st.markdown("---")
+    st.subheader("📈 Earnings Premium vs. Cost Analysis")
+    
+    # Create scatterplot using Altair
+    import altair as alt
+    
+    # Prepare data for both C-Metric and H-Metric
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("**C-Metric (Statewide) Scatterplot**")
+        
+        # Create chart for C-Metric
+        chart_c = alt.Chart(df).mark_circle(size=60, opacity=0.7).encode(
+            x=alt.X('total_net_price:Q', 
+                   title='Total Net Price (2 years)', 
+                   scale=alt.Scale(zero=False)),
+            y=alt.Y('premium_statewide:Q', 
+                   title='Earnings Premium (C-Metric)', 
+                   scale=alt.Scale(zero=False)),
+            color=alt.Color('Sector:N', 
+                          scale=alt.Scale(domain=['Public', 'Private for-profit', 'Private non-profit'], 
+                                        range=['#1f77b4', '#ff7f0e', '#2ca02c']),
+                          title='Sector'),
+            tooltip=['Institution:N', 'Sector:N', 'total_net_price:Q', 'premium_statewide:Q']
+        ).properties(
+            width=350,
+            height=400,
+            title="Cost vs Statewide Earnings Premium"
+        )
+        
+        st.altair_chart(chart_c, use_container_width=True)
+    
+    with col2:
+        st.markdown("**H-Metric (Regional) Scatterplot**")
+        
+        # Create chart for H-Metric
+        chart_h = alt.Chart(df).mark_circle(size=60, opacity=0.7).encode(
+            x=alt.X('total_net_price:Q', 
+                   title='Total Net Price (2 years)', 
+                   scale=alt.Scale(zero=False)),
+            y=alt.Y('premium_regional:Q', 
+                   title='Earnings Premium (H-Metric)', 
+                   scale=alt.Scale(zero=False)),
+            color=alt.Color('Sector:N', 
+                          scale=alt.Scale(domain=['Public', 'Private for-profit', 'Private non-profit'], 
+                                        range=['#1f77b4', '#ff7f0e', '#2ca02c']),
+                          title='Sector'),
+            tooltip=['Institution:N', 'Sector:N', 'total_net_price:Q', 'premium_regional:Q']
+        ).properties(
+            width=350,
+            height=400,
+            title="Cost vs Regional Earnings Premium"
+        )
+        
+        st.altair_chart(chart_h, use_container_width=True)
+    
+    # Key Insights section (moved below scatterplots)
+    st.markdown("---")
+    st.subheader("📈 Key Insights")
+    
+    # Biggest rank changes are read from the precomputed ep_rank_change order
+    rank_cols = {'ep_rank_statewide': 'C_Rank', 'ep_rank_regional': 'H_Rank', 'ep_rank_change': 'Rank_Change'}
+    
+    # Biggest gainers and losers
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("**🔺 Biggest Gainers (H-Metric favors)**")
+        gainers = (stats.nlargest(5, 'ep_rank_change')[['Institution', *rank_cols]]
+                   .rename(columns=rank_cols).astype({c: int for c in rank_cols.values()}))
+        gainers['Change'] = gainers['Rank_Change'].apply(lambda x: f"+{x}" if x > 0 else str(x))
+        st.dataframe(gainers[['Institution', 'C_Rank', 'H_Rank', 'Change']], hide_index=True)
+    
+    with col2:
+        st.markdown("**🔻 Biggest Losers (C-Metric favors)**")
+        losers = (stats.nsmallest(5, 'ep_rank_change')[['Institution', *rank_cols]]
+                  .rename(columns=rank_cols).astype({c: int for c in rank_cols.values()}))
+        losers['Change'] = losers['Rank_Change'].apply(lambda x: f"+{x}" if x > 0 else str(x))
+        st.dataframe(losers[['Institution', 'C_Rank', 'H_Rank', 'Change']], hide_index=True)
+    
+    render_export_controls(df, ["earnings_premium_statewide", "earnings_premium_regional"], key="ep_export")
+
+@profiled()
+def render_roi_rankings(df):
+    """Render side-by-side ROI rankings for Statewide and Regional baselines."""
+    st.title("ROI Rankings")
+    st.markdown("Side-by-side comparison of Return on Investment rankings (years to recoup educational costs)")
+    
+    # Check if data is available
+    if df.empty:
+        st.error("No data available. Please check the dataset files.")
+        return
+    
+    # Rankings (lower ROI is better) come presorted from the cached order
+    # statistics; roi_rank_* is only defined for rows valid under both baselines
+    with span("order_stats"):
+        stats = get_order_stats(df)
+    
+    if stats.view('roi_valid').empty:
+        st.error("No institutions with valid ROI data.")
+        return
+    df_statewide = stats.sorted_frame('roi_rank_statewide')
+    df_regional = stats.sorted_frame('roi_rank_regional')
+    
+    # Add rank columns
+    df_statewide = df_statewide.assign(Rank=df_statewide['roi_rank_statewide'].astype(int))
+    df_regional = df_regional.assign(Rank=df_regional['roi_rank_regional'].astype(int))
+    
+    # Create two columns for side-by-side display
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("💰 Statewide ROI Rankings")
+        st.markdown(f"*Based on Statewide Baseline ({statewide_baseline_label(df)})*")
+        
+        # Prepare display dataframe
+        display_statewide = df_statewide[['Rank', 'Institution', 'Sector', 'roi_statewide_years', 'total_net_price']].copy()
+        display_statewide.columns = ['Rank', 'Institution', 'Sector', 'ROI (Years)', 'Total Cost (2yr)']
+        
+        # Format ROI years with month approximation
+        display_statewide['ROI (Years)'] = display_statewide['ROI (Years)'].apply(
+            lambda x: f"{x:.2f} years (≈ {x*12:.1f} months)" if x < 1 else f"{x:.2f} years"
+        )
+        
+        # Display table with formatting
+        st.dataframe(
+            display_statewide,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Rank": st.column_config.NumberColumn(
+                    "Rank",
+                    format="%d"
+                ),
+                "Total Cost (2yr)": st.column_config.NumberColumn(
+                    "Total Cost (2yr)",
+                    format="$%,.0f"
+                )
+            },
+            height=600
+        )
+    
+    with col2:
+        st.subheader("💰 Regional ROI Rankings")
+        st.markdown("*Based on Regional (County) Baselines*")
+        
+        # Prepare display dataframe
+        display_regional = df_regional[['Rank', 'Institution', 'Sector', 'roi_regional_years', 'total_net_price']].copy()
+        display_regional.columns = ['Rank', 'Institution', 'Sector', 'ROI (Years)', 'Total Cost (2yr)']
+        
+        # Format ROI years with month approximation
+        display_regional['ROI (Years)'] = display_regional['ROI (Years)'].apply(
+            lambda x: f"{x:.2f} years (≈ {x*12:.1f} months)" if x < 1 else f"{x:.2f} years"
+        )
+        
+        # Display table with formatting
+        st.dataframe(
+            display_regional,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Rank": st.column_config.NumberColumn(
+                    "Rank",
+                    format="%d"
+                ),
+                "Total Cost (2yr)": st.column_config.NumberColumn(
+                    "Total Cost (2yr)",
+                    format="$%,.0f"
+                )
+            },
+            height=600
+        )
+    
+    # Scatterplot section
+    st.markdown("---")
+    st.subheader("📈 ROI vs. Cost Analysis")
+    
+    # Create scatterplot using Altair
+    import altair as alt
+    
+    # Prepare data for both Statewide and Regional ROI
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("**Statewide ROI Scatterplot**")
+        
+        # Create chart for Statewide ROI
+        chart_sw = alt.Chart(stats.view('roi_valid')).mark_circle(size=60, opacity=0.7).encode(
+            x=alt.X('total_net_price:Q', 
+                   title='Total Net Price (2 years)', 
+                   scale=alt.Scale(zero=False)),
+            y=alt.Y('roi_statewide_years:Q', 
+                   title='ROI (Years) - Statewide', 
+                   scale=alt.Scale(zero=False)),
+            color=alt.Color('Sector:N', 
+                          scale=alt.Scale(domain=['Public', 'Private for-profit', 'Private non-profit'], 
+                                        range=['#1f77b4', '#ff7f0e', '#2ca02c']),
+                          title='Sector'),
+            tooltip=['Institution:N', 'Sector:N', 'total_net_price:Q', 'roi_statewide_years:Q']
+        ).properties(
+            width=350,
+            height=400,
+            title="Cost vs Statewide ROI (Years)"
+        )
+        
+        st.altair_chart(chart_sw, use_container_width=True)
+    
+    with col2:
+        st.markdown("**Regional ROI Scatterplot**")
+        
+        # Create chart for Regional ROI
+        chart_reg = alt.Chart(stats.view('roi_valid')).mark_circle(size=60, opacity=0.7).encode(
+            x=alt.X('total_net_price:Q', 
+                   title='Total Net Price (2 years)', 
+                   scale=alt.Scale(zero=False)),
+            y=alt.Y('roi_regional_years:Q', 
+                   title='ROI (Years) - Regional', 
+                   scale=alt.Scale(zero=False)),
+            color=alt.Color('Sector:N', 
+                          scale=alt.Scale(domain=['Public', 'Private for-profit', 'Private non-profit'], 
+                                        range=['#1f77b4', '#ff7f0e', '#2ca02c']),
+                          title='Sector'),
+            tooltip=['Institution:N', 'Sector:N', 'total_net_price:Q', 'roi_regional_years:Q']
+        ).properties(
+            width=350,
+            height=400,
+            title="Cost vs Regional ROI (Years)"
+        )
+        
+        st.altair_chart(chart_reg, use_container_width=True)
+    
+    # ROI Analysis section (moved below scatterplots)
+    st.markdown("---")
+    st.subheader("📈 ROI Analysis")
+    
+    # Compare rankings via the precomputed roi_rank_change order
+    rank_cols = {'roi_rank_statewide': 'SW', 'roi_rank_regional': 'Reg'}
+    
+    # Top performers and biggest changes
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("**🏆 Top 5 Overall ROI**")
+        top_roi = stats.nsmallest(5, 'roi_rank_statewide')[['Institution', 'roi_statewide_years', 'roi_regional_years']]
+        top_roi.columns = ['Institution', 'Statewide', 'Regional']
+        for col in ['Statewide', 'Regional']:
+            top_roi[col] = top_roi[col].apply(lambda x: f"{x:.2f} yrs")
+        st.dataframe(top_roi, hide_index=True)
+    
+    with col2:
+        st.markdown("**🔺 Regional Baseline Helps**")
+        helps = (stats.nlargest(5, 'roi_rank_change')[['Institution', *rank_cols]]
+                 .rename(columns=rank_cols).astype({c: int for c in rank_cols.values()}))
+        st.dataframe(helps, hide_index=True)
+    
+    with col3:
+        st.markdown("**🔻 Statewide Baseline Helps**")
+        hurts = (stats.nsmallest(5, 'roi_rank_change')[['Institution', *rank_cols]]
+                 .rename(columns=rank_cols).astype({c: int for c in rank_cols.values()}))
+        st.dataframe(hurts, hide_index=True)
+    
+    render_export_controls(df, ["roi_statewide", "roi_regional"], key="roi_export")
@@ -0,0 +1,175 @@
+# lib/panel.py
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import streamlit as st
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+from .data import COHORT_YEAR_ENV, dataset_version
+from .metrics import cache_lookup, cache_miss
+
+DEFAULT_PANEL_ROOT = "data/panel"
+PANEL_KEY = "OPEID6"
+
+# Columns tracked across cohort years (source fields plus scored outputs)
+PANEL_COLS = [
+    "OPEID6", "Institution", "Region", "County", "Sector",
+    "median_earnings_10yr", "annual_net_price", "total_net_price", "hs_median_income",
+    "premium_statewide", "premium_regional",
+    "roi_statewide_years", "roi_regional_years",
+    "rank_statewide", "rank_regional",
+]
+
+# Year-over-year changes: value columns differenced as current - previous
+DELTA_COLS = [
+    "median_earnings_10yr", "annual_net_price", "premium_statewide", "premium_regional",
+]
+# Rank movement is previous - current, so positive means the institution moved up
+RANK_COLS = ["rank_statewide", "rank_regional"]
+
+class PanelStore:
+    """Institution × cohort-year panel stored as Hive-partitioned Parquet.
+
+    Each cohort lives in ``<root>/year=<YYYY>/``. Listing years only reads
+    directory names; reads go through a pyarrow dataset with partition and
+    predicate pushdown, so a query touches only the years, row groups and
+    columns it asks for.
+    """
+
+    def __init__(self, root: str = DEFAULT_PANEL_ROOT):
+        self.root = Path(root)
+
+    def years(self) -> List[int]:
+        """Cohort years present on disk, ascending."""
+        if not self.root.is_dir():
+            return []
+        years = []
+        for part in self.root.glob("year=*"):
+            try:
+                years.append(int(part.name.split("=", 1)[1]))
+            except ValueError:
+                continue
+        return sorted(years)
+
+    def token(self) -> str:
+        """Cheap change marker (partition files and mtimes) for cache keys."""
+        if not self.root.is_dir():
+            return ""
+        return "|".join(f"{p.relative_to(self.root)}:{p.stat().st_mtime_ns}" for p in sorted(self.root.glob("year=*/*.parquet")))
+
+    def _dataset(self) -> ds.Dataset:
+        return ds.dataset(self.root, format="parquet", partitioning="hive")
+
+    def read(
+        self,
+        years: Optional[Iterable[int]] = None,
+        columns: Optional[Sequence[str]] = None,
+        keys: Optional[Iterable[int]] = None,
+    ) -> pd.DataFrame:
+        """Long frame for the requested years/columns/institutions (all by default)."""
+        if not self.years():
+            return pd.DataFrame(columns=["year", *(columns or PANEL_COLS)])
+        filters = []
+        if years is not None:
+            filters.append(ds.field("year").isin([int(y) for y in years]))
+        if keys is not None:
+            filters.append(ds.field(PANEL_KEY).isin([int(k) for k in keys]))
+        expr = None
+        for f in filters:
+            expr = f if expr is None else expr & f
+        if columns is not None:
+            columns = ["year", *[c for c in columns if c != "year"]]
+        table = self._dataset().to_table(columns=columns, filter=expr)
+        return table.to_pandas().sort_values([PANEL_KEY, "year"] if PANEL_KEY in table.column_names else ["year"], kind="stable").reset_index(drop=True)
+
+    def _partition_file(self, year: int) -> Path:
+        return self.root / f"year={int(year)}" / "part-0.parquet"
+
+    def version(self, year: int) -> Optional[str]:
+        """Dataset version written for ``year`` (from the Parquet footer), or None."""
+        try:
+            metadata = pq.read_schema(self._partition_file(year)).metadata or {}
+        except FileNotFoundError:
+            return None
+        value = metadata.get(b"dataset_version")
+        return value.decode() if value is not None else None
+
+    def write_year(self, df: pd.DataFrame, year: int) -> Path:
+        """Publish one cohort snapshot, replacing any existing partition for ``year``."""
+        target = self._partition_file(year)
+        part = target.parent
+        part.mkdir(parents=True, exist_ok=True)
+        cols = [c for c in PANEL_COLS if c in df.columns]
+        table = pa.Table.from_pandas(df[cols].reset_index(drop=True), preserve_index=False)
+        version = dataset_version(df)
+        if version is not None:
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"dataset_version": version})
+        # Dot-prefixed, so dataset discovery skips it until the rename
+        tmp = part / ".part-0.parquet.tmp"
+        pq.write_table(table, tmp)
+        tmp.replace(target)
+        return target
+
+def cohort_year(year: Optional[int] = None) -> Optional[int]:
+    """``year`` if given, else ``EPANALYSIS_COHORT_YEAR`` (None when neither is set)."""
+    if year is not None:
+        return int(year)
+    value = os.environ.get(COHORT_YEAR_ENV)
+    return int(value) if value else None
+
+def publish_cohort(df: pd.DataFrame, year: Optional[int] = None, root: str = DEFAULT_PANEL_ROOT) -> Optional[Path]:
+    """Write a scored dataset as its cohort year's partition.
+
+    Skipped (None) when no cohort year is configured, or when that year
+    already holds this dataset version, so reloads don't rewrite it.
+    """
+    year = cohort_year(year)
+    if year is None or df.empty:
+        return None
+    store = PanelStore(root)
+    version = dataset_version(df)
+    if version is not None and store.version(year) == version:
+        return None
+    return store.write_year(df, year)
+
+def yoy_deltas(panel: pd.DataFrame, key: str = PANEL_KEY) -> pd.DataFrame:
+    """Add ``<col>_yoy`` columns comparing each row with the institution's previous cohort.
+
+    One sort plus shifted array comparisons over the whole panel; the first
+    year of each institution (or a column missing from the panel) gets NaN.
+    """
+    out = panel.sort_values([key, "year"], kind="stable").reset_index(drop=True)
+    ids = out[key].to_numpy()
+    same = np.zeros(len(out), dtype=bool)
+    same[1:] = ids[1:] == ids[:-1]
+    for col in DELTA_COLS + RANK_COLS:
+        if col not in out.columns:
+            continue
+        values = pd.to_numeric(out[col], errors="coerce").to_numpy(dtype=float)
+        delta = np.full(len(out), np.nan)
+        if col in RANK_COLS:
+            delta[1:] = values[:-1] - values[1:]
+        else:
+            delta[1:] = values[1:] - values[:-1]
+        out[f"{col}_yoy"] = np.where(same, delta, np.nan)
+    return out
+
+@cache_lookup("cohort_history")
+@st.cache_data(show_spinner=False)
+@cache_miss("cohort_history")
+def _cached_history(root: str, token: str, key: int, columns: tuple) -> pd.DataFrame:
+    return yoy_deltas(PanelStore(root).read(columns=columns, keys=[key]))
+
+def institution_history(
+    key: int,
+    columns: Sequence[str] = ("Institution", *DELTA_COLS, *RANK_COLS),
+    root: str = DEFAULT_PANEL_ROOT,
+) -> pd.DataFrame:
+    """One institution's panel rows with YoY deltas, cached until the store changes."""
+    store = PanelStore(root)
+    cols = tuple(dict.fromkeys([PANEL_KEY, *columns]))
+    return _cached_history(root, store.token(), int(key), cols)
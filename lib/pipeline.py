@@ -0,0 +1,221 @@
+# lib/pipeline.py
+"""Declarative stage graph with per-stage caching keyed by input hashes.
+
+A stage's key hashes its name, the pipeline's ``code_version``, the
+values of the parameters it declares and the keys of its upstream stages;
+source stages also hash the contents of the files they read. Changing a file or a
+parameter therefore changes the keys of exactly the stages downstream of
+it, and only those re-run. Outputs are kept in a small in-memory LRU and,
+when ``cache_dir`` is set, pickled to disk (newest ``disk_entries`` per
+stage) so cold starts can skip every unchanged stage. Treat stage outputs as read-only: they are shared between
+callers. A pipeline is safe to share between threads (Streamlit runs each
+session's script on its own thread): the memory LRU and the disk writes
+are guarded by locks, though two threads missing the same key may both
+run the stage.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import CACHE_HITS, CACHE_MISSES, CACHE_MISS_SECONDS
+from .profiling import span
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_CACHE_ENV = "EPANALYSIS_PIPELINE_CACHE"
+
+@dataclass(frozen=True)
+class Stage:
+    """One step: ``fn(*upstream outputs, **declared params)``.
+
+    ``sources`` names path parameters whose file contents are part of the
+    stage key (for ingest stages). A missing file hashes as absent, so a
+    stage that tolerates it keeps one key until the file appears.
+    """
+    name: str
+    fn: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    params: Tuple[str, ...] = ()
+    sources: Tuple[str, ...] = ()
+
+def _digest(*parts: Any) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+def file_digest(path: str) -> str:
+    """SHA-1 of a file's contents, read in 1 MiB blocks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class Pipeline:
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        defaults: Optional[Dict[str, Any]] = None,
+        cache_dir: Optional[str] = None,
+        memory_entries: int = 16,
+        disk_entries: int = 4,
+        code_version: str = "",
+    ):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            missing = [name for name in stage.inputs if name not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on undefined stages {missing}")
+            self.stages[stage.name] = stage
+        self.defaults = dict(defaults or {})
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        # Serializes writing and pruning the disk entries within this process
+        self._disk_lock = threading.Lock()
+        self.code_version = code_version
+
+    def _params(self, overrides: Dict[str, Any]) -> Dict[str, Any]:
+        unknown = set(overrides) - set(self.defaults)
+        if unknown:
+            raise ValueError(f"Unknown pipeline parameters: {sorted(unknown)}")
+        return {**self.defaults, **overrides}
+
+    def keys(self, target: str, **overrides) -> Dict[str, str]:
+        """Cache key of ``target`` and each stage it depends on."""
+        params = self._params(overrides)
+        keys: Dict[str, str] = {}
+
+        def visit(name: str) -> str:
+            if name not in keys:
+                stage = self.stages[name]
+                upstream = [visit(dep) for dep in stage.inputs]
+                files = [file_digest(params[p]) if Path(params[p]).exists() else None for p in stage.sources]
+                values = [(p, params[p]) for p in stage.params]
+                keys[name] = _digest(name, self.code_version, upstream, files, values)
+            return keys[name]
+
+        if target not in self.stages:
+            raise KeyError(f"Unknown stage '{target}'; expected one of {list(self.stages)}")
+        visit(target)
+        return keys
+
+    def _cache_path(self, name: str, key: str) -> Optional[Path]:
+        return self.cache_dir / f"{name}-{key}.pkl" if self.cache_dir else None
+
+    def _lookup(self, name: str, key: str) -> Tuple[bool, Any]:
+        with self._memory_lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return True, self._memory[key]
+        path = self._cache_path(name, key)
+        if path is not None and path.exists():
+            try:
+                with open(path, "rb") as f:
+                    value = pickle.load(f)
+            except FileNotFoundError:
+                # Pruned by another writer since the check
+                return False, None
+            except Exception as e:
+                logger.warning(f"Discarding unreadable pipeline cache {path}: {e}")
+                return False, None
+            self._remember(key, value)
+            return True, value
+        return False, None
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._memory_lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _store(self, name: str, key: str, value: Any) -> None:
+        self._remember(key, value)
+        path = self._cache_path(name, key)
+        if path is None:
+            return
+        try:
+            with self._disk_lock:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+                # Keep the newest few outputs per stage
+                stale = sorted(self.cache_dir.glob(f"{name}-*.pkl"), key=lambda p: p.stat().st_mtime)
+                for old in stale[:-self.disk_entries]:
+                    old.unlink(missing_ok=True)
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning(f"Could not write pipeline cache {path}: {e}")
+
+    def run(self, target: str, **overrides) -> Any:
+        """Output of ``target``, re-running only stages whose key changed."""
+        return self.run_keyed(target, **overrides)[0]
+
+    def run_keyed(self, target: str, **overrides) -> Tuple[Any, str]:
+        """``run`` plus the target's key (a version tag for the output)."""
+        params = self._params(overrides)
+        keys = self.keys(target, **overrides)
+        outputs: Dict[str, Any] = {}
+
+        def produce(name: str) -> Any:
+            if name in outputs:
+                return outputs[name]
+            key = keys[name]
+            hit, value = self._lookup(name, key)
+            if hit:
+                CACHE_HITS.inc(cache=f"pipeline:{name}")
+            else:
+                stage = self.stages[name]
+                args = [produce(dep) for dep in stage.inputs]
+                kwargs = {p: params[p] for p in stage.params}
+                CACHE_MISSES.inc(cache=f"pipeline:{name}")
+                start = time.perf_counter()
+                with span(name):
+                    value = stage.fn(*args, **kwargs)
+                CACHE_MISS_SECONDS.observe(time.perf_counter() - start, cache=f"pipeline:{name}")
+                self._store(name, key, value)
+            outputs[name] = value
+            return value
+
+        return produce(target), keys[target]
+
+    def plan(self, target: str, **overrides) -> List[Tuple[str, str, bool]]:
+        """(stage, key, cached) for ``target`` and its dependencies, in run order."""
+        keys = self.keys(target, **overrides)
+        with self._memory_lock:
+            in_memory = {key for key in keys.values() if key in self._memory}
+        return [(name, keys[name], keys[name] in in_memory
+                 or bool(self.cache_dir and self._cache_path(name, keys[name]).exists()))
+                for name in self.stages if name in keys]
+
+    def clear(self) -> None:
+        """Drop in-memory outputs (disk entries stay until their inputs change)."""
+        with self._memory_lock:
+            self._memory.clear()
+
+def source_digest(*paths: Path) -> str:
+    """Hash of the ``.py`` files under ``paths``, for use as a ``code_version``."""
+    digest = hashlib.sha1()
+    for path in paths:
+        files = sorted(path.rglob("*.py")) if path.is_dir() else [path]
+        for file in files:
+            digest.update(file.read_bytes())
+    return digest.hexdigest()[:12]
+
+def default_cache_dir() -> Optional[str]:
+    """Disk cache location from ``EPANALYSIS_PIPELINE_CACHE`` ("" or "off" disables)."""
+    value = os.environ.get(PIPELINE_CACHE_ENV, ".cache/pipeline")
+    return None if value.lower() in ("", "0", "off", "false") else value
@@ -0,0 +1,130 @@
+# lib/prep.py
+"""Data preparation as a stage graph (see lib/pipeline.py).
+
+    ingest_roi ──► clean ──┐
+    ingest_institutions ───┴► join ─► impute ─► attach_baselines ─► score ─► rank ─► index
+    ingest_baselines ─────────────────────────────┘           │
+    ingest_programs ───────────────────────────────────────────┴► programs
+
+Each stage copies what it changes, so cached upstream outputs are never
+mutated. ``load_roi_metrics_dataset`` runs the graph up to ``score``;
+``get_order_stats`` continues it through ``rank`` and ``index`` for
+loader-produced frames, so a cold start with a warm disk cache skips both
+the load and the index build. ``get_program_scores`` runs ``programs``,
+which scores the field-of-study file (empty when it is absent) against
+the same institution prices and baselines.
+
+    python -m lib.prep --plan        # stage keys and which are cached
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from .baselines import BaselineRegistry, county_fips_columns, load_baseline_registry
+from .cost_model import DEFAULT_COST_MODEL
+from .data_schema import NUMERIC_COLS
+from .order_stats import add_ranking_ranks, index_rankings
+from .pipeline import Pipeline, Stage, default_cache_dir, source_digest
+from .programs import DEFAULT_PROGRAM_PATH, load_program_data, score_program_table
+from .scoring import ScoringParams, apply_scores
+from .utils import DataCleaner
+
+INSTITUTION_COLS = ["Institution", "Region", "Predominant Award", "Latitude", "Longitude"]
+
+DEFAULT_PARAMS = {
+    "roi_metrics_path": "data/roi-metrics.csv",
+    "institutions_path": "data/gr-institutions.csv",
+    "county_data_path": "data/hs_median_county_25_34.csv",
+    "program_data_path": DEFAULT_PROGRAM_PATH,
+    "award_types": ("Associate's",),
+    "impute_prices": None,
+    "scoring_params": ScoringParams(),
+}
+
+def ingest_roi(roi_metrics_path: str) -> pd.DataFrame:
+    return pd.read_csv(roi_metrics_path)
+
+def ingest_institutions(institutions_path: str) -> pd.DataFrame:
+    return pd.read_csv(institutions_path)
+
+def ingest_baselines(county_data_path: str) -> BaselineRegistry:
+    return load_baseline_registry(county_data_path)
+
+def ingest_programs(program_data_path: str) -> pd.DataFrame:
+    return load_program_data(program_data_path)
+
+def clean_roi(roi: pd.DataFrame) -> pd.DataFrame:
+    """Trim column names and coerce the numeric metric columns."""
+    out = roi.copy()
+    out.columns = out.columns.str.strip()
+    for col in NUMERIC_COLS:
+        if col in out.columns:
+            out[col] = pd.to_numeric(out[col], errors="coerce")
+    return out
+
+def join_institutions(roi: pd.DataFrame, institutions: pd.DataFrame,
+                      award_types: Tuple[str, ...]) -> pd.DataFrame:
+    """Inner join on Institution, keeping institutions whose predominant award is selected."""
+    inst = institutions[institutions["Predominant Award"].isin(award_types)]
+    df = roi.merge(inst[INSTITUTION_COLS], on="Institution", how="inner")
+    # County FIPS keys for bulk joins against the baseline registry
+    return df.assign(**county_fips_columns(df))
+
+def impute(df: pd.DataFrame, impute_prices: Optional[Tuple[str, ...]]) -> pd.DataFrame:
+    """Annual net price column, optionally with zero/missing prices imputed."""
+    # The source total_net_price is an annual figure; scoring derives the total
+    out = df.assign(annual_net_price=df["total_net_price"])
+    if impute_prices is not None:
+        out = DataCleaner.impute_zero_prices(out, "annual_net_price", "median_by_group", list(impute_prices))
+    return out
+
+def attach_baselines(df: pd.DataFrame, registry: BaselineRegistry) -> pd.DataFrame:
+    """Credential length, the registry's county baseline columns and each row's state baseline."""
+    out = registry.attach(df)
+    out["hs_statewide_median"] = pd.to_numeric(out["STATEFIP"]).map(registry.statewide()).astype(float)
+    out["program_years"] = DEFAULT_COST_MODEL.length_years(out["Predominant Award"], out["Sector"])
+    return out
+
+def score(df: pd.DataFrame, scoring_params: ScoringParams) -> pd.DataFrame:
+    return apply_scores(df, scoring_params)
+
+STAGES = [
+    Stage("ingest_roi", ingest_roi, params=("roi_metrics_path",), sources=("roi_metrics_path",)),
+    Stage("ingest_institutions", ingest_institutions, params=("institutions_path",),
+          sources=("institutions_path",)),
+    Stage("ingest_baselines", ingest_baselines, params=("county_data_path",), sources=("county_data_path",)),
+    Stage("clean", clean_roi, inputs=("ingest_roi",)),
+    Stage("join", join_institutions, inputs=("clean", "ingest_institutions"), params=("award_types",)),
+    Stage("impute", impute, inputs=("join",), params=("impute_prices",)),
+    Stage("attach_baselines", attach_baselines, inputs=("impute", "ingest_baselines")),
+    Stage("score", score, inputs=("attach_baselines",), params=("scoring_params",)),
+    Stage("rank", add_ranking_ranks, inputs=("score",)),
+    Stage("index", index_rankings, inputs=("rank",)),
+    Stage("ingest_programs", ingest_programs, params=("program_data_path",), sources=("program_data_path",)),
+    Stage("programs", score_program_table, inputs=("ingest_programs", "attach_baselines")),
+]
+
+# Any edit under lib/ invalidates cached outputs, including the disk cache
+PIPELINE = Pipeline(STAGES, defaults=DEFAULT_PARAMS, cache_dir=default_cache_dir(),
+                    code_version=source_digest(Path(__file__).parent))
+
+def prepare(target: str = "score", **params):
+    """Output of ``target`` for ``params`` (overriding ``DEFAULT_PARAMS``)."""
+    return PIPELINE.run(target, **params)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run or inspect the data preparation stages.")
+    parser.add_argument("--target", default="index", choices=list(PIPELINE.stages))
+    parser.add_argument("--plan", action="store_true", help="Print stage keys and cache state only")
+    args = parser.parse_args(argv)
+    if not args.plan:
+        prepare(args.target)
+    for name, key, cached in PIPELINE.plan(args.target):
+        print(f"{name:<20} {key}  {'cached' if cached else '-'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+# lib/profiling.py
+"""Opt-in per-rerun profiling: named timing spans, peak memory and a rolling log.
+
+Enable for every rerun with ``EPANALYSIS_PROFILE=1``. With
+``EPANALYSIS_PROFILE=allow`` only reruns whose page URL carries
+``?profile=1`` are profiled; without either setting the query parameter is
+ignored, so visitors cannot turn profiling on. When disabled, ``span`` and
+``profiled`` cost one context variable lookup. Peak memory comes from
+``tracemalloc``, which is process wide: concurrent sessions profiled at the
+same time share one counter. Tracing runs only while a profiled rerun is
+open; the last one to finish stops it, unless something else started it.
+Each finished rerun is appended as one JSON line to a rotating log
+(``EPANALYSIS_PROFILE_LOG``, default ``logs/profile.log``).
+"""
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from typing import Callable, Iterator, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+PROFILE_ENV = "EPANALYSIS_PROFILE"
+# EPANALYSIS_PROFILE value that lets ?profile=1 enable profiling per rerun
+PROFILE_ALLOW = "allow"
+PROFILE_LOG_ENV = "EPANALYSIS_PROFILE_LOG"
+DEFAULT_LOG_PATH = "logs/profile.log"
+LOG_MAX_BYTES = 5_000_000
+LOG_BACKUPS = 3
+
+_TRUTHY = {"1", "true", "yes", "on"}
+
+# Open reruns tracing memory, and whether profiling started tracemalloc
+_tracing_lock = threading.Lock()
+_tracing_reruns = 0
+_started_tracing = False
+
+def _acquire_tracing() -> None:
+    global _tracing_reruns, _started_tracing
+    with _tracing_lock:
+        if _tracing_reruns == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_reruns += 1
+
+def _release_tracing() -> None:
+    global _tracing_reruns, _started_tracing
+    with _tracing_lock:
+        _tracing_reruns -= 1
+        if _tracing_reruns == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+@dataclass
+class Span:
+    name: str
+    depth: int
+    seconds: float = 0.0
+    peak_bytes: Optional[int] = None
+
+class RerunProfile:
+    """Spans recorded during one script rerun, in start order."""
+
+    def __init__(self, page: str = "", track_memory: bool = True):
+        self.page = page
+        self.track_memory = track_memory
+        self.spans: List[Span] = []
+        self.total_seconds: Optional[float] = None
+        self.peak_bytes: Optional[int] = None
+        # (span, highest peak seen in finished children) for the open spans
+        self._stack: List[list] = []
+        self._started = time.perf_counter()
+        if track_memory:
+            _acquire_tracing()
+            tracemalloc.reset_peak()
+
+    def _fold_peak(self) -> int:
+        """Current peak, folded into the innermost open span, then reset."""
+        peak = tracemalloc.get_traced_memory()[1]
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        return peak
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        record = Span(name, depth=len(self._stack))
+        self.spans.append(record)
+        if self.track_memory:
+            self._fold_peak()
+        self._stack.append([record, 0])
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            _, child_peak = self._stack.pop()
+            if self.track_memory:
+                record.peak_bytes = max(child_peak, self._fold_peak())
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], record.peak_bytes)
+
+    def finish(self) -> None:
+        if self.total_seconds is not None:
+            return
+        self.total_seconds = time.perf_counter() - self._started
+        if self.track_memory:
+            peaks = [s.peak_bytes for s in self.spans if s.peak_bytes is not None]
+            self.peak_bytes = max([tracemalloc.get_traced_memory()[1], *peaks])
+            _release_tracing()
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "Span": ["· " * s.depth + s.name for s in self.spans],
+            "ms": [s.seconds * 1e3 for s in self.spans],
+            "Peak MB": [s.peak_bytes / 2**20 if s.peak_bytes is not None else None for s in self.spans],
+        })
+
+    def to_record(self) -> dict:
+        return {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "page": self.page,
+            "total_s": self.total_seconds,
+            "peak_bytes": self.peak_bytes,
+            "spans": [asdict(s) for s in self.spans],
+        }
+
+_current: ContextVar[Optional[RerunProfile]] = ContextVar("rerun_profile", default=None)
+
+def profiling_requested() -> bool:
+    """True when ``EPANALYSIS_PROFILE`` enables profiling, or allows it and the URL has ``?profile=1``."""
+    setting = os.environ.get(PROFILE_ENV, "").lower()
+    if setting in _TRUTHY:
+        return True
+    if setting != PROFILE_ALLOW:
+        return False
+    try:
+        return str(st.query_params.get("profile", "")).lower() in _TRUTHY
+    except Exception:
+        return False
+
+def start_rerun(page: str = "") -> RerunProfile:
+    """Begin recording spans for this rerun (on this script thread)."""
+    profile = RerunProfile(page)
+    _current.set(profile)
+    return profile
+
+def current_profile() -> Optional[RerunProfile]:
+    return _current.get()
+
+@contextmanager
+def span(name: str) -> Iterator[Optional[Span]]:
+    """Time a block as ``name`` within the active rerun profile; no-op otherwise."""
+    profile = _current.get()
+    if profile is None:
+        yield None
+        return
+    with profile.span(name) as record:
+        yield record
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """Decorator recording each call as a span (named after the function by default)."""
+    def decorate(fn: Callable) -> Callable:
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            profile = _current.get()
+            if profile is None:
+                return fn(*args, **kwargs)
+            with profile.span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def _profile_logger() -> logging.Logger:
+    logger = logging.getLogger("epanalysis.profile")
+    if not logger.handlers:
+        path = os.environ.get(PROFILE_LOG_ENV, DEFAULT_LOG_PATH)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+def finish_rerun() -> Optional[RerunProfile]:
+    """Close the active profile, append it to the rolling log and return it."""
+    profile = _current.get()
+    if profile is None:
+        return None
+    _current.set(None)
+    profile.finish()
+    try:
+        _profile_logger().info(json.dumps(profile.to_record()))
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"Could not write profile log: {e}")
+    return profile
+
+def render_profile_panel(profile: Optional[RerunProfile]) -> None:
+    """Debug sidebar panel with this rerun's spans, total time and peak memory."""
+    if profile is None:
+        return
+    with st.sidebar.expander("⏱️ Profile (this rerun)", expanded=True):
+        peak = f" · peak {profile.peak_bytes / 2**20:.1f} MB" if profile.peak_bytes is not None else ""
+        st.caption(f"{profile.page or 'page'} · {profile.total_seconds * 1e3:.0f} ms{peak}")
+        st.dataframe(
+            profile.to_frame(),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "ms": st.column_config.NumberColumn(format="%.1f"),
+                "Peak MB": st.column_config.NumberColumn(format="%.1f"),
+            },
+        )
@@ -0,0 +1,267 @@
+# lib/programs.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from .cost_model import DEFAULT_COST_MODEL, CostModel
+from .data import CACHED_VERSIONS, dataset_version
+from .data_schema import AwardType
+from .metrics import cache_lookup, cache_miss
+from .scoring import ScoringInputs, roi_with_mask
+from .scoring import statewide_baseline as row_statewide_baseline
+
+DEFAULT_PROGRAM_PATH = "data/field-of-study.csv"
+
+# College Scorecard field-of-study credential levels (CREDLEV)
+CREDENTIAL_LEVELS: Dict[int, str] = {
+    1: "Undergraduate Certificate or Diploma",
+    2: "Associate's Degree",
+    3: "Bachelor's Degree",
+    4: "Post-baccalaureate Certificate",
+    5: "Master's Degree",
+    6: "Doctoral Degree",
+    7: "First Professional Degree",
+    8: "Graduate/Professional Certificate",
+}
+# Award type per level, which sets its length (lib/cost_model.py). As in
+# IPEDS, post-baccalaureate and graduate certificates count as certificates
+# and first-professional degrees as (professional practice) doctorates.
+CREDENTIAL_AWARD: Dict[int, AwardType] = {
+    1: AwardType.CERTIFICATE,
+    2: AwardType.ASSOCIATES,
+    3: AwardType.BACHELORS,
+    4: AwardType.CERTIFICATE,
+    5: AwardType.MASTERS,
+    6: AwardType.DOCTORAL,
+    7: AwardType.DOCTORAL,
+    8: AwardType.CERTIFICATE,
+}
+
+PROGRAM_KEYS = ["OPEID6", "CIPCODE", "CREDLEV"]
+
+def _lookup_table(mapping: Dict[int, float], default: float = np.nan) -> np.ndarray:
+    """Dense array indexed by credential level for vectorized lookups."""
+    table = np.full(max(mapping) + 1, default)
+    for level, value in mapping.items():
+        table[level] = value
+    return table
+
+def credential_lengths(cost_model: CostModel = DEFAULT_COST_MODEL) -> Dict[int, float]:
+    """Nominal years of net price per credential level, from the cost model's award lengths."""
+    return {level: cost_model.award_years.get(award, np.nan) for level, award in CREDENTIAL_AWARD.items()}
+
+@dataclass(frozen=True)
+class ProgramInputs:
+    """Columnar program arrays keyed by (OPEID6, CIP code, credential level)."""
+    opeid6: np.ndarray
+    cipcode: np.ndarray
+    credlev: np.ndarray
+    earnings: np.ndarray
+    annual_price: np.ndarray
+    regional_baseline: np.ndarray
+    statewide_baseline: np.ndarray
+    weight: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.opeid6)
+
+    @classmethod
+    def from_frames(
+        cls,
+        programs: pd.DataFrame,
+        institutions: pd.DataFrame,
+        earnings_col: str = "EARN_MDN_4YR",
+        weight_col: str = "IPEDSCOUNT2",
+    ) -> "ProgramInputs":
+        """Join institution price and baselines onto program rows by OPEID6.
+
+        Baselines are the institution's, as ``ScoringInputs.from_frame`` reads
+        them: the registry's county and state medians where attached.
+        Programs at institutions missing from ``institutions`` keep NaN price
+        and baselines and score as invalid. Rows without earnings score as
+        invalid; rows without a ``weight_col`` count get weight 1 in
+        aggregation.
+        """
+        inst = institutions.drop_duplicates("OPEID6")
+        baselines = ScoringInputs.from_frame(inst)
+        pos = pd.Index(inst["OPEID6"]).get_indexer(programs["OPEID6"])
+        found = pos >= 0
+
+        def take(values) -> np.ndarray:
+            values = np.broadcast_to(np.asarray(values, dtype=float), len(inst))
+            out = np.full(len(pos), np.nan)
+            out[found] = values[pos[found]]
+            return out
+
+        def column(col: str, default: float) -> pd.Series:
+            if col not in programs.columns:
+                return pd.Series(default, index=programs.index, dtype=float)
+            return pd.to_numeric(programs[col], errors="coerce")
+
+        return cls(
+            opeid6=programs["OPEID6"].to_numpy(dtype=np.int64),
+            cipcode=programs["CIPCODE"].to_numpy(dtype=np.int64),
+            credlev=programs["CREDLEV"].to_numpy(dtype=np.int64),
+            earnings=column(earnings_col, np.nan).to_numpy(dtype=float),
+            annual_price=take(baselines.annual_price),
+            regional_baseline=take(baselines.regional_baseline),
+            statewide_baseline=take(row_statewide_baseline(baselines)),
+            weight=column(weight_col, 1.0).fillna(1.0).clip(lower=0).to_numpy(dtype=float),
+        )
+
+def group_rank_min(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """``rank(method='min')`` of ``values`` within each group, in one lexsort (NaN stays NaN)."""
+    values = np.asarray(values, dtype=float)
+    order = np.lexsort((values, groups))
+    ordered, grp = values[order], groups[order]
+    n = len(values)
+    new_group = np.ones(n, dtype=bool)
+    new_group[1:] = grp[1:] != grp[:-1]
+    new_value = new_group.copy()
+    new_value[1:] |= ordered[1:] != ordered[:-1]
+    positions = np.arange(n)
+    group_start = np.maximum.accumulate(np.where(new_group, positions, 0))
+    value_start = np.maximum.accumulate(np.where(new_value, positions, 0))
+    ranks = np.empty(n)
+    ranks[order] = value_start - group_start + 1.0
+    ranks[np.isnan(values)] = np.nan
+    return ranks
+
+def score_programs(
+    inputs: ProgramInputs,
+    statewide_baseline: Optional[float] = None,
+    credential_years: Optional[Dict[int, float]] = None,
+    batch_size: int = 65_536,
+) -> pd.DataFrame:
+    """Cost, premiums and ROI for every program, processed in fixed-size array batches.
+
+    ``statewide_baseline`` overrides each program's state baseline. Ranks
+    are within each (CIP code, credential level) peer group, comparing the
+    same program across institutions.
+    """
+    years = _lookup_table(credential_years or credential_lengths())
+    n = len(inputs)
+    cols = {name: np.empty(n) for name in (
+        "total_cost", "premium_statewide", "premium_regional", "roi_statewide_years", "roi_regional_years",
+    )}
+    cols.update({name: np.empty(n, dtype=bool) for name in ("roi_statewide_valid", "roi_regional_valid")})
+    for start in range(0, n, batch_size):
+        sl = slice(start, min(start + batch_size, n))
+        level = inputs.credlev[sl]
+        length = np.where((level >= 0) & (level < len(years)), years[np.clip(level, 0, len(years) - 1)], np.nan)
+        cost = inputs.annual_price[sl] * length
+        state = inputs.statewide_baseline[sl] if statewide_baseline is None else statewide_baseline
+        premium_sw = inputs.earnings[sl] - state
+        premium_reg = inputs.earnings[sl] - inputs.regional_baseline[sl]
+        cols["total_cost"][sl] = cost
+        cols["premium_statewide"][sl] = premium_sw
+        cols["premium_regional"][sl] = premium_reg
+        # Unknown cost or earnings cannot pay back (invalid, NaN ROI)
+        cols["roi_statewide_years"][sl], cols["roi_statewide_valid"][sl] = roi_with_mask(cost, premium_sw)
+        cols["roi_regional_years"][sl], cols["roi_regional_valid"][sl] = roi_with_mask(cost, premium_reg)
+
+    peer = inputs.cipcode * 10 + inputs.credlev
+    rank_cols = {
+        f"peer_rank_{name}": group_rank_min(cols[f"roi_{name}_years"], peer)
+        for name in ("statewide", "regional")
+    }
+
+    return pd.DataFrame({
+        "OPEID6": inputs.opeid6,
+        "CIPCODE": inputs.cipcode,
+        "CREDLEV": inputs.credlev,
+        "median_earnings": inputs.earnings,
+        "weight": inputs.weight,
+        **cols,
+        **rank_cols,
+    })
+
+def aggregate_programs(scored: pd.DataFrame, level: str = "institution") -> pd.DataFrame:
+    """Roll program scores up to ``"credential"`` (OPEID6 × CREDLEV) or ``"institution"`` (OPEID6).
+
+    Earnings and premiums are weight-averaged over programs with earnings;
+    ``valid_roi_share`` is the weighted share of programs that pay back and
+    ``median_roi_statewide_years`` the median over those that do.
+    """
+    keys = ["OPEID6", "CREDLEV"] if level == "credential" else ["OPEID6"]
+    codes = scored.groupby(keys).ngroup().to_numpy()
+    groups = scored[keys].drop_duplicates().sort_values(keys).reset_index(drop=True)
+    m = len(groups)
+    weight = scored["weight"].to_numpy(dtype=float)
+
+    def weighted_mean(col: str) -> np.ndarray:
+        values = scored[col].to_numpy(dtype=float)
+        has = ~np.isnan(values)
+        num = np.bincount(codes[has], weights=values[has] * weight[has], minlength=m)
+        den = np.bincount(codes[has], weights=weight[has], minlength=m)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return num / den
+
+    valid = scored["roi_statewide_valid"].to_numpy()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        valid_share = (np.bincount(codes, weights=weight * valid, minlength=m)
+                       / np.bincount(codes, weights=weight, minlength=m))
+    median_roi = (scored.loc[valid, "roi_statewide_years"]
+                  .groupby(codes[valid]).median()
+                  .reindex(np.arange(m)).to_numpy())
+
+    out = groups
+    out["n_programs"] = np.bincount(codes, minlength=m)
+    out["median_earnings"] = weighted_mean("median_earnings")
+    out["premium_statewide"] = weighted_mean("premium_statewide")
+    out["premium_regional"] = weighted_mean("premium_regional")
+    out["valid_roi_share"] = valid_share
+    out["median_roi_statewide_years"] = median_roi
+    return out
+
+def load_program_data(path: str = DEFAULT_PROGRAM_PATH) -> pd.DataFrame:
+    """Scorecard field-of-study extract; empty frame with the key columns if absent.
+
+    Only the key, earnings and count columns are read, and PrivacySuppressed
+    cells become NaN.
+    """
+    if not Path(path).exists():
+        return pd.DataFrame(columns=PROGRAM_KEYS)
+    wanted = set(PROGRAM_KEYS) | {"CIPDESC", "EARN_MDN_4YR", "EARN_MDN_1YR", "IPEDSCOUNT2"}
+    df = pd.read_csv(path, usecols=lambda c: c in wanted, na_values=["PrivacySuppressed", "NULL"], low_memory=False)
+    for col in PROGRAM_KEYS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df.dropna(subset=PROGRAM_KEYS).astype({c: np.int64 for c in PROGRAM_KEYS})
+
+def score_program_table(programs: pd.DataFrame, institutions: pd.DataFrame) -> pd.DataFrame:
+    """Scored programs with their institution and program names (the ``programs`` prep stage)."""
+    scored = score_programs(ProgramInputs.from_frames(programs, institutions))
+    names = institutions.drop_duplicates("OPEID6").set_index("OPEID6")["Institution"]
+    scored.insert(1, "Institution", names.reindex(scored["OPEID6"]).to_numpy())
+    if "CIPDESC" in programs.columns:
+        scored.insert(3, "CIPDESC", programs["CIPDESC"].to_numpy())
+    return scored
+
+def _file_token(path: str) -> str:
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return ""
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+@cache_lookup("program_scores")
+@st.cache_data(show_spinner=False, max_entries=CACHED_VERSIONS)
+@cache_miss("program_scores")
+def _cached_program_scores(version: str, program_path: str, token: str, _df: pd.DataFrame) -> pd.DataFrame:
+    params = _df.attrs.get("prep_params")
+    if params is None:
+        return score_program_table(load_program_data(program_path), _df)
+    # Loader frames continue through the preparation graph's programs stage
+    from .prep import PIPELINE  # lib.prep imports this module
+
+    return PIPELINE.run("programs", **params, program_data_path=program_path)
+
+def get_program_scores(df: pd.DataFrame, program_path: str = DEFAULT_PROGRAM_PATH) -> pd.DataFrame:
+    """Scored program table for ``df``'s institutions, cached per dataset version and program file."""
+    version = dataset_version(df)
+    if version is None:
+        return score_program_table(load_program_data(program_path), df)
+    return _cached_program_scores(version, program_path, _file_token(program_path), df)
@@ -0,0 +1,103 @@
+# lib/quality.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from .data import CACHED_VERSIONS, dataset_version
+from .metrics import cache_lookup, cache_miss
+
+# Columns with more missing values than this are flagged
+MISSING_THRESHOLD = 0.10
+# ROI outside this range (years) is implausible for a two-year credential
+ROI_BOUNDS: Tuple[float, float] = (-10.0, 100.0)
+ROI_COLS = ["roi_statewide_years", "roi_regional_years"]
+
+@dataclass(frozen=True)
+class QualityReport:
+    """Row-level check counts and per-column missingness for one dataset."""
+    version: Optional[str]
+    rows: int
+    checks: Dict[str, int] = field(default_factory=dict)
+    missing_share: pd.Series = field(default_factory=lambda: pd.Series(dtype=float))
+    missing_threshold: float = MISSING_THRESHOLD
+
+    @property
+    def high_missing(self) -> pd.Series:
+        return self.missing_share[self.missing_share > self.missing_threshold]
+
+    def issues(self) -> Dict[str, Any]:
+        """Non-zero checks plus ``high_missing_data`` ({column: "12.3%"}), as logged by the loaders."""
+        out: Dict[str, Any] = {name: count for name, count in self.checks.items() if count > 0}
+        if not self.high_missing.empty:
+            out["high_missing_data"] = {col: f"{share:.1%}" for col, share in self.high_missing.items()}
+        return out
+
+    def checks_frame(self) -> pd.DataFrame:
+        counts = pd.Series(self.checks, dtype="int64")
+        return pd.DataFrame({
+            "Check": counts.index,
+            "Rows": counts.to_numpy(),
+            "Share": counts.to_numpy() / self.rows if self.rows else np.nan,
+        })
+
+def quality_report(
+    df: pd.DataFrame,
+    missing_threshold: float = MISSING_THRESHOLD,
+    roi_bounds: Tuple[float, float] = ROI_BOUNDS,
+) -> QualityReport:
+    """All data-quality checks from one extraction of the checked columns.
+
+    The price, earnings and ROI columns are pulled into a single float
+    block and every row-level check is a vectorized comparison on it;
+    missingness for all columns comes from one ``isna`` over the frame.
+    Checks whose columns are absent are skipped.
+    """
+    price = "annual_net_price" if "annual_net_price" in df.columns else "total_net_price"
+    wanted = [price, "median_earnings_10yr", *ROI_COLS]
+    cols = [c for c in wanted if c in df.columns]
+    block = df[cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    col = {name: block[:, i] for i, name in enumerate(cols)}
+
+    checks: Dict[str, int] = {}
+    if price in col:
+        checks["zero_price"] = int((col[price] == 0).sum())
+        checks["missing_price"] = int(np.isnan(col[price]).sum())
+    if "price_imputed" in df.columns:
+        checks["price_imputed"] = int(df["price_imputed"].to_numpy(dtype=bool).sum())
+    if "median_earnings_10yr" in col:
+        earnings = col["median_earnings_10yr"]
+        checks["missing_earnings"] = int(np.isnan(earnings).sum())
+        checks["negative_earnings"] = int((earnings < 0).sum())
+    low, high = roi_bounds
+    for name in ROI_COLS:
+        if name in col:
+            checks[f"extreme_{name}"] = int(((col[name] < low) | (col[name] > high)).sum())
+        valid = f"{name.replace('_years', '')}_valid"
+        if valid in df.columns:
+            checks[f"no_payback_{name}"] = int((~df[valid].to_numpy(dtype=bool)).sum())
+
+    n = len(df)
+    missing = df.isna().to_numpy().sum(axis=0)
+    missing_share = pd.Series(missing / n if n else np.zeros(len(df.columns)), index=df.columns, dtype=float)
+    return QualityReport(
+        version=dataset_version(df),
+        rows=n,
+        checks=checks,
+        missing_share=missing_share,
+        missing_threshold=missing_threshold,
+    )
+
+@cache_lookup("quality_report")
+@st.cache_data(show_spinner=False, max_entries=CACHED_VERSIONS)
+@cache_miss("quality_report")
+def _cached_quality_report(version: str, _df: pd.DataFrame) -> QualityReport:
+    return quality_report(_df)
+
+def get_quality_report(df: pd.DataFrame) -> QualityReport:
+    """Quality report for ``df``, computed once per dataset version."""
+    version = dataset_version(df)
+    if version is None:
+        return quality_report(df)
+    return _cached_quality_report(version, df)
@@ -0,0 +1,233 @@
+# lib/refresh.py
+"""Background dataset refresh through numbered, atomically published snapshots.
+
+A snapshot root holds one snapshot directory per dataset version (see
+lib/snapshot.py) and ``CURRENT.json``, the published pointer::
+
+    {"generation": 7, "version": "5ce5c56aadbebf34", "published": "...", "history": [...]}
+
+``Refresher`` is the root's single publisher, run as its own process by
+``python -m lib.refresh`` (lib/cluster.py starts and supervises one). It
+polls the source files; when the prepared dataset's key changes it builds
+the next snapshot, including the ranking indexes, and then replaces the
+pointer with the next generation number. A failed build leaves the pointer alone.
+
+Each app process runs a ``Follower``. When a newer generation appears it
+maps the snapshot and builds the shared per-version tables (``warm``) in
+its own thread, and only then makes the snapshot current. A rerun reads
+the current dataset once, at the top of app.py, so a session keeps the
+version it started with until its next rerun and no request waits for a
+build. Older generations stay on disk for a few more publishes.
+
+With a cohort year (``--cohort-year`` or ``EPANALYSIS_COHORT_YEAR``) each
+published dataset is also written to that year's panel partition
+(lib/panel.py), which feeds the College View trends.
+
+    python -m lib.refresh snapshots --interval 30     # publish on source changes
+    python -m lib.refresh snapshots --once --cohort-year 2024
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from .commute import get_commute_model
+from .comparison import get_earnings_comparison, get_roi_comparison
+from .geo import get_spatial_index
+from .metrics import DATASET_INFO
+from .order_stats import get_order_stats
+from .panel import DEFAULT_PANEL_ROOT, publish_cohort
+from .quality import get_quality_report
+from .scoring import get_scoring_inputs
+from .snapshot import MANIFEST_FILE, SNAPSHOT_ENV, Snapshot, build_snapshot, open_snapshot
+
+CURRENT_FILE = "CURRENT.json"
+DEFAULT_INTERVAL_SECONDS = 60.0
+FOLLOW_INTERVAL_SECONDS = 5.0
+# Published generations whose snapshot directories are kept on disk
+KEEP_PUBLISHED = 3
+
+@dataclass(frozen=True)
+class Published:
+    generation: int
+    version: str
+    path: Path
+
+def read_current(root: str) -> Optional[Published]:
+    """The published generation under ``root`` (None before the first publish)."""
+    try:
+        pointer = json.loads((Path(root) / CURRENT_FILE).read_text())
+    except FileNotFoundError:
+        return None
+    return Published(pointer["generation"], pointer["version"], Path(root) / pointer["version"])
+
+def publish(root: str, version: str, keep: int = KEEP_PUBLISHED) -> Published:
+    """Make snapshot ``root/<version>`` current under the next generation number.
+
+    The pointer is replaced atomically, so readers see either the old or
+    the new generation. Snapshot directories no longer in the last
+    ``keep`` publishes are removed; processes that still map them keep
+    their open files.
+    """
+    root_path = Path(root)
+    pointer_path = root_path / CURRENT_FILE
+    previous = json.loads(pointer_path.read_text()) if pointer_path.exists() else {}
+    generation = previous.get("generation", 0) + 1
+    entry = {"generation": generation, "version": version, "published": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    history = [entry, *previous.get("history", [])][:keep]
+
+    tmp = root_path / f".{CURRENT_FILE}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps({**entry, "history": history}))
+    os.replace(tmp, pointer_path)
+
+    kept = {h["version"] for h in history}
+    for child in root_path.iterdir():
+        if child.name not in kept and (child / MANIFEST_FILE).exists():
+            shutil.rmtree(child, ignore_errors=True)
+    return Published(generation, version, root_path / version)
+
+def warm(df: pd.DataFrame) -> None:
+    """Build the shared per-version tables the pages read, so reruns find them cached."""
+    for build in (get_order_stats, get_scoring_inputs, get_earnings_comparison, get_roi_comparison,
+                  get_quality_report, get_spatial_index, get_commute_model):
+        build(df)
+
+class Refresher(threading.Thread):
+    """Publishes a new generation whenever the sources change the prepared dataset."""
+
+    def __init__(self, root: str, interval: float = DEFAULT_INTERVAL_SECONDS, cohort_year: Optional[int] = None,
+                 panel_root: str = DEFAULT_PANEL_ROOT, **params):
+        super().__init__(name="dataset-refresh", daemon=True)
+        self.root = root
+        self.interval = interval
+        self.cohort_year = cohort_year
+        self.panel_root = panel_root
+        self.params = params
+        self._paneled: Optional[str] = None
+        self._stopped = threading.Event()
+
+    def _publish_cohort(self, path: Path) -> None:
+        """Write the snapshot at ``path`` to the panel store once per version."""
+        if self._paneled != path.name:
+            publish_cohort(open_snapshot(str(path)).dataset, self.cohort_year, self.panel_root)
+            self._paneled = path.name
+
+    def refresh_once(self) -> Optional[Published]:
+        """Build and publish if the dataset changed; the new generation, or None when unchanged."""
+        from .prep import PIPELINE  # lib.prep imports the scoring and index modules
+
+        # Hashes the source files only; the build runs on a change
+        version = PIPELINE.keys("score", **self.params)["score"]
+        current = read_current(self.root)
+        if current is not None and current.version == version:
+            self._publish_cohort(current.path)
+            return None
+        path = build_snapshot(self.root, **self.params)
+        self._publish_cohort(path)
+        return publish(self.root, path.name)
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                published = self.refresh_once()
+            except Exception as e:
+                # Keep serving the published generation; retry on the next poll
+                print(f"dataset refresh failed: {e}", file=sys.stderr, flush=True)
+                continue
+            if published is not None:
+                print(f"published dataset generation {published.generation} ({published.version})",
+                      file=sys.stderr, flush=True)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+class Follower(threading.Thread):
+    """Keeps ``snapshot`` at the newest published generation, mapped and warmed."""
+
+    def __init__(self, root: str, interval: float = FOLLOW_INTERVAL_SECONDS):
+        super().__init__(name="dataset-follow", daemon=True)
+        self.root = root
+        self.interval = interval
+        published = read_current(root)
+        if published is None:
+            raise FileNotFoundError(f"No published snapshot under {root}")
+        self.generation = published.generation
+        self.snapshot: Snapshot = self._open(published)
+
+    def _open(self, published: Published) -> Snapshot:
+        snapshot = open_snapshot(str(published.path))
+        warm(snapshot.dataset)
+        DATASET_INFO.replace(1, version=snapshot.version, rows=len(snapshot.dataset),
+                             generation=published.generation)
+        return snapshot
+
+    def poll_once(self) -> bool:
+        """Switch to a newer published generation; True when it did."""
+        published = read_current(self.root)
+        if published is None or published.generation <= self.generation:
+            return False
+        # One attribute swap: a rerun sees the old snapshot or the warmed new one
+        self.snapshot = self._open(published)
+        self.generation = published.generation
+        return True
+
+    def run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.poll_once()
+            except Exception as e:
+                # Keep serving the current snapshot; retry on the next poll
+                print(f"could not open published snapshot: {e}", file=sys.stderr, flush=True)
+
+@st.cache_resource(show_spinner=False)
+def get_follower(root: str) -> Follower:
+    """The process's follower for ``root``, started on first use."""
+    follower = Follower(root)
+    follower.start()
+    return follower
+
+def shared_dataset() -> pd.DataFrame:
+    """Dataset for this rerun from ``EPANALYSIS_SNAPSHOT``.
+
+    The variable names either one snapshot directory or a snapshot root,
+    whose newest published generation is followed.
+    """
+    path = os.environ[SNAPSHOT_ENV]
+    try:
+        if (Path(path) / MANIFEST_FILE).exists():
+            return open_snapshot(path).dataset
+        return get_follower(path).snapshot.dataset
+    except (OSError, ValueError, KeyError, pa.ArrowInvalid) as e:
+        st.error(f"Could not open dataset snapshot {path}: {e}")
+        return pd.DataFrame()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Publish dataset snapshots when the source files change.")
+    parser.add_argument("root", nargs="?", default="snapshots")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_SECONDS, help="Seconds between source checks")
+    parser.add_argument("--once", action="store_true", help="Check once and exit")
+    parser.add_argument("--cohort-year", type=int,
+                        help="Also write each published dataset to this panel year (default: EPANALYSIS_COHORT_YEAR)")
+    parser.add_argument("--panel", default=DEFAULT_PANEL_ROOT, help="Panel store root")
+    args = parser.parse_args(argv)
+
+    refresher = Refresher(args.root, args.interval, cohort_year=args.cohort_year, panel_root=args.panel)
+    published = refresher.refresh_once()
+    print(f"generation {published.generation}: {published.path}" if published else "unchanged", flush=True)
+    if not args.once:
+        refresher.run()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
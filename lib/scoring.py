@@ -0,0 +1,232 @@
+# lib/scoring.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from .data import CACHED_SCENARIOS, CACHED_VERSIONS, dataset_version
+from .metrics import cache_lookup, cache_miss
+
+# Default scenario: each row's state HS median from the baseline registry
+# (lib/baselines.py) and credential length (lib/cost_model.py) at the
+# reported annual net price. STATEWIDE_HS_BASELINE, the weighted California
+# median (lib/hs_baseline.py), stands in for frames without registry
+# columns; PROGRAM_LENGTH_MULTIPLIER is the Associate's length, used when a
+# frame carries no program_years column.
+STATEWIDE_HS_BASELINE = 24939.44
+PROGRAM_LENGTH_MULTIPLIER = 2.0
+
+@dataclass(frozen=True)
+class ScoringParams:
+    """Scenario parameters for premium/ROI/rank scoring."""
+    # One baseline for every row; None uses each row's state baseline
+    statewide_baseline: Optional[float] = None
+    # Years of net price for every row; None uses each row's credential length
+    length_multiplier: Optional[float] = None
+    # Payback must happen within this many years to count as a valid ROI;
+    # None means no cap (the published methodology).
+    horizon_years: Optional[float] = None
+
+@dataclass(frozen=True)
+class DiscountParams:
+    """Time-value settings for discounted payback and NPV."""
+    discount_rate: float = 0.03
+    earnings_growth: float = 0.0
+    # Years of premium counted toward NPV
+    npv_horizon_years: float = 20.0
+
+@dataclass(frozen=True)
+class ScoringInputs:
+    """Per-institution arrays the scoring kernel runs on."""
+    earnings: np.ndarray
+    annual_price: np.ndarray
+    regional_baseline: np.ndarray
+    program_years: Optional[np.ndarray] = None
+    # Each row's state baseline (NaN where unknown)
+    statewide_baseline: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ScoringInputs":
+        """Arrays from ``df``; baselines come from the registry columns when present.
+
+        ``hs_baseline_median`` (county) falls back to the source file's
+        ``hs_median_income`` where the registry has no entry, and
+        ``hs_statewide_median`` gives each row its state's baseline.
+        """
+        annual = df["annual_net_price"] if "annual_net_price" in df.columns else df["total_net_price"]
+        regional = pd.to_numeric(df["hs_median_income"], errors="coerce").to_numpy(dtype=float)
+        if "hs_baseline_median" in df.columns:
+            registry = df["hs_baseline_median"].to_numpy(dtype=float)
+            regional = np.where(np.isnan(registry), regional, registry)
+        return cls(
+            earnings=pd.to_numeric(df["median_earnings_10yr"], errors="coerce").to_numpy(dtype=float),
+            annual_price=pd.to_numeric(annual, errors="coerce").to_numpy(dtype=float),
+            regional_baseline=regional,
+            program_years=df["program_years"].to_numpy(dtype=float) if "program_years" in df.columns else None,
+            statewide_baseline=(df["hs_statewide_median"].to_numpy(dtype=float)
+                                if "hs_statewide_median" in df.columns else None),
+        )
+
+def program_length(program_years: Optional[np.ndarray], length_multiplier: Optional[float] = None):
+    """Years of net price per row: an explicit multiplier wins, then per-row lengths, then 2."""
+    if length_multiplier is not None:
+        return length_multiplier
+    return program_years if program_years is not None else PROGRAM_LENGTH_MULTIPLIER
+
+def statewide_baseline(inputs: ScoringInputs, baseline: Optional[float] = None):
+    """Statewide baseline per row: an explicit value wins, then each row's state, then California."""
+    if baseline is not None:
+        return baseline
+    if inputs.statewide_baseline is None:
+        return STATEWIDE_HS_BASELINE
+    return np.where(np.isnan(inputs.statewide_baseline), STATEWIDE_HS_BASELINE, inputs.statewide_baseline)
+
+def statewide_baseline_label(df: pd.DataFrame) -> str:
+    """Statewide HS baseline for UI text, from ``hs_statewide_median`` (a range when rows span states)."""
+    values = df["hs_statewide_median"].dropna() if "hs_statewide_median" in df.columns else df.iloc[0:0]
+    low, high = (values.min(), values.max()) if len(values) else (STATEWIDE_HS_BASELINE, STATEWIDE_HS_BASELINE)
+    if f"{low:,.0f}" == f"{high:,.0f}":
+        return f"${low:,.0f}"
+    return f"${low:,.0f}–${high:,.0f} by state"
+
+def rank_min(values: np.ndarray) -> np.ndarray:
+    """Vectorized ``Series.rank(method='min')`` along the last axis (NaN stays NaN).
+
+    Works on a single ranking (n,) or a batch of rankings (scenarios, n).
+    """
+    values = np.asarray(values, dtype=float)
+    order = np.argsort(values, axis=-1, kind="stable")
+    ordered = np.take_along_axis(values, order, axis=-1)
+    starts = np.ones(values.shape, dtype=bool)
+    starts[..., 1:] = ordered[..., 1:] != ordered[..., :-1]
+    positions = np.broadcast_to(np.arange(values.shape[-1]), values.shape)
+    sorted_ranks = np.maximum.accumulate(np.where(starts, positions, 0), axis=-1) + 1.0
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, sorted_ranks, axis=-1)
+    ranks[np.isnan(values)] = np.nan
+    return ranks
+
+def roi_with_mask(total_cost: np.ndarray, premium: np.ndarray,
+                  horizon_years: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Simple payback (cost ÷ annual premium) and its validity mask.
+
+    Rows are invalid when the premium is non-positive or missing, the cost
+    is missing, or payback exceeds ``horizon_years``; their ROI is NaN so
+    ranks and aggregates skip them without a separate filter.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = total_cost / premium
+    valid = (premium > 0) & ~np.isnan(roi)
+    if horizon_years is not None:
+        valid &= roi <= horizon_years
+    return np.where(valid, roi, np.nan), valid
+
+def roi_years(total_cost: np.ndarray, premium: np.ndarray, horizon_years: Optional[float] = None) -> np.ndarray:
+    """Simple payback in years; NaN where the ROI is invalid (see ``roi_with_mask``)."""
+    return roi_with_mask(total_cost, premium, horizon_years)[0]
+
+def _growth_ratio(discount: DiscountParams) -> float:
+    return (1 + discount.earnings_growth) / (1 + discount.discount_rate)
+
+def discounted_payback_years(total_cost: np.ndarray, premium: np.ndarray, discount: DiscountParams = DiscountParams()) -> np.ndarray:
+    """Years until discounted premiums repay the cost, solved in closed form.
+
+    With q = (1 + growth) / (1 + rate), the present value of t years of
+    premium is P·q·(1 - qᵗ)/(1 - q), so t = ln(1 - C(1 - q)/(P·q)) / ln q
+    (t = C/P when q = 1). Costs the premium stream can never repay, and
+    non-positive premiums, are invalid (NaN).
+    """
+    return payback_from_ratio(total_cost, premium, _growth_ratio(discount))
+
+def payback_from_ratio(total_cost: np.ndarray, premium: np.ndarray, q) -> np.ndarray:
+    """Discounted payback for growth/discount ratio ``q`` (scalar or broadcastable array)."""
+    q = np.asarray(q, dtype=float)
+    flat = np.isclose(q, 1.0)
+    safe_q = np.where(flat, 0.5, q)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        years = np.where(
+            flat,
+            total_cost / premium,
+            np.log1p(-total_cost * (1 - safe_q) / (premium * safe_q)) / np.log(safe_q),
+        )
+    valid = (premium > 0) & np.isfinite(years)
+    return np.where(valid, years, np.nan)
+
+def npv(total_cost: np.ndarray, premium: np.ndarray, discount: DiscountParams = DiscountParams()) -> np.ndarray:
+    """Net present value of the premium over the NPV horizon, less the cost (geometric series)."""
+    q = _growth_ratio(discount)
+    n = discount.npv_horizon_years
+    annuity = n if np.isclose(q, 1.0) else q * (1 - q ** n) / (1 - q)
+    return premium * annuity - total_cost
+
+def score_discounted(inputs: ScoringInputs, params: ScoringParams = ScoringParams(),
+                     discount: DiscountParams = DiscountParams()) -> Dict[str, np.ndarray]:
+    """Discounted payback, NPV and their ranks for both baselines."""
+    total_cost = inputs.annual_price * program_length(inputs.program_years, params.length_multiplier)
+    out = {}
+    for name, premium in (("statewide", inputs.earnings - statewide_baseline(inputs, params.statewide_baseline)),
+                          ("regional", inputs.earnings - inputs.regional_baseline)):
+        payback = discounted_payback_years(total_cost, premium, discount)
+        value = npv(total_cost, premium, discount)
+        out[f"discounted_payback_{name}_years"] = payback
+        out[f"npv_{name}"] = value
+        out[f"npv_rank_{name}"] = rank_min(-value)
+    return out
+
+def score_arrays(inputs: ScoringInputs, params: ScoringParams = ScoringParams()) -> Dict[str, np.ndarray]:
+    """Recompute cost, premiums, ROI and rankings for a scenario in one vectorized pass."""
+    total_cost = inputs.annual_price * program_length(inputs.program_years, params.length_multiplier)
+    premium_sw = inputs.earnings - statewide_baseline(inputs, params.statewide_baseline)
+    premium_reg = inputs.earnings - inputs.regional_baseline
+
+    roi_sw, valid_sw = roi_with_mask(total_cost, premium_sw, params.horizon_years)
+    roi_reg, valid_reg = roi_with_mask(total_cost, premium_reg, params.horizon_years)
+
+    # Only valid ROIs are ranked; invalid rows get NaN ranks
+    rank_sw = rank_min(roi_sw)
+    rank_reg = rank_min(roi_reg)
+    return {
+        "total_net_price": total_cost,
+        "premium_statewide": premium_sw,
+        "premium_regional": premium_reg,
+        "roi_statewide_years": roi_sw,
+        "roi_regional_years": roi_reg,
+        "roi_statewide_valid": valid_sw,
+        "roi_regional_valid": valid_reg,
+        "rank_statewide": rank_sw,
+        "rank_regional": rank_reg,
+        "rank_change": rank_sw - rank_reg,
+    }
+
+def apply_scores(df: pd.DataFrame, params: ScoringParams = ScoringParams()) -> pd.DataFrame:
+    """Return a copy of ``df`` with the scored columns replaced for ``params``."""
+    scores = score_arrays(ScoringInputs.from_frame(df), params)
+    return df.assign(**scores)
+
+@cache_lookup("discounted_scores")
+@st.cache_data(show_spinner=False, max_entries=CACHED_SCENARIOS)
+@cache_miss("discounted_scores")
+def _cached_discounted(version: str, params: ScoringParams, discount: DiscountParams, _df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    return score_discounted(get_scoring_inputs(_df), params, discount)
+
+def get_discounted_scores(df: pd.DataFrame, params: ScoringParams = ScoringParams(),
+                          discount: DiscountParams = DiscountParams()) -> Dict[str, np.ndarray]:
+    """Discounted metrics for ``df``, cached per dataset version and parameter set."""
+    version = dataset_version(df)
+    if version is None:
+        return score_discounted(ScoringInputs.from_frame(df), params, discount)
+    return _cached_discounted(version, params, discount, df)
+
+@cache_lookup("scoring_inputs")
+@st.cache_resource(show_spinner=False, max_entries=CACHED_VERSIONS)
+@cache_miss("scoring_inputs")
+def _cached_scoring_inputs(version: str, _df: pd.DataFrame) -> ScoringInputs:
+    return ScoringInputs.from_frame(_df)
+
+def get_scoring_inputs(df: pd.DataFrame) -> ScoringInputs:
+    """Scoring arrays for ``df``, extracted once per dataset version."""
+    version = dataset_version(df)
+    if version is None:
+        return ScoringInputs.from_frame(df)
+    return _cached_scoring_inputs(version, df)
@@ -0,0 +1,149 @@
+# lib/snapshot.py
+"""Read-only dataset snapshots shared by worker processes through mmap.
+
+A snapshot directory holds the prepared dataset with its ranking columns
+(``frame.arrow``, Arrow IPC), the ranking index arrays concatenated into
+one ``index.npy`` and a ``manifest.json``. Workers memory-map both files:
+numeric columns, string columns (as ``string[pyarrow]``) and every index
+array are views of the shared page cache, so an extra worker costs only
+its small per-process copies (boolean and nullable-integer columns,
+derived per-session tables) and opening a snapshot does no parsing or
+sorting. Mapped arrays are read-only; writing to them raises.
+
+    python -m lib.snapshot build snapshots     # prints the snapshot path
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from .data import CACHED_VERSIONS
+from .metrics import DATASET_INFO, DATASET_LOAD_SECONDS, cache_lookup, cache_miss
+from .order_stats import OrderStatistics
+
+SNAPSHOT_ENV = "EPANALYSIS_SNAPSHOT"
+FRAME_FILE = "frame.arrow"
+INDEX_FILE = "index.npy"
+MANIFEST_FILE = "manifest.json"
+
+@dataclass(frozen=True)
+class Snapshot:
+    path: str
+    version: str
+    # The loader's columns, and the same rows with the ranking columns indexed by ``stats``
+    dataset: pd.DataFrame
+    stats: OrderStatistics
+
+def _to_arrow(frame: pd.DataFrame) -> pa.Table:
+    """One-chunk table; float NaNs stay values (not nulls) so columns map without copying."""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if frame[field.name].dtype.kind == "f":
+            table = table.set_column(i, field.name, pa.array(frame[field.name].to_numpy(), from_pandas=False))
+    return table.combine_chunks()
+
+def write_snapshot(dataset: pd.DataFrame, stats: OrderStatistics, root: str, version: str) -> Path:
+    """Write ``root/<version>`` unless it exists; returns the snapshot directory.
+
+    The files are written to a temporary directory that is renamed into
+    place, so readers never see a partial snapshot.
+    """
+    target = Path(root) / version
+    if (target / MANIFEST_FILE).exists():
+        return target
+    tmp = Path(root) / f".{version}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    table = _to_arrow(stats.frame)
+    with pa.OSFile(str(tmp / FRAME_FILE), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    arrays, meta = stats.to_arrays()
+    offsets: Dict[str, List[int]] = {}
+    start = 0
+    for name, values in arrays.items():
+        offsets[name] = [start, start + len(values)]
+        start += len(values)
+    flat = np.concatenate([np.asarray(v, dtype=np.int64) for v in arrays.values()]) if arrays else np.empty(0, np.int64)
+    np.save(tmp / INDEX_FILE, flat)
+
+    manifest = {
+        "version": version,
+        "rows": len(stats.frame),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "dataset_columns": [c for c in dataset.columns if c in stats.frame.columns],
+        "index": meta,
+        "offsets": offsets,
+    }
+    (tmp / MANIFEST_FILE).write_text(json.dumps(manifest))
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        # Another process published the same version first
+        shutil.rmtree(tmp, ignore_errors=True)
+    return target
+
+def _map_frame(table: pa.Table, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas(split_blocks=True, types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+
+def read_snapshot(path: str) -> Snapshot:
+    """Memory-map the snapshot at ``path``."""
+    root = Path(path)
+    manifest = json.loads((root / MANIFEST_FILE).read_text())
+    table = pa.ipc.open_file(pa.memory_map(str(root / FRAME_FILE), "r")).read_all()
+    flat = np.load(root / INDEX_FILE, mmap_mode="r")
+    arrays = {name: flat[start:end] for name, (start, end) in manifest["offsets"].items()}
+
+    version = manifest["version"]
+    dataset = _map_frame(table, manifest["dataset_columns"])
+    frame = _map_frame(table)
+    for df in (dataset, frame):
+        df.attrs["dataset_version"] = version
+        df.attrs["snapshot"] = str(root)
+    return Snapshot(str(root), version, dataset, OrderStatistics.from_arrays(frame, arrays, manifest["index"]))
+
+@cache_lookup("snapshot")
+@st.cache_resource(show_spinner=False, max_entries=CACHED_VERSIONS)
+@cache_miss("snapshot")
+def open_snapshot(path: str) -> Snapshot:
+    """The snapshot at ``path``, mapped once per process and shared across sessions."""
+    started = time.perf_counter()
+    snapshot = read_snapshot(path)
+    DATASET_LOAD_SECONDS.set(time.perf_counter() - started)
+    DATASET_INFO.replace(1, version=snapshot.version, rows=len(snapshot.dataset))
+    return snapshot
+
+def build_snapshot(root: str, **params) -> Path:
+    """Prepare the dataset (lib/prep.py) and write its snapshot under ``root``."""
+    from .prep import PIPELINE
+
+    dataset, version = PIPELINE.run_keyed("score", **params)
+    stats = PIPELINE.run("index", **params)
+    return write_snapshot(dataset, stats, root, version)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build a memory-mappable dataset snapshot.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Prepare the dataset and write a snapshot")
+    build.add_argument("root", nargs="?", default="snapshots")
+    build.add_argument("--awards", nargs="+", default=["Associate's"])
+    args = parser.parse_args(argv)
+    print(build_snapshot(args.root, award_types=tuple(args.awards)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
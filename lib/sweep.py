@@ -0,0 +1,220 @@
+# lib/sweep.py
+import itertools
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Dict, Optional, Sequence, Tuple
+
+from .metrics import cache_lookup, cache_miss
+from .scoring import (
+    ScoringInputs, get_scoring_inputs, payback_from_ratio,
+    program_length, rank_min, statewide_baseline,
+)
+
+# Sweepable parameters and their defaults (the published methodology).
+# statewide_baseline NaN means each row's state baseline, length_multiplier
+# NaN each row's credential length.
+SWEEP_DEFAULTS: Dict[str, float] = {
+    "statewide_baseline": np.nan,
+    "length_multiplier": np.nan,
+    "discount_rate": 0.0,
+    "earnings_growth": 0.0,
+}
+
+# Below this many (scenario × institution) cells, process start-up costs
+# more than it saves and sweeps run in-process.
+PARALLEL_MIN_CELLS = 5_000_000
+
+def parameter_grid(**axes: Sequence[float]) -> pd.DataFrame:
+    """Cartesian product of the given axes; unspecified parameters keep their defaults.
+
+    >>> parameter_grid(statewide_baseline=[22000, 25000], discount_rate=[0, 0.03])
+    """
+    unknown = set(axes) - set(SWEEP_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    names = list(SWEEP_DEFAULTS)
+    values = [list(axes.get(name, [SWEEP_DEFAULTS[name]])) for name in names]
+    return pd.DataFrame(list(itertools.product(*values)), columns=names, dtype=float)
+
+def average_ranks(values: np.ndarray) -> np.ndarray:
+    """Tie-averaged ranks along the last axis (Spearman convention), NaN stays NaN."""
+    values = np.asarray(values, dtype=float)
+    n_valid = (~np.isnan(values)).sum(axis=-1, keepdims=True)
+    low = rank_min(values)
+    high = n_valid + 1 - rank_min(-values)
+    return (low + high) / 2
+
+def spearman(ranks: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """Spearman correlation of each row of ``ranks`` (S, n) against ``reference`` (n,)."""
+    x = ranks - ranks.mean(axis=-1, keepdims=True)
+    y = reference - reference.mean()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (x @ y) / np.sqrt((x * x).sum(axis=-1) * (y @ y))
+
+def _tied_pairs(ordered: np.ndarray, *more: np.ndarray) -> np.ndarray:
+    """Pairs tied on every given key per row; rows must be sorted so ties are adjacent."""
+    same = np.ones(ordered.shape[:-1] + (ordered.shape[-1] - 1,), dtype=bool)
+    for keys in (ordered, *more):
+        same &= keys[..., 1:] == keys[..., :-1]
+    positions = np.broadcast_to(np.arange(1, ordered.shape[-1]), same.shape)
+    run_start = np.maximum.accumulate(np.where(same, 0, positions), axis=-1)
+    # Each element pairs with the earlier members of its run
+    return np.where(same, positions - run_start, 0).sum(axis=-1)
+
+def _inversions(codes: np.ndarray) -> np.ndarray:
+    """Pairs i < j with codes[i] > codes[j] per row, by bottom-up merge sort over all rows at once.
+
+    ``codes`` are non-negative integers below the row length plus one.
+    """
+    rows, n = codes.shape
+    size = 1 << max(n - 1, 0).bit_length()
+    span = n + 2
+    # Padding sorts after every code, so it adds no inversions
+    run = np.concatenate([codes, np.full((rows, size - n), n + 1)], axis=1).astype(np.int64)
+    inversions = np.zeros(rows, dtype=np.int64)
+    width = 1
+    while width < size:
+        blocks = size // (2 * width)
+        halves = run.reshape(rows * blocks, 2, width)
+        # Offsetting each block makes all left halves one sorted array
+        offset = (np.arange(rows * blocks) * span)[:, None]
+        left = (halves[:, 0] + offset).ravel()
+        right = halves[:, 1] + offset
+        not_greater = np.searchsorted(left, right.ravel(), side="right").reshape(right.shape) - offset // span * width
+        inversions += (width - not_greater).sum(axis=-1).reshape(rows, blocks).sum(axis=-1)
+        run = np.sort(halves.reshape(rows, blocks, 2 * width), axis=-1, kind="stable").reshape(rows, size)
+        width *= 2
+    return inversions
+
+def kendall_tau_b(values: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """Kendall's tau-b of each row of ``values`` (S, n) against ``reference`` (n,).
+
+    Knight's O(n log n) algorithm, vectorized over scenarios: sort each row
+    by (reference, value), count value inversions with a merge sort and
+    correct for ties. Memory is O(S · n). Rows containing NaN give NaN.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    rows, n = values.shape
+    # Integer codes preserve order and ties (rank_min is 1-based)
+    codes = np.nan_to_num(rank_min(values), nan=0).astype(np.int64)
+    ref = np.broadcast_to(rank_min(np.asarray(reference, dtype=float)), values.shape)
+    order = np.lexsort((codes, ref), axis=-1)
+    by_ref = np.take_along_axis(ref, order, axis=-1)
+    codes_by_ref = np.take_along_axis(codes, order, axis=-1)
+
+    pairs = n * (n - 1) // 2
+    ref_ties = _tied_pairs(by_ref[:1])[0]
+    value_ties = _tied_pairs(np.sort(codes, axis=-1))
+    joint_ties = _tied_pairs(by_ref, codes_by_ref)
+    discordant = _inversions(codes_by_ref)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tau = ((pairs - ref_ties - value_ties + joint_ties - 2 * discordant)
+               / np.sqrt((pairs - ref_ties) * (pairs - value_ties).astype(float)))
+    tau[np.isnan(values).any(axis=-1)] = np.nan
+    return tau
+
+def sweep_ranks(inputs: ScoringInputs, grid: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Premiums, payback and ranks for every grid row as (scenario × institution) arrays.
+
+    Payback is discounted (closed form) and equals the simple ROI at zero
+    discount rate and growth; invalid paybacks are NaN and unranked.
+    """
+    col = lambda name: grid[name].to_numpy(dtype=float)[:, None]
+    multiplier = col("length_multiplier")
+    default_length = program_length(inputs.program_years)
+    length = np.where(np.isnan(multiplier), default_length, multiplier)
+    total_cost = inputs.annual_price * length
+    q = (1 + col("earnings_growth")) / (1 + col("discount_rate"))
+
+    baseline = col("statewide_baseline")
+    premium_sw = inputs.earnings - np.where(np.isnan(baseline), statewide_baseline(inputs), baseline)
+    premium_reg = np.broadcast_to(inputs.earnings - inputs.regional_baseline, premium_sw.shape)
+    roi_sw = payback_from_ratio(total_cost, premium_sw, q)
+    roi_reg = payback_from_ratio(total_cost, premium_reg, q)
+    return {
+        "premium_statewide": premium_sw,
+        "roi_statewide_years": roi_sw,
+        "roi_regional_years": roi_reg,
+        "rank_statewide": rank_min(roi_sw),
+        "rank_regional": rank_min(roi_reg),
+    }
+
+def summarize_shard(
+    inputs: ScoringInputs,
+    grid: pd.DataFrame,
+    reference: Dict[str, np.ndarray],
+) -> pd.DataFrame:
+    """Rank-correlation and shift summaries of each grid row against ``reference``.
+
+    For the correlations an institution that never pays back sorts after
+    every valid one (all tied); rank shifts are over institutions valid in
+    both scenarios, and ``validity_flips`` counts those valid in only one.
+    """
+    scored = sweep_ranks(inputs, grid)
+    out = grid.reset_index(drop=True).copy()
+    for name in ("statewide", "regional"):
+        roi = scored[f"roi_{name}_years"]
+        ref_roi = reference[f"roi_{name}_years"]
+        order = average_ranks(np.where(np.isnan(roi), np.inf, roi))
+        ref_order = average_ranks(np.where(np.isnan(ref_roi), np.inf, ref_roi))
+        out[f"spearman_{name}"] = spearman(order, ref_order)
+        out[f"kendall_{name}"] = kendall_tau_b(order, ref_order)
+        shift = np.abs(scored[f"rank_{name}"] - reference[f"rank_{name}"])
+        both = ~np.isnan(shift)
+        with np.errstate(invalid="ignore"):
+            out[f"mean_abs_shift_{name}"] = np.where(both, shift, 0).sum(axis=-1) / both.sum(axis=-1)
+        out[f"max_abs_shift_{name}"] = np.where(both, shift, 0).max(axis=-1, initial=0)
+        out[f"ranks_moved_{name}"] = (np.where(both, shift, 0) > 0).sum(axis=-1)
+        out[f"validity_flips_{name}"] = (np.isnan(roi) != np.isnan(ref_roi)).sum(axis=-1)
+    return out
+
+def _summarize_task(args) -> pd.DataFrame:
+    """Process-pool entry point (must be importable at module level)."""
+    return summarize_shard(*args)
+
+def run_sweep(
+    inputs: ScoringInputs,
+    grid: pd.DataFrame,
+    shard_size: int = 256,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Evaluate every grid row and compare its rankings to the default scenario.
+
+    The grid is cut into shards of ``shard_size`` scenarios; each shard is
+    one vectorized (shard × institution) evaluation. Large grids (see
+    ``PARALLEL_MIN_CELLS``) are spread across a process pool unless
+    ``workers`` is given. Returns one summary row per grid row.
+    """
+    reference = {k: v[0] for k, v in sweep_ranks(inputs, parameter_grid()).items()}
+    shards = [grid.iloc[i:i + shard_size] for i in range(0, len(grid), shard_size)]
+    tasks = [(inputs, shard, reference) for shard in shards]
+
+    if workers is None:
+        large = len(grid) * len(inputs.earnings) >= PARALLEL_MIN_CELLS
+        workers = (os.cpu_count() or 1) if large else 1
+    workers = min(workers, len(tasks))
+    if workers > 1:
+        # spawn, not fork: the Streamlit server process is multi-threaded
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            results = list(pool.map(_summarize_task, tasks))
+    else:
+        results = [_summarize_task(task) for task in tasks]
+    if not results:
+        return summarize_shard(inputs, grid, reference)
+    return pd.concat(results, ignore_index=True)
+
+@cache_lookup("rank_stability")
+@st.cache_data(show_spinner=False)
+@cache_miss("rank_stability")
+def rank_stability(
+    version: Optional[str],
+    axes: Tuple[Tuple[str, Tuple[float, ...]], ...],
+    _df: pd.DataFrame,
+    _workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Cached sweep over ``axes`` (hashable ((name, values), ...) pairs) for the dataset."""
+    return run_sweep(get_scoring_inputs(_df), parameter_grid(**dict(axes)), workers=_workers)
@@ -0,0 +1,213 @@
+# lib/uncertainty.py
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import Optional, Tuple
+
+from .baselines import encode_keys
+from .hs_baseline import DESIGN_EFFECT, INCOME_DISPERSION, county_median_se, resample_weighted_means
+from .metrics import cache_lookup, cache_miss
+from .scoring import ScoringInputs, program_length, rank_min, roi_years, statewide_baseline
+
+# Below this many (draw × institution) cells, process start-up costs more
+# than it saves and simulations run in-process.
+PARALLEL_MIN_CELLS = 5_000_000
+
+@dataclass(frozen=True)
+class SimulationParams:
+    """Monte Carlo settings. Results depend only on these, not on worker count."""
+    n_draws: int = 2000
+    seed: int = 0
+    batch_size: int = 250
+    income_dispersion: float = INCOME_DISPERSION
+    design_effect: float = DESIGN_EFFECT
+    # Relative standard error of Scorecard median earnings
+    earnings_rel_se: float = 0.05
+    # None uses each row's credential length (see lib/cost_model.py)
+    length_multiplier: Optional[float] = None
+    confidence: float = 0.90
+
+@dataclass(frozen=True)
+class SimulationInputs:
+    """Arrays the simulation draws from; institutions (n) and counties (c)."""
+    earnings: np.ndarray
+    annual_price: np.ndarray
+    regional_baseline: np.ndarray
+    statewide_baseline: np.ndarray
+    county_idx: np.ndarray  # (n,) index into the county arrays, -1 if unmatched
+    county_median: np.ndarray
+    county_n: np.ndarray
+    county_weight: np.ndarray
+    county_state: np.ndarray  # (c,) state code of each county, 0..states-1
+    program_years: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "SimulationInputs":
+        """Arrays from a scored frame; counties come from its registry baseline columns.
+
+        Each distinct (STATEFIP, COUNTYFIP) with an ``hs_baseline_median``
+        becomes one county, carrying the row's ``hs_baseline_n`` and
+        ``hs_baseline_weight``. Frames without registry columns simulate
+        earnings only.
+        """
+        scoring = ScoringInputs.from_frame(df)
+        n = len(df)
+        county_idx = np.full(n, -1, dtype=np.intp)
+        rows = np.empty(0, dtype=np.intp)
+        state = np.empty(0, dtype=np.int64)
+        if {"STATEFIP", "COUNTYFIP", "hs_baseline_median"} <= set(df.columns):
+            known = np.flatnonzero(~np.isnan(df["hs_baseline_median"].to_numpy(dtype=float)))
+            state = pd.to_numeric(df["STATEFIP"]).to_numpy(dtype=float)[known].astype(np.int64)
+            county = pd.to_numeric(df["COUNTYFIP"]).to_numpy(dtype=float)[known].astype(np.int64)
+            _, first, inverse = np.unique(encode_keys(state, county, 0, 0), return_index=True, return_inverse=True)
+            county_idx[known] = inverse
+            rows, state = known[first], state[first]
+
+        def county_values(col: str) -> np.ndarray:
+            return df[col].to_numpy(dtype=float)[rows] if len(rows) else np.empty(0)
+
+        return cls(
+            earnings=scoring.earnings,
+            annual_price=scoring.annual_price,
+            regional_baseline=scoring.regional_baseline,
+            statewide_baseline=np.broadcast_to(statewide_baseline(scoring), n).astype(float),
+            county_idx=county_idx,
+            county_median=county_values("hs_baseline_median"),
+            county_n=county_values("hs_baseline_n"),
+            county_weight=county_values("hs_baseline_weight"),
+            county_state=np.unique(state, return_inverse=True)[1].reshape(-1),
+            program_years=scoring.program_years,
+        )
+
+def _compact_ranks(ranks: np.ndarray) -> np.ndarray:
+    """(draws, n) int32 ranks with 0 for draws where the institution has no rank."""
+    return np.nan_to_num(ranks, nan=0).astype(np.int32)
+
+def simulate_batch(
+    inputs: SimulationInputs,
+    params: SimulationParams,
+    seed: np.random.SeedSequence,
+    size: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw ``size`` scenarios at once and return their statewide/regional ranks.
+
+    County medians are drawn from their sampling distribution (SE scaled by
+    N_unweighted). Each state's baseline is its published value scaled by a
+    bootstrap replicate of the weight_sum-weighted mean over that state's
+    drawn county medians (see ``hs_baseline.resample_weighted_means``),
+    relative to the undrawn mean, so both baselines stay consistent.
+    Institutions without a county estimate keep their published baselines.
+    Ranks come back as (size, n) int32 arrays (see ``_compact_ranks``), so a
+    batch costs O(size * n) memory and IPC.
+    """
+    rng = np.random.default_rng(seed)
+    se = county_median_se(inputs.county_median, inputs.county_n, params.income_dispersion, params.design_effect)
+    county = inputs.county_median + se * rng.standard_normal((size, len(inputs.county_median)))
+    states = int(inputs.county_state.max()) + 1 if len(inputs.county_state) else 0
+    scale = np.empty((size, states))
+    for code in range(states):
+        members = inputs.county_state == code
+        weights = inputs.county_weight[members]
+        point = np.average(inputs.county_median[members], weights=weights)
+        scale[:, code] = resample_weighted_means(rng, county[:, members], weights, size) / point
+
+    matched = inputs.county_idx >= 0
+    county_of = np.where(matched, inputs.county_idx, 0)
+    regional = np.where(matched, county[:, county_of], inputs.regional_baseline)
+    state_scale = scale[:, inputs.county_state[county_of]] if states else 1.0
+    statewide = np.where(matched, inputs.statewide_baseline * state_scale, inputs.statewide_baseline)
+    earnings = inputs.earnings * (1 + params.earnings_rel_se * rng.standard_normal((size, len(inputs.earnings))))
+
+    total_cost = inputs.annual_price * program_length(inputs.program_years, params.length_multiplier)
+    rank_sw = rank_min(roi_years(total_cost, earnings - statewide))
+    rank_reg = rank_min(roi_years(total_cost, earnings - regional))
+    return _compact_ranks(rank_sw), _compact_ranks(rank_reg)
+
+def _simulate_task(args) -> Tuple[np.ndarray, np.ndarray]:
+    """Process-pool entry point (must be importable at module level)."""
+    return simulate_batch(*args)
+
+def _rank_quantiles(ordered: np.ndarray, q: float) -> np.ndarray:
+    """Per-institution rank at cumulative probability ``q`` (inverted CDF).
+
+    ``ordered`` holds each institution's draws sorted along axis 0, with
+    unranked draws (0) first; institutions never ranked get NaN.
+    """
+    draws = len(ordered)
+    missing = (ordered == 0).sum(axis=0)
+    ranked = draws - missing
+    # Smallest rank whose share of the ranked draws reaches q
+    k = np.maximum(np.ceil(ranked * (q - 1e-12)).astype(np.int64), 1)
+    rows = np.minimum(missing + k - 1, draws - 1)
+    ranks = ordered[rows, np.arange(ordered.shape[1])].astype(float)
+    ranks[ranked == 0] = np.nan
+    return ranks
+
+def run_simulation(
+    inputs: SimulationInputs,
+    params: SimulationParams = SimulationParams(),
+    workers: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Run all batches and stack their ranks.
+
+    Large simulations (see ``PARALLEL_MIN_CELLS``) are spread across a
+    process pool unless ``workers`` is given. Returns statewide and regional
+    (n_draws, n) int32 rank arrays. Batches get independent child seeds
+    spawned from ``params.seed``, so the result is identical for any worker
+    count.
+    """
+    sizes = [params.batch_size] * (params.n_draws // params.batch_size)
+    if params.n_draws % params.batch_size:
+        sizes.append(params.n_draws % params.batch_size)
+    seeds = np.random.SeedSequence(params.seed).spawn(len(sizes))
+    tasks = [(inputs, params, seed, size) for seed, size in zip(seeds, sizes)]
+
+    n = len(inputs.earnings)
+    ranks_sw = np.empty((params.n_draws, n), dtype=np.int32)
+    ranks_reg = np.empty((params.n_draws, n), dtype=np.int32)
+    starts = np.cumsum([0, *sizes])
+
+    if workers is None:
+        large = params.n_draws * n >= PARALLEL_MIN_CELLS
+        workers = (os.cpu_count() or 1) if large else 1
+    workers = min(workers, len(tasks))
+    if workers > 1:
+        # spawn, not fork: the Streamlit server process is multi-threaded
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            results = pool.map(_simulate_task, tasks)
+            for start, (sw, reg) in zip(starts, results):
+                ranks_sw[start:start + len(sw)], ranks_reg[start:start + len(reg)] = sw, reg
+    else:
+        for start, task in zip(starts, tasks):
+            sw, reg = _simulate_task(task)
+            ranks_sw[start:start + len(sw)], ranks_reg[start:start + len(reg)] = sw, reg
+    return ranks_sw, ranks_reg
+
+def rank_intervals(df: pd.DataFrame, ranks_sw: np.ndarray, ranks_reg: np.ndarray, confidence: float) -> pd.DataFrame:
+    """Median rank and central confidence interval per institution."""
+    alpha = (1 - confidence) / 2
+    out = df[["Institution", "Region", "Sector", "rank_statewide", "rank_regional"]].reset_index(drop=True).copy()
+    for name, ranks in (("statewide", ranks_sw), ("regional", ranks_reg)):
+        ordered = np.sort(ranks, axis=0)
+        out[f"{name}_rank_low"] = _rank_quantiles(ordered, alpha)
+        out[f"{name}_rank_median"] = _rank_quantiles(ordered, 0.5)
+        out[f"{name}_rank_high"] = _rank_quantiles(ordered, 1 - alpha)
+    return out
+
+@cache_lookup("rank_intervals")
+@st.cache_data(show_spinner=False)
+@cache_miss("rank_intervals")
+def simulate_rank_intervals(
+    version: Optional[str],
+    params: SimulationParams,
+    _df: pd.DataFrame,
+    _workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Rank confidence intervals per institution, cached by dataset version, seed and parameters."""
+    inputs = SimulationInputs.from_frame(_df)
+    ranks_sw, ranks_reg = run_simulation(inputs, params, _workers)
+    return rank_intervals(_df, ranks_sw, ranks_reg, params.confidence)
@@ -1,11 +1,16 @@
 # lib/utils.py
 import pandas as pd
 import numpy as np
-from typing import Optional, Union, List
+from typing import Any, Dict, Optional, Sequence, Union, List
 import logging
 
+from .quality import quality_report
+
 logger = logging.getLogger(__name__)
 
+# Checks reported by Validators.validate_roi_data, in its original order
+ROI_DATA_CHECKS = ("negative_earnings", "extreme_roi_statewide_years", "extreme_roi_regional_years")
+
 class DataCleaner:
     """Utilities for data cleaning and validation."""
     
@@ -33,36 +38,58 @@ class DataCleaner:
     def impute_zero_prices(
         df: pd.DataFrame,
         price_col: str = 'total_net_price',
-        method: str = 'median_by_sector'
+        method: str = 'median_by_sector',
+        group_cols: Optional[Sequence[str]] = None,
+        flag_col: Optional[str] = 'price_imputed',
     ) -> pd.DataFrame:
-        """Impute zero or missing net prices."""
+        """Impute zero or missing net prices with group medians.
+
+        ``method`` picks the grouping: ``'median_by_sector'`` (Sector),
+        ``'overall_median'`` (none) or ``'median_by_group'`` (``group_cols``,
+        e.g. ``['Sector', 'Predominant Award', 'Region']``). Each level is one
+        groupby-transform over the observed prices; rows whose group has no
+        observed price fall back to successively coarser prefixes of the keys
+        and finally the overall median. Imputed rows are marked in
+        ``flag_col`` (skipped if None).
+        """
         if price_col not in df.columns:
             return df
         
-        mask = (df[price_col] == 0) | df[price_col].isna()
+        if method == 'median_by_sector':
+            keys = ['Sector']
+        elif method == 'overall_median':
+            keys = []
+        elif method == 'median_by_group':
+            keys = list(group_cols or [])
+        else:
+            raise ValueError(f"Unknown imputation method '{method}'")
+        keys = [k for k in keys if k in df.columns]
         
+        price = pd.to_numeric(df[price_col], errors='coerce')
+        mask = price.eq(0) | price.isna()
+        if flag_col is not None:
+            df[flag_col] = False
         if not mask.any():
             return df
         
-        logger.info(f"Imputing {mask.sum()} zero/missing prices using {method}")
-        
-        if method == 'median_by_sector':
-            # Impute by sector median
-            for sector in df['Sector'].unique():
-                sector_mask = (df['Sector'] == sector) & mask
-                if sector_mask.any():
-                    sector_median = df[
-                        (df['Sector'] == sector) & ~mask
-                    ][price_col].median()
-                    
-                    if pd.notna(sector_median):
-                        df.loc[sector_mask, price_col] = sector_median
+        logger.info(f"Imputing {mask.sum()} zero/missing prices using {method} {keys}")
         
-        elif method == 'overall_median':
-            # Simple overall median
-            median_price = df[~mask][price_col].median()
-            df.loc[mask, price_col] = median_price
+        observed = price.mask(mask)
+        imputed = pd.Series(np.nan, index=df.index)
+        for level in range(len(keys), -1, -1):
+            todo = mask & imputed.isna()
+            if not todo.any():
+                break
+            if level:
+                medians = observed.groupby([df[k] for k in keys[:level]], dropna=False).transform('median')
+            else:
+                medians = pd.Series(observed.median(), index=df.index)
+            imputed = imputed.where(~todo, medians)
         
+        filled = mask & imputed.notna()
+        df[price_col] = price.where(~filled, imputed)
+        if flag_col is not None:
+            df[flag_col] = filled.to_numpy()
         return df
 
 class Formatters:
@@ -115,31 +142,14 @@ class Validators:
     
     @staticmethod
     def validate_roi_data(df: pd.DataFrame) -> Dict[str, Any]:
-        """Validate ROI data quality."""
-        issues = {}
-        
-        # Check for negative earnings
-        if 'median_earnings_10yr' in df.columns:
-            neg_earnings = (df['median_earnings_10yr'] < 0).sum()
-            if neg_earnings > 0:
-                issues['negative_earnings'] = neg_earnings
-        
-        # Check for extreme ROI values
-        roi_cols = ['roi_statewide_years', 'roi_regional_years']
-        for col in roi_cols:
-            if col in df.columns:
-                extreme = ((df[col] < -10) | (df[col] > 100)).sum()
-                if extreme > 0:
-                    issues[f'extreme_{col}'] = extreme
-        
-        # Check data completeness
-        completeness = {}
-        for col in df.columns:
-            missing_pct = df[col].isna().mean()
-            if missing_pct > 0.1:  # More than 10% missing
-                completeness[col] = f"{missing_pct:.1%}"
-        
-        if completeness:
-            issues['high_missing_data'] = completeness
-        
-        return issues
\ No newline at end of file
+        """Validate ROI data quality.
+
+        Counts come from ``lib.quality.quality_report``; only the checks this
+        method has always reported are returned (the full report, with price
+        and payback checks, is ``get_quality_report``).
+        """
+        report = quality_report(df)
+        issues = {name: report.checks[name] for name in ROI_DATA_CHECKS if report.checks.get(name, 0) > 0}
+        if not report.high_missing.empty:
+            issues['high_missing_data'] = {col: f"{share:.1%}" for col, share in report.high_missing.items()}
+        return issues
@@ -0,0 +1,23 @@
+# tests/conftest.py
+import inspect
+import os
+
+import pytest
+import streamlit.logger
+
+# Cached loaders run outside a Streamlit runtime here; keep their warnings quiet
+streamlit.logger.set_log_level("error")
+# Every test prepares its data from scratch, not from the stage cache on disk
+os.environ.setdefault("EPANALYSIS_PIPELINE_CACHE", "off")
+
+from benchmarks.run import ALL_AWARDS
+from benchmarks.synthetic import write_synthetic
+from lib.data import load_roi_metrics_dataset
+
+SYNTHETIC_ROWS = 200
+
+@pytest.fixture(scope="session")
+def dataset(tmp_path_factory):
+    """A small synthetic dataset prepared by the real loader (versioned, with baselines)."""
+    roi_path, inst_path = write_synthetic(str(tmp_path_factory.mktemp("data")), SYNTHETIC_ROWS)
+    return inspect.unwrap(load_roi_metrics_dataset)(roi_path, inst_path, ALL_AWARDS)
@@ -0,0 +1,93 @@
+# tests/test_api.py
+import io
+import json
+
+import pandas as pd
+import pytest
+from tornado.testing import AsyncHTTPTestCase
+
+from lib.api import API_PREFIX, DatasetSource, make_app
+from lib.export import export_url, export_view
+from lib.geo import KM_PER_MILE, great_circle_miles
+
+class EtagTest(AsyncHTTPTestCase):
+    @pytest.fixture(autouse=True)
+    def _dataset(self, dataset):
+        self.dataset = dataset
+
+    def get_app(self):
+        return make_app(self.dataset)
+
+    def test_unchanged_data_answers_304(self):
+        uri = f"{API_PREFIX}/rankings/roi_statewide?limit=5&sector=Public"
+        first = self.fetch(uri)
+        assert first.code == 200
+        etag = first.headers["ETag"]
+        assert len(json.loads(first.body)["data"]) <= 5
+
+        again = self.fetch(uri, headers={"If-None-Match": etag})
+        assert again.code == 304
+        assert again.body == b""
+        assert again.headers["ETag"] == etag
+
+    def test_etag_depends_on_uri(self):
+        a = self.fetch(f"{API_PREFIX}/top/premium_statewide?k=3").headers["ETag"]
+        b = self.fetch(f"{API_PREFIX}/top/premium_statewide?k=4").headers["ETag"]
+        assert a != b
+        assert self.fetch(f"{API_PREFIX}/top/premium_statewide?k=4", headers={"If-None-Match": a}).code == 200
+
+    def test_export_answers_304(self):
+        uri = f"{API_PREFIX}/export/roi_statewide.csv"
+        first = self.fetch(uri)
+        assert first.code == 200
+        assert self.fetch(uri, headers={"If-None-Match": first.headers["ETag"]}).code == 304
+
+    def test_export_streams_filtered_view(self):
+        response = self.fetch(f"{API_PREFIX}/export/roi_statewide.csv?sector=Public&sector=Private%20non-profit")
+        assert response.code == 200
+        got = pd.read_csv(io.BytesIO(response.body))
+        expected = export_view(self.dataset, "roi_statewide", sectors=["Public", "Private non-profit"])
+        assert len(got) > 0
+        assert got["OPEID6"].tolist() == expected["OPEID6"].tolist()
+
+    def test_nearby_matches_brute_force_radius(self):
+        lat, lon, radius_km = 37.0, -120.0, 150.0
+        response = self.fetch(f"{API_PREFIX}/nearby?lat={lat}&lon={lon}&radius_km={radius_km}&limit=1000")
+        assert response.code == 200
+        body = json.loads(response.body)
+        km = great_circle_miles(lat, lon, self.dataset["Latitude"], self.dataset["Longitude"]) * KM_PER_MILE
+        expected = set(self.dataset.loc[km <= radius_km, "OPEID6"])
+        assert expected
+        assert {row["OPEID6"] for row in body["data"]} == expected
+        assert body["count"] == len(expected)
+        assert all(row["distance_km"] <= radius_km + 1e-6 for row in body["data"])
+        roi = [row["roi_regional_years"] for row in body["data"] if row["roi_regional_years"] is not None]
+        assert roi == sorted(roi)
+
+    def test_nearby_validates_arguments(self):
+        assert self.fetch(f"{API_PREFIX}/nearby?lat=37").code == 400
+        assert self.fetch(f"{API_PREFIX}/nearby?lat=91&lon=0").code == 400
+        assert self.fetch(f"{API_PREFIX}/nearby?lat=37&lon=x").code == 400
+
+def test_export_url_follows_api_env(monkeypatch):
+    monkeypatch.delenv("EPANALYSIS_API_URL", raising=False)
+    assert export_url("roi_statewide", "csv") is None
+    monkeypatch.setenv("EPANALYSIS_API_URL", "http://api:8601/")
+    assert export_url("roi_statewide", "parquet", sectors=["Public"]) == (
+        "http://api:8601/api/v1/export/roi_statewide.parquet?sector=Public"
+    )
+
+def test_new_version_gets_new_etags_and_empty_cache(dataset):
+    current = {"df": dataset}
+    source = DatasetSource(lambda: current["df"])
+    old = source.current()
+    old.store("/api/v1/meta", b"{}")
+    assert source.current() is old
+
+    republished = dataset.copy()
+    republished.attrs = {**dataset.attrs, "dataset_version": "next"}
+    current["df"] = republished
+    new = source.current()
+    assert new is not old and new.version == "next"
+    assert new.cached("/api/v1/meta") is None
+    assert new.etag("/api/v1/meta") != old.etag("/api/v1/meta")
@@ -0,0 +1,49 @@
+# tests/test_benchmarks.py
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks.run import compare
+from benchmarks.synthetic import INSTITUTION_COLS, ROI_METRICS_COLS, synthetic_frames
+from lib.scoring import ScoringInputs, score_arrays
+
+def test_synthetic_frames_schema_and_consistency():
+    roi, institutions = synthetic_frames(50, seed=3)
+    assert list(roi.columns) == ROI_METRICS_COLS
+    assert list(institutions.columns) == INSTITUTION_COLS
+    assert len(roi) == len(institutions) == 50
+    assert roi["Institution"].is_unique
+    assert (roi["Institution"].to_numpy() == institutions["Institution"].to_numpy()).all()
+
+    # The precomputed columns are what the scoring kernel gives for the same inputs
+    scores = score_arrays(ScoringInputs(
+        earnings=roi["median_earnings_10yr"].to_numpy(dtype=float),
+        annual_price=roi["total_net_price"].to_numpy(dtype=float),
+        regional_baseline=roi["hs_median_income"].to_numpy(dtype=float),
+    ))
+    for col in ("roi_statewide_years", "roi_regional_years", "rank_statewide", "rank_regional"):
+        np.testing.assert_array_equal(roi[col].to_numpy(dtype=float), scores[col])
+
+def test_synthetic_frames_are_seeded():
+    a, _ = synthetic_frames(20, seed=1)
+    b, _ = synthetic_frames(20, seed=1)
+    c, _ = synthetic_frames(20, seed=2)
+    assert a.equals(b)
+    assert not a.equals(c)
+
+def write_results(path, medians):
+    results = [{"case": case, "rows": rows, "median_s": s} for (case, rows), s in medians.items()]
+    path.write_text(json.dumps({"meta": {}, "results": results}))
+    return str(path)
+
+@pytest.mark.parametrize("new_seconds, expected", [(0.011, 0), (0.013, 1)])
+def test_compare_flags_regressions(tmp_path, capsys, new_seconds, expected):
+    base = write_results(tmp_path / "base.json", {("score_arrays", 1000): 0.010, ("only_base", 1000): 0.5})
+    new = write_results(tmp_path / "new.json", {("score_arrays", 1000): new_seconds, ("only_new", 1000): 0.5})
+    assert compare(base, new, threshold=1.2) == expected
+    out = capsys.readouterr().out
+    assert "score_arrays" in out
+    assert ("SLOWER" in out) == bool(expected)
+    # Cases present in only one file are skipped
+    assert "only_base" not in out and "only_new" not in out
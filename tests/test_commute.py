@@ -0,0 +1,71 @@
+# tests/test_commute.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from lib.baselines import BaselineRegistry
+from lib.commute import CommuteZoneParams, build_commute_model, build_commute_weights
+from lib.geo import great_circle_miles
+
+@pytest.fixture
+def counties():
+    rng = np.random.default_rng(1)
+    c = 12
+    county_df = pd.DataFrame({
+        # Two states reusing the same county codes
+        "STATEFIP": np.repeat([6, 32], c // 2),
+        "COUNTYFIP": np.tile(np.arange(1, c // 2 * 2, 2), 2),
+        "hs_median_income": rng.uniform(18_000, 32_000, c),
+        "N_unweighted": rng.integers(50, 2000, c).astype(float),
+        "weight_sum": rng.uniform(1_000, 50_000, c),
+    })
+    centroids = county_df[["STATEFIP", "COUNTYFIP"]].assign(
+        Latitude=rng.uniform(33.0, 41.0, c), Longitude=rng.uniform(-123.0, -115.0, c)
+    )
+    # One county without a centroid
+    return county_df, centroids.drop(index=3)
+
+def dense_weights(lat, lon, own_col, county_df, centroids, params):
+    located = centroids.set_index(["STATEFIP", "COUNTYFIP"]).reindex(
+        pd.MultiIndex.from_frame(county_df[["STATEFIP", "COUNTYFIP"]]))
+    dist = great_circle_miles(lat[:, None], lon[:, None], located["Latitude"].to_numpy()[None, :],
+                              located["Longitude"].to_numpy()[None, :])
+    use = dist <= params.radius_miles
+    for i, col in enumerate(own_col):
+        if col >= 0:
+            use[i, col] = True
+            dist[i, col] = np.nan_to_num(dist[i, col])
+        elif not use[i].any() and not np.isnan(lat[i]):
+            use[i, np.nanargmin(dist[i])] = True
+    w = np.where(use, county_df["weight_sum"].to_numpy() * np.exp(-np.nan_to_num(dist) / params.bandwidth_miles), 0)
+    # Rows with neither coordinates nor an own county stay all-NaN
+    with np.errstate(invalid="ignore"):
+        return w / w.sum(axis=1, keepdims=True)
+
+def test_sparse_weights_match_dense(counties):
+    county_df, centroids = counties
+    rng = np.random.default_rng(2)
+    n = 150
+    lat, lon = rng.uniform(32.5, 42.0, n), rng.uniform(-124.2, -114.1, n)
+    lat[::29] = np.nan
+    own_col = rng.integers(-1, len(county_df), n)
+    params = CommuteZoneParams(radius_miles=60.0)
+    weights = build_commute_weights(lat, lon, own_col, county_df, centroids, params)
+
+    dense = np.zeros((n, len(county_df)))
+    for i in range(n):
+        span = slice(weights.indptr[i], weights.indptr[i + 1])
+        dense[i, weights.indices[span]] = weights.data[span]
+    expected = dense_weights(lat, lon, own_col, county_df, centroids, params)
+    np.testing.assert_allclose(dense, np.nan_to_num(expected), atol=1e-12)
+    x = county_df["hs_median_income"].to_numpy()
+    np.testing.assert_allclose(weights.matvec(x), expected @ x, atol=1e-6)
+
+def test_zones_are_keyed_by_state_and_county(counties):
+    county_df, _ = counties
+    registry = BaselineRegistry.empty().add_county_table(county_df)
+    # Same COUNTYFIP, different states, no coordinates: each keeps its own county's baseline
+    df = pd.DataFrame({"STATEFIP": [6, 32], "COUNTYFIP": [1, 1], "Latitude": np.nan, "Longitude": np.nan})
+    model = build_commute_model(df, registry=registry)
+    expected = county_df.set_index(["STATEFIP", "COUNTYFIP"]).loc[[(6, 1), (32, 1)], "hs_median_income"]
+    np.testing.assert_allclose(model.baselines(), expected.to_numpy())
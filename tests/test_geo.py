@@ -0,0 +1,44 @@
+# tests/test_geo.py
+import numpy as np
+import pytest
+
+from lib.geo import SpatialIndex, great_circle_miles
+
+@pytest.fixture
+def coords():
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(32.5, 42.0, 300)
+    lon = rng.uniform(-124.2, -114.1, 300)
+    # Rows without coordinates are left out of the index
+    lat[::37] = np.nan
+    return lat, lon
+
+QUERIES = [(34.05, -118.24), (37.77, -122.42), (40.8, -124.1)]
+
+@pytest.mark.parametrize("radius", [1.0, 25.0, 150.0, 1000.0])
+def test_query_radius_matches_brute_force(coords, radius):
+    lat, lon = coords
+    index = SpatialIndex(lat, lon, leaf_size=4)
+    for q_lat, q_lon in QUERIES + [(lat[1], lon[1])]:
+        rows, miles = index.query_radius(q_lat, q_lon, radius)
+        dist = great_circle_miles(q_lat, q_lon, lat, lon)
+        assert sorted(rows) == sorted(np.flatnonzero(dist <= radius))
+        np.testing.assert_allclose(miles, dist[rows], atol=1e-6)
+        assert np.all(np.diff(miles) >= 0)
+
+@pytest.mark.parametrize("k", [1, 5, 40, 500])
+def test_query_nearest_matches_brute_force(coords, k):
+    lat, lon = coords
+    index = SpatialIndex(lat, lon, leaf_size=4)
+    for q_lat, q_lon in QUERIES:
+        rows, miles = index.query_nearest(q_lat, q_lon, k)
+        dist = great_circle_miles(q_lat, q_lon, lat, lon)
+        expected = np.argsort(dist)[:min(k, len(index))]
+        np.testing.assert_array_equal(rows, expected)
+        np.testing.assert_allclose(miles, dist[expected], atol=1e-6)
+
+def test_empty_index():
+    index = SpatialIndex(np.array([np.nan]), np.array([np.nan]))
+    assert len(index) == 0
+    assert len(index.query_radius(34.0, -118.0, 50)[0]) == 0
+    assert len(index.query_nearest(34.0, -118.0, 3)[0]) == 0
@@ -0,0 +1,63 @@
+# tests/test_panel.py
+import numpy as np
+import pandas as pd
+
+from lib.panel import DELTA_COLS, PANEL_KEY, RANK_COLS, PanelStore, institution_history, publish_cohort, yoy_deltas
+
+def cohort(dataset: pd.DataFrame, year: int) -> pd.DataFrame:
+    """The dataset relabelled as ``year``, with earnings and prices moved per year."""
+    shift = year - 2020
+    out = dataset.assign(
+        median_earnings_10yr=dataset["median_earnings_10yr"] + 1_000 * shift,
+        annual_net_price=dataset["annual_net_price"] + 100 * shift,
+    )
+    out.attrs = {**dataset.attrs, "dataset_version": f"v{year}"}
+    return out
+
+def test_write_year_round_trip(dataset, tmp_path):
+    store = PanelStore(str(tmp_path))
+    assert store.years() == [] and store.version(2021) is None
+    store.write_year(cohort(dataset, 2022), 2022)
+    store.write_year(cohort(dataset, 2021), 2021)
+    assert store.years() == [2021, 2022]
+    assert store.version(2022) == "v2022"
+
+    panel = store.read(years=[2022], columns=["median_earnings_10yr"])
+    assert set(panel["year"]) == {2022} and list(panel.columns) == ["year", "median_earnings_10yr"]
+    # Rewriting a year replaces its partition
+    store.write_year(cohort(dataset, 2023), 2022)
+    assert store.version(2022) == "v2023"
+    assert len(store.read(years=[2022])) == len(dataset)
+
+def test_yoy_deltas_match_per_institution_diff():
+    rng = np.random.default_rng(0)
+    rows = [(key, year) for key in range(30) for year in range(2018, 2024) if rng.random() < 0.7]
+    panel = pd.DataFrame(rows, columns=[PANEL_KEY, "year"]).sample(frac=1, random_state=1)
+    for col in DELTA_COLS + RANK_COLS:
+        panel[col] = rng.normal(size=len(panel)).round(2)
+
+    out = yoy_deltas(panel)
+    for key, group in out.groupby(PANEL_KEY):
+        for col in DELTA_COLS:
+            np.testing.assert_allclose(group[f"{col}_yoy"], group[col].diff(), equal_nan=True)
+        for col in RANK_COLS:
+            np.testing.assert_allclose(group[f"{col}_yoy"], -group[col].diff(), equal_nan=True)
+
+def test_institution_history_follows_published_cohorts(dataset, tmp_path, monkeypatch):
+    root = str(tmp_path)
+    key = int(dataset[PANEL_KEY].iloc[0])
+    monkeypatch.delenv("EPANALYSIS_COHORT_YEAR", raising=False)
+    assert publish_cohort(cohort(dataset, 2021), root=root) is None
+
+    monkeypatch.setenv("EPANALYSIS_COHORT_YEAR", "2021")
+    assert publish_cohort(cohort(dataset, 2021), root=root) is not None
+    # Same version again: the partition is left alone
+    assert publish_cohort(cohort(dataset, 2021), root=root) is None
+    assert len(institution_history(key, root=root)) == 1
+
+    publish_cohort(cohort(dataset, 2022), 2022, root=root)
+    history = institution_history(key, root=root)
+    assert history["year"].tolist() == [2021, 2022]
+    assert np.isnan(history["median_earnings_10yr_yoy"].iloc[0])
+    assert history["median_earnings_10yr_yoy"].iloc[1] == 1_000
+    assert history["annual_net_price_yoy"].iloc[1] == 100
@@ -0,0 +1,85 @@
+# tests/test_programs.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from lib.programs import (
+    CREDENTIAL_LEVELS, ProgramInputs, aggregate_programs, credential_lengths, get_program_scores,
+    group_rank_min, score_programs,
+)
+
+@pytest.fixture(scope="module")
+def program_file(dataset, tmp_path_factory):
+    """Field-of-study rows for the dataset's institutions, plus one unknown institution."""
+    rng = np.random.default_rng(4)
+    opeid6 = np.append(rng.choice(dataset["OPEID6"].to_numpy(), 600), 999_999)
+    n = len(opeid6)
+    earnings = rng.normal(38_000, 12_000, n).round().astype(object)
+    earnings[::17] = "PrivacySuppressed"
+    programs = pd.DataFrame({
+        "OPEID6": opeid6,
+        "CIPCODE": rng.choice([1101, 1201, 5138, 5204], n),
+        "CREDLEV": rng.choice([1, 2, 3], n),
+        "CIPDESC": "Program",
+        "EARN_MDN_4YR": earnings,
+        "IPEDSCOUNT2": rng.integers(1, 200, n),
+    })
+    path = tmp_path_factory.mktemp("programs") / "field-of-study.csv"
+    programs.to_csv(path, index=False)
+    return str(path)
+
+def test_programs_score_against_their_institution(dataset, program_file):
+    scored = get_program_scores(dataset, program_file)
+    programs = pd.read_csv(program_file, na_values=["PrivacySuppressed"])
+    assert len(scored) == len(programs)
+    inst = dataset.drop_duplicates("OPEID6").set_index("OPEID6").reindex(scored["OPEID6"])
+    years = scored["CREDLEV"].map(credential_lengths()).to_numpy()
+    np.testing.assert_allclose(scored["total_cost"], inst["annual_net_price"].to_numpy() * years)
+    # Baselines are the registry columns the institution was scored with
+    np.testing.assert_allclose(scored["premium_statewide"],
+                               programs["EARN_MDN_4YR"] - inst["hs_statewide_median"].to_numpy())
+    regional = inst["hs_baseline_median"].fillna(inst["hs_median_income"]).to_numpy()
+    np.testing.assert_allclose(scored["premium_regional"], programs["EARN_MDN_4YR"] - regional)
+
+    valid = scored["roi_regional_valid"].to_numpy()
+    expected = scored["total_cost"] / scored["premium_regional"]
+    np.testing.assert_allclose(scored.loc[valid, "roi_regional_years"], expected[valid])
+    assert not scored.loc[scored["OPEID6"] == 999_999, "roi_regional_valid"].any()
+    assert np.isnan(scored.loc[~valid, "roi_regional_years"]).all()
+
+def test_peer_ranks_match_groupby_rank(dataset, program_file):
+    scored = get_program_scores(dataset, program_file)
+    expected = scored.groupby(["CIPCODE", "CREDLEV"])["roi_regional_years"].rank(method="min")
+    np.testing.assert_array_equal(scored["peer_rank_regional"], expected)
+
+def test_group_rank_min_handles_ties_and_nan():
+    values = np.array([3.0, 1.0, np.nan, 1.0, 2.0, 5.0])
+    groups = np.array([0, 0, 0, 0, 1, 1])
+    np.testing.assert_array_equal(group_rank_min(values, groups), [3.0, 1.0, np.nan, 1.0, 1.0, 2.0])
+
+@pytest.mark.parametrize("level", ["institution", "credential"])
+def test_aggregation_matches_groupby(dataset, program_file, level):
+    scored = get_program_scores(dataset, program_file)
+    rolled = aggregate_programs(scored, level)
+    keys = ["OPEID6", "CREDLEV"] if level == "credential" else ["OPEID6"]
+    for values, group in scored.groupby(keys):
+        row = rolled.set_index(keys).loc[values]
+        has = group["median_earnings"].notna()
+        assert row["n_programs"] == len(group)
+        if has.any():
+            expected = np.average(group.loc[has, "median_earnings"], weights=group.loc[has, "weight"])
+            assert row["median_earnings"] == pytest.approx(expected)
+        share = np.average(group["roi_statewide_valid"], weights=group["weight"])
+        assert row["valid_roi_share"] == pytest.approx(share)
+        paying = group.loc[group["roi_statewide_valid"], "roi_statewide_years"]
+        assert row["median_roi_statewide_years"] == pytest.approx(paying.median(), nan_ok=True)
+
+def test_missing_program_file_scores_nothing(dataset, tmp_path):
+    scored = get_program_scores(dataset, str(tmp_path / "absent.csv"))
+    assert scored.empty and "roi_regional_years" in scored.columns
+
+def test_statewide_override(dataset):
+    programs = pd.DataFrame({"OPEID6": dataset["OPEID6"].iloc[:3], "CIPCODE": 1101,
+                             "CREDLEV": min(CREDENTIAL_LEVELS), "EARN_MDN_4YR": 40_000.0})
+    scored = score_programs(ProgramInputs.from_frames(programs, dataset), statewide_baseline=30_000.0)
+    np.testing.assert_allclose(scored["premium_statewide"], 10_000.0)
@@ -0,0 +1,87 @@
+# tests/test_scoring.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from lib.scoring import (
+    STATEWIDE_HS_BASELINE, DiscountParams, ScoringInputs, discounted_payback_years, npv, rank_min,
+    roi_with_mask, score_arrays, statewide_baseline_label,
+)
+
+def discounted_stream(premium: float, discount: DiscountParams, years: int) -> np.ndarray:
+    """Cumulative present value of the premium after each of ``years`` years, summed term by term."""
+    q = (1 + discount.earnings_growth) / (1 + discount.discount_rate)
+    return np.cumsum([premium * q ** t for t in range(1, years + 1)])
+
+DISCOUNTS = [
+    DiscountParams(discount_rate=0.03),
+    DiscountParams(discount_rate=0.07, earnings_growth=0.02, npv_horizon_years=30),
+    DiscountParams(discount_rate=0.03, earnings_growth=0.03),
+    DiscountParams(discount_rate=0.01, earnings_growth=0.04, npv_horizon_years=10),
+]
+COSTS = np.array([0.0, 500.0, 8_000.0, 30_000.0, 120_000.0, 9_000.0, 5_000.0])
+PREMIUMS = np.array([4_000.0, 4_000.0, 4_000.0, 2_500.0, 3_000.0, 0.0, -1_500.0])
+
+@pytest.mark.parametrize("discount", DISCOUNTS)
+def test_discounted_payback_matches_year_by_year_sum(discount):
+    payback = discounted_payback_years(COSTS, PREMIUMS, discount)
+    for cost, premium, years in zip(COSTS, PREMIUMS, payback):
+        stream = discounted_stream(premium, discount, 500)
+        repaid = np.flatnonzero(stream >= cost - 1e-9)
+        if premium <= 0 or not len(repaid):
+            assert np.isnan(years)
+            continue
+        # The continuous payback falls within the first year whose running total covers the cost
+        first_year = repaid[0] + 1
+        assert first_year - 1 - 1e-9 <= years <= first_year + 1e-9
+
+@pytest.mark.parametrize("discount", DISCOUNTS)
+def test_npv_matches_year_by_year_sum(discount):
+    expected = [discounted_stream(p, discount, int(discount.npv_horizon_years))[-1] - c
+                for c, p in zip(COSTS, PREMIUMS)]
+    np.testing.assert_allclose(npv(COSTS, PREMIUMS, discount), expected, rtol=1e-10, atol=1e-6)
+
+def sentinel_roi(total_cost, premium, horizon_years=None):
+    """ROI years as scored before validity masks: invalid rows held the 999 sentinel."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = total_cost / premium
+    invalid = premium <= 0
+    if horizon_years is not None:
+        invalid |= roi > horizon_years
+    return np.where(invalid, 999, roi)
+
+@pytest.mark.parametrize("horizon", [None, 10.0])
+def test_validity_mask_matches_999_sentinel(horizon):
+    rng = np.random.default_rng(1)
+    n = 500
+    cost = rng.uniform(0, 100_000, n).round()
+    # Premiums are non-positive or large enough that every valid ROI stays below 999
+    premium = np.where(rng.random(n) < 0.3, -rng.uniform(0, 5_000, n).round(), rng.uniform(200, 20_000, n).round())
+    premium[:5] = 0.0
+
+    old = sentinel_roi(cost, premium, horizon)
+    roi, valid = roi_with_mask(cost, premium, horizon)
+    np.testing.assert_array_equal(valid, old != 999)
+    np.testing.assert_array_equal(roi[valid], old[valid])
+    assert np.isnan(roi[~valid]).all()
+    # Valid rows keep the ranks they had ahead of the tied sentinels; invalid rows are unranked
+    ranks = rank_min(roi)
+    np.testing.assert_array_equal(ranks[valid], rank_min(old)[valid])
+    assert np.isnan(ranks[~valid]).all()
+
+def test_score_arrays_masks_follow_premiums():
+    inputs = ScoringInputs(
+        earnings=np.array([40_000.0, 20_000.0, np.nan, 30_000.0]),
+        annual_price=np.array([10_000.0, 5_000.0, 5_000.0, np.nan]),
+        regional_baseline=np.array([25_000.0, 25_000.0, 25_000.0, 25_000.0]),
+    )
+    scores = score_arrays(inputs)
+    np.testing.assert_array_equal(scores["roi_regional_valid"], [True, False, False, False])
+    assert scores["rank_regional"][0] == 1
+    assert np.isnan(scores["rank_regional"][1:]).all()
+
+def test_statewide_baseline_label_reads_the_frame(dataset):
+    assert statewide_baseline_label(dataset) == f"${dataset['hs_statewide_median'].iloc[0]:,.0f}"
+    two_states = pd.DataFrame({"hs_statewide_median": [31_000.2, np.nan, 22_000.0]})
+    assert statewide_baseline_label(two_states) == "$22,000–$31,000 by state"
+    assert statewide_baseline_label(pd.DataFrame({"x": [1]})) == f"${STATEWIDE_HS_BASELINE:,.0f}"
@@ -0,0 +1,35 @@
+# tests/test_snapshot.py
+import numpy as np
+import pandas as pd
+
+from lib.data import dataset_version
+from lib.order_stats import build_ranking_order_stats
+from lib.snapshot import read_snapshot, write_snapshot
+
+def test_snapshot_round_trip(dataset, tmp_path):
+    stats = build_ranking_order_stats(dataset)
+    version = dataset_version(dataset)
+    path = write_snapshot(dataset, stats, str(tmp_path), version)
+    snapshot = read_snapshot(str(path))
+
+    assert snapshot.version == version
+    assert dataset_version(snapshot.dataset) == version
+    pd.testing.assert_frame_equal(snapshot.dataset, dataset.reset_index(drop=True), check_dtype=False)
+    pd.testing.assert_frame_equal(snapshot.stats.frame, stats.frame, check_dtype=False)
+    assert snapshot.stats.metrics == stats.metrics
+
+    regions = sorted(dataset["Region"].dropna().unique())[:2]
+    for metric in stats.metrics:
+        for ascending in (True, False):
+            np.testing.assert_array_equal(snapshot.stats.order(metric, ascending),
+                                          stats.order(metric, ascending))
+            np.testing.assert_array_equal(snapshot.stats.order(metric, ascending, regions, ["Public"]),
+                                          stats.order(metric, ascending, regions, ["Public"]))
+
+def test_snapshot_write_is_idempotent(dataset, tmp_path):
+    stats = build_ranking_order_stats(dataset)
+    first = write_snapshot(dataset, stats, str(tmp_path), "v1")
+    mtime = (first / "manifest.json").stat().st_mtime_ns
+    assert write_snapshot(dataset, stats, str(tmp_path), "v1") == first
+    assert (first / "manifest.json").stat().st_mtime_ns == mtime
+    assert not list(tmp_path.glob(".*.tmp"))
@@ -0,0 +1,30 @@
+# tests/test_sweep.py
+import numpy as np
+import pytest
+
+from lib.sweep import kendall_tau_b
+
+def pairwise_tau_b(values: np.ndarray, reference: np.ndarray) -> float:
+    """Tau-b from every pair's signs, O(n²)."""
+    i, j = np.triu_indices(len(values), k=1)
+    x = np.sign(reference[i] - reference[j])
+    y = np.sign(values[i] - values[j])
+    with np.errstate(invalid="ignore"):
+        return (x * y).sum() / np.sqrt((x != 0).sum() * (y != 0).sum())
+
+@pytest.mark.parametrize("n", [2, 3, 17, 64, 101])
+@pytest.mark.parametrize("tied", [False, True])
+def test_kendall_tau_b_matches_pairwise(n, tied):
+    rng = np.random.default_rng(n)
+    draw = (lambda size: rng.integers(0, max(2, n // 4), size).astype(float)) if tied else rng.standard_normal
+    reference = draw(n)
+    values = np.vstack([draw(n) for _ in range(6)] + [reference, -reference])
+    expected = [pairwise_tau_b(row, reference) for row in values]
+    np.testing.assert_allclose(kendall_tau_b(values, reference), expected, equal_nan=True)
+
+def test_kendall_tau_b_nan_rows():
+    reference = np.arange(5.0)
+    values = np.array([[0.0, 1, 2, 3, 4], [0.0, 1, np.nan, 3, 4]])
+    tau = kendall_tau_b(values, reference)
+    assert tau[0] == pytest.approx(1.0)
+    assert np.isnan(tau[1])
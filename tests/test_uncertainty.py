@@ -0,0 +1,25 @@
+# tests/test_uncertainty.py
+import numpy as np
+
+from lib.uncertainty import SimulationInputs, SimulationParams, run_simulation
+
+def test_counties_come_from_registry_columns(dataset):
+    inputs = SimulationInputs.from_frame(dataset)
+    matched = inputs.county_idx >= 0
+    assert matched.any()
+    np.testing.assert_array_equal(matched, dataset["hs_baseline_median"].notna().to_numpy())
+    rows = np.flatnonzero(matched)
+    for col, values in (("hs_baseline_median", inputs.county_median), ("hs_baseline_n", inputs.county_n),
+                        ("hs_baseline_weight", inputs.county_weight)):
+        np.testing.assert_array_equal(values[inputs.county_idx[rows]], dataset[col].to_numpy(dtype=float)[rows])
+    pairs = dataset.loc[matched, ["STATEFIP", "COUNTYFIP"]].drop_duplicates()
+    assert len(inputs.county_median) == len(pairs)
+
+def test_in_process_matches_process_pool(dataset):
+    inputs = SimulationInputs.from_frame(dataset)
+    params = SimulationParams(n_draws=40, batch_size=10, seed=3)
+    serial = run_simulation(inputs, params)
+    pooled = run_simulation(inputs, params, workers=2)
+    for a, b in zip(serial, pooled):
+        np.testing.assert_array_equal(a, b)
+    assert serial[0].shape == (40, len(dataset))